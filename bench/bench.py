@@ -0,0 +1,245 @@
+"""
+Alvin Lee
+
+Benchmarks for the scheduler core, run from the bench/ directory:
+
+    python bench.py [--rows 144] [--cols 8] [--customers 60] [--services 3] [--out results.json]
+                    [--quiet]
+
+Every benchmark is run a few times on fresh synthetic data and the best and median times are
+reported as json, one entry per benchmark with the time per operation. Passing a previous result
+file with --compare prints the ratio against it and exits with 1 if any benchmark got slower than
+--threshold times its old time, --quiet leaves the json out of the output
+"""
+
+from workload import *
+import argparse
+import json
+import platform
+import statistics
+import time
+from column import Column, IntervalColumn
+from gross import getPrice
+
+DEFAULTS = {
+    "rows": 144,
+    "cols": 8,
+    "customers": 60,
+    "services": 3,
+    "catalog": 40,
+    "directory": 5000,
+    "searches": 500,
+    "repeat": 5,
+    "seed": 0,
+}
+
+
+def timeCase(setup, run, repeat):
+    """
+    Runs setup and then times run on its result [repeat] times
+
+    Returns a tuple of the number of operations run reports and the list of times in seconds
+    """
+    times = []
+    ops = 0
+    for i in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        ops = run(state)
+        list.append(times, time.perf_counter() - start)
+    return ops, times
+
+
+def columnCase(column_type, params):
+    """
+    Returns the setup and run functions that fill a column with items of 3 rows in a random order
+    and then remove them in another random order
+    """
+    rows = params["rows"]
+
+    def setup():
+        rng = makeRandom(params["seed"])
+        starts = list(range(0, rows - 2, 3))
+        adds = starts[:]
+        rng.shuffle(adds)
+        removes = starts[:]
+        rng.shuffle(removes)
+        # the items are strings since a 0 would look like the placeholder of a longer item
+        return column_type("bench", rows), adds, removes
+
+    def add(state):
+        column, adds, removes = state
+        for i in adds:
+            column.add_item(i, str(i), 3)
+        return len(adds)
+
+    def add_remove(state):
+        column, adds, removes = state
+        add(state)
+        for i in removes:
+            column.remove_item(i)
+        return 2 * len(adds)
+
+    return setup, add, add_remove
+
+
+def sheetSetup(params):
+    """
+    Returns a function building a fresh booked sheet and its catalog
+    """
+
+    def setup():
+        rng = makeRandom(params["seed"])
+        catalog = makeCatalog(params["catalog"], rng)
+        sheet = makeSheet(
+            params["rows"],
+            params["cols"],
+            params["customers"],
+            catalog,
+            params["services"],
+            rng,
+        )
+        return sheet, catalog
+
+    return setup
+
+
+def moveCustomers(state):
+    """
+    Moves every customer to the same rows of an empty column and back
+    """
+    sheet, catalog = state
+    sheet.add_column("spare")
+    spare = sheet.getLength() - 1
+    ops = 0
+    for col in range(spare):
+        for index, size, customer in sheet.getColumn(col).items():
+            sheet.move_customer(col, index, spare, index)
+            sheet.move_customer(spare, index, col, index)
+            ops += 2
+    return ops
+
+
+def runBenchmarks(params):
+    """
+    Runs every benchmark and returns the list of results
+    """
+    repeat = params["repeat"]
+    cases = []
+    for column_type in (Column, IntervalColumn):
+        setup, add, add_remove = columnCase(column_type, params)
+        list.append(cases, (f"{column_type.__name__}.add_item", setup, add))
+        list.append(cases, (f"{column_type.__name__}.add_remove_item", setup, add_remove))
+
+    sheet_setup = sheetSetup(params)
+
+    def jsonSetup():
+        sheet, catalog = sheet_setup()
+        return json.dumps(sheet.toJSON()), catalog
+
+    def toJSON(state):
+        json.dumps(state[0].toJSON())
+        return 1
+
+    def fromJSON(state):
+        ScheduleSheet(json_dict=state[0], column_type=IntervalColumn, catalog=state[1])
+        return 1
+
+    def price(state):
+        getPrice(state[0])
+        return 1
+
+    list.append(cases, ("ScheduleSheet.move_customer", sheet_setup, moveCustomers))
+    list.append(cases, ("ScheduleSheet.toJSON", sheet_setup, toJSON))
+    list.append(cases, ("ScheduleSheet.fromJSON", jsonSetup, fromJSON))
+    list.append(cases, ("gross.getPrice", jsonSetup, price))
+
+    def directorySetup():
+        rng = makeRandom(params["seed"])
+        catalog = makeCatalog(params["catalog"], rng)
+        directory = makeDirectory(params["directory"], catalog, 1, rng)
+        queries = []
+        for i in range(params["searches"]):
+            if i % 2 == 0:
+                name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for j in range(2))
+                list.append(queries, {"name": name})
+            else:
+                phone = rng.choice(AREA_CODES) + "%03d" % rng.randrange(1000)
+                list.append(queries, {"phone": phone})
+        return directory, queries
+
+    def search(state):
+        directory, queries = state
+        for query in queries:
+            directory.search(**query)
+        return len(queries)
+
+    list.append(cases, ("CustomerDirectory.search", directorySetup, search))
+
+    results = []
+    for name, setup, run in cases:
+        ops, times = timeCase(setup, run, repeat)
+        best = min(times)
+        list.append(
+            results,
+            {
+                "name": name,
+                "ops": ops,
+                "best_s": best,
+                "median_s": statistics.median(times),
+                "per_op_us": best / max(1, ops) * 1e6,
+            },
+        )
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns a list of (name, ratio) of the benchmarks whose time per operation is more than
+    [threshold] times the time in the baseline results
+    """
+    old = {r["name"]: r for r in baseline["results"]}
+    slower = []
+    for r in results:
+        if r["name"] in old and old[r["name"]]["per_op_us"] > 0:
+            ratio = r["per_op_us"] / old[r["name"]]["per_op_us"]
+            r["ratio"] = ratio
+            if ratio > threshold:
+                list.append(slower, (r["name"], ratio))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the scheduler core")
+    for key, value in DEFAULTS.items():
+        parser.add_argument("--" + key, type=int, default=value)
+    parser.add_argument("--out", help="file to write the json results to")
+    parser.add_argument("--quiet", action="store_true", help="do not print the json results")
+    parser.add_argument("--compare", help="json results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+    params = {key: getattr(args, key) for key in DEFAULTS}
+
+    report = {
+        "params": params,
+        "python": platform.python_version(),
+        "results": runBenchmarks(params),
+    }
+    slower = []
+    if args.compare != None:
+        with open(args.compare, "r") as file:
+            slower = compare(report["results"], json.load(file), args.threshold)
+
+    output = json.dumps(report, indent=2)
+    if args.out != None:
+        with open(args.out, "w") as file:
+            file.write(output)
+    if not args.quiet:
+        print(output)
+    for name, ratio in slower:
+        print(f"{name} is {ratio:.2f}x slower than the baseline", file=sys.stderr)
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Alvin Lee
+
+A module for building the services, customers and day sheets the benchmarks run on
+
+The data comes from the synth module, which draws it from the real services with a seeded random
+number generator, so that two runs with the same scale measure the same work. This module only
+adds the shapes the benchmarks need on top of it, a directory and a sheet of a given size
+"""
+
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+sys.path.insert(0, "../lib/")
+from synth import *
+from column import IntervalColumn
+from directory import CustomerDirectory
+
+
+def makeDirectory(size, catalog, services, rng):
+    """
+    Returns a CustomerDirectory of [size] customers of [services] services each, see makeCustomers
+    """
+    return CustomerDirectory(makeCustomers(size, catalog, rng, services))
+
+
+def makeSheet(rows, cols, customers, catalog, services, rng, column_type=IntervalColumn):
+    """
+    Returns a ScheduleSheet of [cols] columns with 5 minute rows, booked with up to [customers]
+    customers of [services] services each at the earliest free spots
+
+    The sheet covers whole hours so it has [rows] rounded up to a multiple of 12 rows
+    """
+    hours = max(1, -(-rows // 12))
+    sheet = ScheduleSheet(
+        start_time=0, end_time=hours, interval=5, column_type=column_type, catalog=catalog
+    )
+    for i in range(cols):
+        sheet.add_column(f"Employee {i}")
+    finder = SlotFinder(sheet)
+    placements, unplaced = finder.place_queue(
+        makeCustomers(customers, catalog, rng, services)
+    )
+    finder.apply(placements)
+    return sheet
@@ -1,11 +1,32 @@
-from tkinter import Frame, Label, Button, StringVar
+from tkinter import Frame, Label, Button, StringVar, messagebox
 import tkinter.ttk as ttk
 from popUp import CustomerPop, EmployeePop, ServicePop
 from datetime import timedelta, date
 from tkcalendar import Calendar
-from sheetFrame import MainSheet
+from sheetFrame import MainSheet, open_day, close_day
 from constants import *
-import json
+from storage import openStore, importDay
+from catalog import ServiceCatalog
+from daycache import DayCache
+from loader import BackgroundTask
+import os
+
+
+def load_services():
+    """
+    Returns the list of services in the store, first importing the data and the sheet saved by
+    older versions, the sheet becomes the day it was saved on
+
+    Runs on a worker thread when the application starts, see MainApp.start_sheet
+    """
+    if BACKEND == "json":
+        os.makedirs(DAYS_DIR, exist_ok=True)
+    store = openStore(BACKEND, STORE_PATH, DAYS_DIR, import_from=DATA_DIR)
+    try:
+        importDay(store, DAY_PATH)
+        return store.services()
+    finally:
+        store.close()
 
 
 class CalendarFrame(Frame):
@@ -206,25 +227,72 @@ class MainApp(Frame):
         ttk.Separator(self, orient="horizontal").grid(column=0, row=2, sticky="new")
         ttk.Separator(self, orient="horizontal").grid(column=0, row=2, sticky="sew")
 
-        # create the scheduling sheet
-        day = date.strftime(calendar_frame.get_date(), "%A").lower()
-        with open(SCH_PATH, "r") as file:
-            try:
-                employees = json.load(file)[day]
-            except:
-                employees = None
-        with open(DAY_PATH, "r") as file:
-            try:
-                json_dict = json.load(file)
-                if json_dict == {}:
-                    json_dict = None
-            except:
-                json_dict = None
-        sheet = MainSheet(self, employees, json_dict)
-        # TODO: add the bindings such that when the date changes so does the sheet
-
-        # grid the sheet
-        sheet.grid(column=0, row=3, sticky="nsew", padx=4)
+        # the services are read on a worker thread, and the sheet is created once they are in the
+        # catalog as every customer of every day shares the services of the catalog
+        self.catalog = ServiceCatalog()
+        self.days = None
+        self.sheet = None
+        self.calendar = calendar_frame.calendar
+        BackgroundTask(self, load_services, self.start_sheet, self.load_failed, poll=LOAD_POLL)
+
+        # set the new protocol for when the window is being closed
+        self.winfo_toplevel().protocol("WM_DELETE_WINDOW", self.close)
+
+    def start_sheet(self, services):
+        """
+        Fills the catalog with the loaded services and creates the scheduling sheet for the date of
+        the calendar, switching its day whenever the date changes
+        """
+        for s in services:
+            self.catalog.put(s)
+
+        # the days opened recently stay loaded so flipping back to them does not read them again
+        # days dropped by the prefetch threads are closed on this thread, see evict_days
+        self.days = DayCache(
+            lambda day: open_day(day, self.catalog), DAY_CACHE, evict=close_day, defer=True
+        )
+        self.after(EVICT_POLL, self.evict_days)
+
+        day = self.calendar.get_date()
+        self.sheet = MainSheet(self, self.days, day)
+        self.sheet.grid(column=0, row=3, sticky="nsew", padx=4)
+        self.days.prefetch([day - timedelta(days=1), day + timedelta(days=1)])
+        self.dateVar.trace_add("write", lambda *args: self.show_date(self.calendar.get_date()))
+
+    def load_failed(self, error):
+        """
+        Helper method that warns that the services could not be read and starts the sheet without
+        them, the customers then keep the services saved with them
+        """
+        messagebox.showerror(parent=self, message=f"The services could not be loaded: {error}")
+        self.start_sheet([])
+
+    def show_date(self, day):
+        """
+        Switches the sheet to some date and starts loading the days before and after it in the
+        background, as those are the most likely to be looked at next
+        """
+        self.sheet.show_day(day)
+        self.days.prefetch([day - timedelta(days=1), day + timedelta(days=1)])
+
+    def evict_days(self):
+        """
+        Helper method that saves and closes the days dropped from the cache every EVICT_POLL
+        milliseconds, on the Tk thread so that it cannot happen in the middle of an edit
+        """
+        self.days.evict_pending()
+        self.after(EVICT_POLL, self.evict_days)
+
+    def close(self):
+        """
+        A helper function describing the new protocol to be taken when the widow is being closed
+
+        Every edit is already in the journals, so closing only folds the journal of every loaded
+        day into its sheet
+        """
+        if self.days != None:
+            self.days.close()
+        self.winfo_toplevel().destroy()
 
     def customer_pop(self):
         """
@@ -245,4 +313,4 @@ class MainApp(Frame):
         Helper method for creating a service popup
         """
         self.pop.destroy()
-        self.pop = ServicePop(self)
+        self.pop = ServicePop(self, self.catalog)
@@ -1,10 +1,23 @@
 # ========== Constants for file paths =========
+# the backend for services, customers, employees and the schedule, either "json" for the files
+# below or "sqlite" for the database at DB_PATH
+BACKEND = "json"
+DATA_DIR = "../data/"
+DB_PATH = "../data/scheduler.db"
+# an empty database is filled from the json files in DATA_DIR the first time it is opened
+STORE_PATH = DB_PATH if BACKEND == "sqlite" else DATA_DIR
 S_PATH = "../data/services.json"
 E_PATH = "../data/employees.json"
 C_PATH = "../data/customers.json"
 SCH_PATH = "../data/schedule.json"
 SRT_PATH = "../data/sort.json"
+# with the "json" backend every date has its own <yyyy-mm-dd>.json sheet and a .journal of the
+# edits made since the sheet was last written, the "sqlite" backend keeps both in the database
+DAYS_DIR = "../drive/days/"
+# the single day sheet of older versions, imported as the date it was last written on
 DAY_PATH = "../drive/day.json"
+DAY_CACHE = 7  # the number of days kept loaded in memory
+EVICT_POLL = 1000  # milliseconds between closing the days dropped from memory
 
 # ========== Constants for fonts ==========
 FONT = ("Hack Nerd Font Mono", 18)  # general font
@@ -26,6 +39,24 @@ TIME_W = 50
 # the vertical buffer for where the customer frame gets its coordinates read
 C_BUFF_TOP = 10
 
+# the number of rows and columns past the edges of the view that still get customer frames, the
+# customers further out are only drawn as rectangles
+OVERSCAN_ROWS = 8
+OVERSCAN_COLS = 1
+
+# the sheet is built on a worker thread, the Tk thread checks for it every LOAD_POLL milliseconds
+# and then adds LOAD_CHUNK columns at a time between redraws
+LOAD_POLL = 50
+LOAD_CHUNK = 4
+
+# the number of milliseconds without typing before a search box searches
+SEARCH_DELAY = 150
+
+# the number of milliseconds between moves of a customer frame being dragged, about one per frame
+# of a 60Hz display however fast the motion events come in
+DRAG_FRAME = 16
+
 # ========== Constants for the Sheet Attributes ==========
 START_TIME = 8  # in military time
 END_TIME = 20  # in military time
+INTERVAL = 15  # minutes per row of a new sheet, e.g. 5, 10, 15 or 30
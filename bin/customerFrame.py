@@ -26,6 +26,8 @@ class CustomerDetails(Frame):
         self.customer = customer
         self.packed = False
         self.rowspan = 1
+        # the sheet column the frame was last gridded in, see MainSheet.render_view
+        self.column = None
 
         # grid configuration
         self.grid_rowconfigure(1, weight=1)
@@ -73,7 +75,6 @@ class CustomerDetailsPop(Toplevel):
         # Add a list view of services with their name and price
         services = customer.getServices()
         s_text = "\n".join(list(map(lambda s: s.getName(), services)))
-        p_list = list(map(lambda s: s.getPrice(), services))
         p_text = "\n".join(list(map(lambda s: str(s.getPrice()), services)))
         Label(self, text=s_text, font=FONT, justify=LEFT).grid(
             column=0, row=1, sticky="nsw"
@@ -85,14 +86,9 @@ class CustomerDetailsPop(Toplevel):
             column=0, row=1, columnspan=2, sticky="swe"
         )
 
-        # get the approximate total time it will take to do all the services
-        t_list = list(map(lambda s: s.getTime(), services))
-        t_time = CTime(0, 0)
-        for t in t_list:
-            t_time.add(t)
-
-        # add the total price and total approximate time it will take
-        Label(self, text=f"Total Price: {sum(p_list)}", anchor="w", font=FONT).grid(
+        # add the total price and total approximate time it will take from the customer's totals
+        t_time = customer.getTime()
+        Label(self, text=f"Total Price: {customer.total_price}", anchor="w", font=FONT).grid(
             column=0, row=2, sticky="nw", padx=(0, 5)
         )
         Label(
@@ -167,14 +163,25 @@ class CustomerFrame(CustomerDetails):
         tl = Toplevel(self)
         CustomerFrame(tl, self.customer)
 
+    def load(self, customer):
+        """
+        Shows another customer on this frame so that frames can be reused rather than created
+        """
+        assert isinstance(customer, Customer)
+        self.customer = customer
+        self.name.set(customer.getName())
+        self.services_to_string()
+        self.service_price_to_string()
+        if customer.getServed():
+            self.configure(background="green")
+        else:
+            self.configure(background="red")
+
     def service_price_to_string(self):
         """
         Updates the total price of the services that the customer has
         """
-        total_price = sum(
-            list(map(lambda s: s.getPrice(), self.customer.getServices()))
-        )
-        self.price.set(str(total_price))
+        self.price.set(str(self.customer.total_price))
 
     def services_to_string(self):
         """
@@ -192,26 +199,75 @@ class CustomerFrame(CustomerDetails):
         """
         When the widget is clicked, i.e. before being dragged
         """
-        wid = e.widget
         data = self.grid_info()
         if data != {}:
-            wid.initCol = data["column"]
-            wid.initRow = data["row"]
-            wid.rowspan = data["rowspan"]
-        wid._start_x = e.x
-        wid._start_y = e.y
+            self.initCol = data["column"]
+            self.initRow = data["row"]
+            self.rowspan = data["rowspan"]
+        # the pointer's offset into the frame and the position of the parent do not change while
+        # dragging, so they are read once here rather than on every motion event
+        self.start_x = e.x_root - self.winfo_rootx()
+        self.start_y = e.y_root - self.winfo_rooty()
+        self.origin = (self.parent.winfo_rootx(), self.parent.winfo_rooty())
+        self.pointer = (e.x_root, e.y_root)
+        # the id of the move waiting for the next frame, if any
+        self.pending = None
+        self.moved = False
 
     def on_motion(self, e):
         """
-        When the widget is being dragged
+        When the widget is being dragged, only the latest pointer position is kept and the widget
+        is moved at most once every DRAG_FRAME milliseconds
         """
-        wid = e.widget
-        new_x = self.winfo_x() - wid._start_x + e.x
-        new_y = self.winfo_y() - wid._start_y + e.y
-        self.place(x=new_x, y=new_y)
+        self.pointer = (e.x_root, e.y_root)
+        self.moved = True
+        if self.pending == None:
+            self.pending = self.after(DRAG_FRAME, self.drag_frame)
+
+    def drag_frame(self):
+        """
+        Moves the widget to the latest pointer position and generates the <<DragCustomer>> event
+        so the sheet can show whether the customer can be dropped there
+        """
+        self.pending = None
+        self.place(
+            x=self.pointer[0] - self.start_x - self.origin[0],
+            y=self.pointer[1] - self.start_y - self.origin[1],
+        )
+        self.event_generate("<<DragCustomer>>")
 
     def on_release(self, e):
         """
         When the widget is released and needs to be grid in its new place
         """
-        self.event_generate("<<VerifyMoveCustomer>>")
+        if self.pending != None:
+            self.after_cancel(self.pending)
+            self.pending = None
+        self.pointer = (e.x_root, e.y_root)
+        self.show_drop(None)
+        # a click without dragging leaves the customer where it is
+        if self.moved:
+            self.event_generate("<<VerifyMoveCustomer>>")
+
+    def drop_point(self):
+        """
+        Returns the screen coordinates of the point that decides the cell the widget is dropped
+        on, the middle of its top edge
+        """
+        return (
+            self.pointer[0] - self.start_x + self.winfo_width() // 2,
+            self.pointer[1] - self.start_y + C_BUFF_TOP,
+        )
+
+    def show_drop(self, ok):
+        """
+        Outlines the widget while it is dragged, green if it can be dropped where it is and red if
+        not, or removes the outline if ok is None
+        """
+        if ok == None:
+            self.configure(highlightthickness=0)
+        else:
+            color = "green" if ok else "red"
+            self.configure(
+                highlightthickness=3, highlightbackground=color, highlightcolor=color
+            )
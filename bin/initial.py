@@ -1,7 +1,8 @@
 """
-This file exists purely to import the additional ../lib/scheduler/ path without formatting messing up
+This file exists purely to import the additional ../lib/scheduler/ and ../lib/ paths without formatting messing up
 """
 
 import sys
 
 sys.path.insert(0, "../lib/scheduler/")
+sys.path.insert(0, "../lib/")
@@ -0,0 +1,97 @@
+import threading
+import queue
+
+
+class BackgroundTask:
+    def __init__(self, widget, work, done, error=None, poll=50):
+        """
+        Class that runs a function on a worker thread and hands its result back to the Tk thread
+
+        Tk widgets can only be used from the thread running the main loop, so the worker only puts
+        its result on a queue and the Tk thread checks the queue every [poll] milliseconds
+
+        @parameter widget: any widget, its after method is used to check for the result
+        @parameter work: a function without arguments that must not touch any widgets
+        @parameter done: a function that is called with the result of work on the Tk thread
+        @parameter error: an optional function that is called with the exception if work raises
+        @parameter poll: the number of milliseconds between checks for the result
+        """
+        self.widget = widget
+        self.done = done
+        self.error = error
+        self.poll = poll
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.run, args=(work,), daemon=True)
+        self.thread.start()
+        self.widget.after(self.poll, self.check)
+
+    def run(self, work):
+        """
+        Helper method run on the worker thread
+        """
+        try:
+            self.results.put((True, work()))
+        except Exception as e:
+            self.results.put((False, e))
+
+    def check(self):
+        """
+        Helper method run on the Tk thread that calls done or error once the worker is finished,
+        the result is dropped if the widget was destroyed in the meantime
+        """
+        if not self.widget.winfo_exists():
+            return
+        try:
+            ok, result = self.results.get_nowait()
+        except queue.Empty:
+            self.widget.after(self.poll, self.check)
+            return
+        if ok:
+            self.done(result)
+        elif self.error != None:
+            self.error(result)
+        else:
+            raise result
+
+
+class ChunkedTask:
+    def __init__(self, widget, items, step, done=None, chunk=10, progress=None):
+        """
+        Class that calls a function on every item on the Tk thread a few items at a time, so the
+        main loop gets to redraw the window and handle events between chunks
+
+        @parameter widget: any widget, its after method is used to schedule the chunks
+        @parameter items: the list of items
+        @parameter step: a function that is called with every item
+        @parameter done: an optional function that is called after the last item
+        @parameter chunk: the number of items handled before giving the main loop a turn
+        @parameter progress: an optional function that is called with the number of items handled
+                             and the total number of items after every chunk
+        """
+        assert chunk > 0
+        self.widget = widget
+        self.items = list(items)
+        self.step = step
+        self.done = done
+        self.chunk = chunk
+        self.progress = progress
+        self.index = 0
+        self.widget.after(0, self.next)
+
+    def next(self):
+        """
+        Helper method that handles the next chunk of items and schedules the one after it
+        """
+        if not self.widget.winfo_exists():
+            return
+        end = min(len(self.items), self.index + self.chunk)
+        for i in range(self.index, end):
+            self.step(self.items[i])
+        self.index = end
+        if self.progress != None:
+            self.progress(end, len(self.items))
+        if end < len(self.items):
+            # a short delay rather than 0 lets pending redraws and input run first
+            self.widget.after(1, self.next)
+        elif self.done != None:
+            self.done()
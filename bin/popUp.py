@@ -14,7 +14,11 @@ from tkinter import (
 import tkinter.ttk as ttk
 from tkinter.constants import *
 from customer import *
+from directory import CustomerDirectory
 from constants import *
+from storage import openStore
+from catalog import ServiceCatalog
+from textfilter import TextFilter
 import json
 
 SRT_KEYS = ("Nail Care", "Foot Care", "Lash", "Spa", "Waxing", "Massage", "None")
@@ -35,6 +39,11 @@ class ViewFrame(Frame):
         self.view_list = []
         self.parent = parent
 
+        # the search keys and display strings are computed once per item rather than per keystroke
+        self.filter = TextFilter(key=self.searchKey, label=self.toString)
+        # the id of the search waiting for the typing to pause, if any
+        self.pending = None
+
         # create the search bar
         self.searchVar = StringVar()
         self.search_entry = Entry(self, textvariable=self.searchVar, font=FONT)
@@ -67,13 +76,14 @@ class ViewFrame(Frame):
             if e.state == 0
             else None,
         )
-        self.searchVar.trace("w", self.search)
+        self.searchVar.trace("w", self.schedule_search)
+        self.bind("<Destroy>", self.cancel_search)
         self.bind("<Unmap>", lambda e: [self.searchVar.set(""), self.lb.grid_forget()])
         self.bind(
             "<Map>",
             lambda e: [
                 self.update_idletasks(),
-                self.search(),
+                self.refresh(),
                 self.lb.grid(column=0, row=1, sticky="nsew"),
             ],
         )
@@ -84,31 +94,74 @@ class ViewFrame(Frame):
         """
         return str(string)
 
+    def searchKey(self, item):
+        """
+        Helper method returning the string an item is searched by, to be overwritten by children
+        classes if needed
+        """
+        return self.toString(item)
+
+    def schedule_search(self, *args, **kwargs):
+        """
+        Helper method for the traces of the search entries that waits for SEARCH_DELAY milliseconds
+        without typing before searching, so a burst of keystrokes only searches once
+        """
+        if self.pending != None:
+            self.after_cancel(self.pending)
+        self.pending = self.after(SEARCH_DELAY, lambda: self.run_search(**kwargs))
+
+    def cancel_search(self, e):
+        """
+        Helper method that cancels the search waiting for the typing to pause when the frame is
+        destroyed, as it would otherwise run on the destroyed list box
+        """
+        if e.widget == self and self.pending != None:
+            self.after_cancel(self.pending)
+            self.pending = None
+
+    def run_search(self, **kwargs):
+        """
+        Helper method for running the search scheduled by schedule_search
+        """
+        self.pending = None
+        self.search(**kwargs)
+
+    def show(self, strings):
+        """
+        Helper method that replaces the contents of the list box with a list of strings in one
+        insert
+        """
+        self.lb.delete(0, END)
+        if len(strings) > 0:
+            self.lb.insert(END, *strings)
+
+    def refresh(self):
+        """
+        Helper method for searching again after the list of items has changed
+        """
+        self.filter.reset(self.view_list)
+        self.search()
+
     def search(self, *args):
         """
         Helper method for inputting items when searching in the entry widget
 
         May need to be overwritten by children classes
         """
-        self.lb.delete(0, END)
-        if self.searchVar.get() == "":
-            for s in self.view_list:
-                self.lb.insert(END, self.toString(s))
-        else:
-            inp = self.searchVar.get().lower()
-            for s in self.view_list:
-                if inp in self.toString(s).lower():
-                    self.lb.insert(END, self.toString(s))
+        self.show(self.filter.search(self.searchVar.get()))
 
     def delete(self, string):
         """
         The helper method for deleting a select entry from the list box
+
+        Returns the deleted object or None if there is no match
         """
         for s in self.view_list:
             if self.toString(s) == string:
                 self.view_list.remove(s)
-                self.search()
-                break
+                self.refresh()
+                return s
+        return None
 
 
 class ServiceView(ViewFrame):
@@ -121,7 +174,7 @@ class ServiceView(ViewFrame):
         self.view_list = services
 
         # initialize the listbox
-        self.search()
+        self.refresh()
 
     def toString(self, string):
         """
@@ -129,27 +182,17 @@ class ServiceView(ViewFrame):
         """
         return Service.toString(string)
 
-    def search(self, *args):
+    def searchKey(self, service):
         """
-        Helper method for inputting items when searching in the entry widget
-
-        May need to be overwritten by children classes
+        Override the inherited searchKey method so services are searched by name and abbreviation
         """
-        self.lb.delete(0, END)
-        if self.searchVar.get() == "":
-            for s in self.view_list:
-                self.lb.insert(END, self.toString(s))
-        else:
-            inp = self.searchVar.get().lower()
-            for s in self.view_list:
-                if inp in s.getName().lower() or inp in s.getAbbrev().lower():
-                    self.lb.insert(END, self.toString(s))
+        return service.getName() + "\n" + service.getAbbrev()
 
     def delete(self, string):
         """
         Inherit the delete method and update the list of services
         """
-        super().delete(string)
+        self.removed = super().delete(string)
         self.event_generate("<<UpdateService>>")
 
 
@@ -352,24 +395,54 @@ class ServiceAdd(Frame):
                 self.services.remove(s)
                 self.services.append(s)
 
+            self.changed = s
             self.event_generate("<<UpdateService>>")
             self.search()
 
 
-class ServicePop(Toplevel):
-    def __init__(self, parent):
+class StorePop(Toplevel):
+    def __init__(self, parent, events=()):
         """
-        A popup window for making/modifying services
+        A popup window that keeps the data store open while it is shown
+
+        The store is closed once the window is destroyed, along with the application wide bindings
+        in [events] whose handlers save to it
+
+        @parameter parent: the parent widget
+        @parameter events: the sequences bound with bind_all by the popup and its tabs
         """
         Toplevel.__init__(self, parent)
+        self.events = events
+        self.store = openStore(BACKEND, STORE_PATH, import_from=DATA_DIR)
+        self.bind("<Destroy>", self.close_store)
+
+    def close_store(self, e):
+        """
+        Helper method that closes the store when the popup itself is destroyed, the binding is also
+        called for every child widget
+        """
+        if e.widget == self:
+            for sequence in self.events:
+                self.unbind_all(sequence)
+            self.store.close()
+
+
+class ServicePop(StorePop):
+    def __init__(self, parent, catalog):
+        """
+        A popup window for making/modifying services
+
+        @parameter catalog: the ServiceCatalog shared by the open days, kept in step with the store
+        """
+        StorePop.__init__(self, parent, ("<<UpdateService>>",))
+        self.catalog = catalog
         self.title("Services")
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
-        with open(S_PATH, "r") as file:
-            self.services = list(map(lambda s: Service.fromJSON(s), json.load(file)))
-            for s in self.services:
-                assert isinstance(s, Service)
+        self.services = self.store.services()
+        for s in self.services:
+            assert isinstance(s, Service)
 
         # create the notebook for keeping tabs
         self.note = ttk.Notebook(self)
@@ -389,20 +462,35 @@ class ServicePop(Toplevel):
 
     def update_services(self, e):
         """
-        Updates the list of services
-        """
-        s_lst = list(map(lambda s: Service.toJSON(s), self.services))
-        with open(S_PATH, "w") as file:
-            json.dump(s_lst, file)
+        Updates the list of services, only saving the changed or removed service when the event
+        widget says which one it was
+
+        The changed or removed service is also put in or removed from the shared catalog, so the
+        customers of the open days see the new price and time right away
+        """
+        wid = e.widget
+        if getattr(wid, "changed", None) != None:
+            self.store.put_service(wid.changed)
+            self.catalog.put(wid.changed)
+            wid.changed = None
+        elif getattr(wid, "removed", None) != None:
+            self.store.delete_service(wid.removed.getName())
+            self.catalog.remove(wid.removed)
+            wid.removed = None
+        else:
+            self.store.save_services(self.services)
+            for s in self.services:
+                self.catalog.put(s)
 
 
 class EmployeeView(ViewFrame):
-    def __init__(self, parent, employees):
+    def __init__(self, parent, employees, store):
         """
         The view frame for employees where you can add and remove employees
         """
         super().__init__(parent)
         self.view_list = employees
+        self.store = store
 
         # create a variable for storing the data needed to be sent over a virtual event
         self.employee = None
@@ -419,7 +507,7 @@ class EmployeeView(ViewFrame):
             command=self.add_column,
         )
         sheet_button.grid(column=0, row=2, sticky="w")
-        self.search()
+        self.refresh()
 
     def search(self, *args):
         """
@@ -444,10 +532,9 @@ class EmployeeView(ViewFrame):
 
     def update_employees(self):
         """
-        Updates the json file where a list of employees are stored
+        Updates the stored list of employees
         """
-        with open(E_PATH, "w") as file:
-            json.dump(self.view_list, file)
+        self.store.save_employees(self.view_list)
 
     def add_employee(self, *args):
         """
@@ -466,7 +553,7 @@ class EmployeeView(ViewFrame):
             )
         else:
             self.view_list.append(employee)
-            self.search()
+            self.refresh()
             self.update_employees()
 
     def delete(self, string):
@@ -488,6 +575,7 @@ class ScheduleColumn(Frame):
         Frame.__init__(self, parent)
         self.checked = checked
         self.parent = parent
+        self.day = day
 
         self.grid_columnconfigure(list(range(1, 7)), weight=1, uniform="sch_row")
 
@@ -521,12 +609,13 @@ class ScheduleColumn(Frame):
 
 
 class EmployeeSchedule(Frame):
-    def __init__(self, parent, employees):
+    def __init__(self, parent, employees, store):
         """
         The frame that will display the schedule for employees and will update the schedule
         """
         Frame.__init__(self, parent)
         self.employees = employees
+        self.store = store
         self.keys = [
             "sunday",
             "monday",
@@ -537,8 +626,7 @@ class EmployeeSchedule(Frame):
             "saturday",
         ]
         self.base_frame = Frame(self)
-        with open(SCH_PATH, "r") as file:
-            self.sch_dict = json.load(file)
+        self.sch_dict = self.store.schedule()
         self.check()
 
         self.grid_columnconfigure(0, weight=1)
@@ -580,35 +668,39 @@ class EmployeeSchedule(Frame):
 
     def update_schedule(self, e):
         """
-        Updates the json containing the list of employees
+        Updates the stored list of employees for the day of the schedule column that changed
         """
-        with open(SCH_PATH, "w") as file:
-            json.dump(self.sch_dict, file)
+        wid = e.widget
+        if isinstance(wid, ScheduleColumn):
+            self.store.put_schedule(wid.day, wid.checked)
+        else:
+            self.store.save_schedule(self.sch_dict)
 
 
-class EmployeePop(Toplevel):
+class EmployeePop(StorePop):
     def __init__(self, parent):
         """
         A popup window for creating and deleting employees
         """
-        Toplevel.__init__(self, parent)
+        StorePop.__init__(self, parent, ("<<UpdateSchedule>>",))
         self.title("Employees")
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
         # import the existing employees stored in data
-        with open(E_PATH, "r") as file:
-            self.employees = json.load(file)
-            for e in self.employees:
-                assert isinstance(e, str)
+        self.employees = self.store.employees()
+        for e in self.employees:
+            assert isinstance(e, str)
 
         # create the notebook for swapping tabs
         self.note = ttk.Notebook(self)
         self.note.grid(column=0, row=0, sticky="nsew")
 
         # add the two tabs for adding/deleting employees and assigning employees to weekdays here
-        self.note.add(EmployeeView(self.note, self.employees), text="Add")
-        self.note.add(EmployeeSchedule(self.note, self.employees), text="Schedule")
+        self.note.add(EmployeeView(self.note, self.employees, self.store), text="Add")
+        self.note.add(
+            EmployeeSchedule(self.note, self.employees, self.store), text="Schedule"
+        )
 
         # place the widget so that is is centered along the x but only slightly padded in the y
         self.update_idletasks()
@@ -685,8 +777,9 @@ class CollapseServices(Frame):
 
 
 class CreateCustomer(Frame):
-    def __init__(self, parent, customers):
+    def __init__(self, parent, customers, store):
         Frame.__init__(self, parent)
+        self.store = store
         self.grid_columnconfigure([1, 3], weight=1, uniform="cust_make")
 
         # create a customer variable for sending the customer data via event generation
@@ -736,11 +829,7 @@ class CreateCustomer(Frame):
         # create a binding for when a item is selected in the combobox
         self.cb.bind(
             "<<ComboboxSelected>>",
-            lambda e: self.name.set(
-                list(filter(lambda c: c.getPhone() == self.cb.get(), self.customers))[
-                    0
-                ].getName(),
-            ),
+            lambda e: self.name.set(self.customers.get(self.cb.get()).getName()),
         )
 
     def fill_cb(self, *args):
@@ -749,24 +838,15 @@ class CreateCustomer(Frame):
         """
         name = self.name.get().strip()
         phone = self.phone.get().strip()
-        phone_list = list(map(lambda c: c.getPhone(), self.customers))
 
-        # if the phone entry is not empty then sort with the phone entry as priority
+        # if the phone entry is not empty then search with the phone entry as priority
         if phone != "":
-            phone_list = list(
-                map(
-                    lambda c: c.getPhone(),
-                    filter(lambda c: phone in c.getPhone(), self.customers),
-                )
-            )
-        # else if the name entry is not empty sort by the name
-        elif name != "":
-            phone_list = list(
-                map(
-                    lambda c: c.getPhone(),
-                    filter(lambda c: name in c.getName(), self.customers),
-                )
-            )
+            matches = self.customers.search(phone=phone)
+        # else if the name entry is not empty search by the name
+        else:
+            matches = self.customers.search(name=name)
+        phone_list = list(map(lambda c: c.getPhone(), matches))
+
         # set the values in the combobox
         self.cb["values"] = phone_list
 
@@ -828,10 +908,8 @@ class CreateCustomer(Frame):
         for k in SRT_KEYS:
             self.sorted_services[k] = []
 
-        with open(S_PATH, "r") as file:
-            services = json.load(file)
-            for s in services:
-                self.sorted_services[s["sorted"]].append(s)
+        for s in self.store.services():
+            self.sorted_services[s.getSort()].append(s.toJSON())
 
     def queue_customer(self):
         """
@@ -862,8 +940,8 @@ class CreateCustomer(Frame):
             self.event_generate("<<VerifyAddCustomer>>")
 
             # add the customer to the list of customers and update the list in data
-            if c not in self.customers:
-                self.customers.append(c)
+            if self.customers.add(c):
+                self.changed = c
                 self.event_generate("<<UpdateCustomers>>")
 
 
@@ -907,8 +985,8 @@ class CustomerView(ViewFrame):
         )
 
         # create traces for the sting variables
-        self.nameVar.trace("w", self.search)
-        self.phoneVar.trace("w", lambda *args: self.search(phone=True))
+        self.nameVar.trace("w", self.schedule_search)
+        self.phoneVar.trace("w", lambda *args: self.schedule_search(phone=True))
 
         # create binding for selecting an item in the list box
         self.lb.bind("<<ListboxSelect>>", self.fill)
@@ -927,7 +1005,7 @@ class CustomerView(ViewFrame):
         """
         Inherit the delete method and update the list of customers
         """
-        super().delete(string)
+        self.removed = super().delete(string)
         self.event_generate("<<UpdateCustomers>>")
 
     def fill(self, e):
@@ -976,13 +1054,12 @@ class CustomerView(ViewFrame):
         else:
             c = Customer(name[0], last, phone)
 
-            # validate the customer
-            if c in self.view_list:
-                self.view_list.remove(c)
-            self.view_list.append(c)
-            self.search()
+            # replace any customer with the same phone number
+            self.view_list.update(c)
+            self.refresh()
 
             # raise event to update the list of customers
+            self.changed = c
             self.event_generate("<<UpdateCustomers>>")
 
     def toString(self, customer):
@@ -997,19 +1074,20 @@ class CustomerView(ViewFrame):
 
         Overwritten to better suit customers
         """
-        self.lb.delete(0, END)
-        if self.nameVar.get() == "" and self.phoneVar.get() == "":
-            for c in self.view_list:
-                self.lb.insert(END, self.toString(c))
+        if phone:
+            matches = self.view_list.search(phone=self.phoneVar.get())
         else:
-            for c in self.view_list:
-                if phone and self.phoneVar.get().strip() in c.getPhone():
-                    self.lb.insert(0, self.toString(c))
-                elif self.nameVar.get().strip().lower() in c.getName().lower():
-                    self.lb.insert(END, self.toString(c))
+            matches = self.view_list.search(name=self.nameVar.get())
+        self.show(list(map(self.toString, matches)))
+
+    def refresh(self):
+        """
+        Override the inherited refresh method, the directory keeps its own index of the customers
+        """
+        self.search()
 
 
-class CustomerPop(Toplevel):
+class CustomerPop(StorePop):
     def __init__(self, parent):
         """
         The pop up frame for the customer, will have two tabs similar to services:
@@ -1021,20 +1099,20 @@ class CustomerPop(Toplevel):
         Need to send a json of the customer through events as event_generate does not properly
         handle the data field
         """
-        super().__init__(parent)
+        super().__init__(parent, ("<<UpdateCustomers>>",))
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
 
-        # import the list of customers
-        with open(C_PATH, "r") as file:
-            self.customers = list(map(lambda e: Customer.fromJSON(e), json.load(file)))
+        # import the list of customers into a directory indexed by phone and name
+        catalog = ServiceCatalog(self.store.services())
+        self.customers = CustomerDirectory(self.store.customers(catalog))
 
         # create the notebook
         self.note = ttk.Notebook(self)
         self.note.grid(column=0, row=0, sticky="nsew")
 
         # add the two tabs to the notebook
-        self.note.add(CreateCustomer(self.note, self.customers), text="Add")
+        self.note.add(CreateCustomer(self.note, self.customers, self.store), text="Add")
         self.note.add(CustomerView(self.note, self.customers), text="Modify")
 
         # create the binding for automatically updating the list of customers
@@ -1047,8 +1125,15 @@ class CustomerPop(Toplevel):
 
     def update_customers(self, e):
         """
-        Helper methods for updating the list of customers in data
+        Helper methods for updating the list of customers in data, only saving the changed or
+        removed customer when the event widget says which one it was
         """
-        with open(C_PATH, "w") as file:
-            c_json = list(map(lambda c: c.toJSON(), self.customers))
-            json.dump(c_json, file)
+        wid = e.widget
+        if getattr(wid, "changed", None) != None:
+            self.store.put_customer(wid.changed)
+            wid.changed = None
+        elif getattr(wid, "removed", None) != None:
+            self.store.delete_customer(wid.removed.getPhone())
+            wid.removed = None
+        else:
+            self.store.save_customers(self.customers)
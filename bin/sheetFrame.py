@@ -1,12 +1,16 @@
 from constants import *
-from tkinter import Frame, Label
+from tkinter import Frame, Label, Button
 import tkinter.ttk as ttk
 from tkinter.constants import *
 from customerFrame import *
-from tkinter import Canvas, LabelFrame
-from sheet import ScheduleSheet
-import threading
-import json
+from tkinter import Canvas, LabelFrame, messagebox
+from sheet import NonemptyColumnException, CustomerOverlap
+from column import IntervalColumn, BadArgument
+from placement import SlotFinder
+from storage import openStore, openDay, closeDay
+from loader import BackgroundTask, ChunkedTask
+from bisect import bisect_right
+import os
 
 
 class EmployeeCanvas(Canvas):
@@ -18,6 +22,8 @@ class EmployeeCanvas(Canvas):
         """
         Canvas.__init__(self, parent, highlightthickness=0, background="blue")
         self.employees = []
+        # the label widget of every employee by name
+        self.labels = {}
 
         # create the scrollable frame
         self.scroll_frame = Frame(self)
@@ -70,9 +76,9 @@ class EmployeeCanvas(Canvas):
             index, weight=1, uniform="emp_cols", minsize=COLUMN_W
         )
         self.right.grid(column=index + 1, row=0, sticky="nse")
-        Label(self.scroll_frame, text=name, font=E_FONT, anchor=CENTER).grid(
-            column=index, row=0, sticky="nsew"
-        )
+        label = Label(self.scroll_frame, text=name, font=E_FONT, anchor=CENTER)
+        label.grid(column=index, row=0, sticky="nsew")
+        self.labels[name] = label
         self.employees.append(name)
         self.update_idletasks()
 
@@ -81,18 +87,42 @@ class EmployeeCanvas(Canvas):
         Removes an employee label and from the list if it exists
         """
         assert isinstance(name, str)
-        assert name in self.employees
+        assert name in self.labels
+        index = self.employees.index(name)
         self.employees.remove(name)
-        for w in self.scroll_frame.winfo_children():
-            if w.cgets("text") == name:
-                w.destroy()
-                break
+        self.labels.pop(name).destroy()
+        # shift the labels after the removed one over to keep them in the same columns as the sheet
+        for i in range(index, len(self.employees)):
+            self.labels[self.employees[i]].grid(column=i + 1)
+        self.right.grid(column=len(self.employees) + 1)
+        self.scroll_frame.grid_columnconfigure(
+            len(self.employees) + 1, weight=0, uniform="", minsize=0
+        )
+
+    def set_employees(self, names):
+        """
+        Changes the labels to a new list of names, renaming the labels already there and only
+        adding or removing labels for the difference in length
+        """
+        while len(self.employees) > len(names):
+            self.remove_employee(self.employees[-1])
+        labels = list(map(lambda e: self.labels[e], self.employees))
+        for i in range(len(labels)):
+            if self.employees[i] != names[i]:
+                labels[i].configure(text=names[i])
+        self.employees = list(names[: len(labels)])
+        self.labels = dict(zip(self.employees, labels))
+        for name in names[len(labels) :]:
+            self.add_employee(name)
 
 
 class TimeFrame(Frame):
     def __init__(self, parent, start, end, interval):
         """
         Class for a frame that will display the time for the spreadsheet
+
+        There is one label per row, but intervals shorter than 15 minutes only show the times on
+        the quarter hours so the labels stay readable
         """
         assert isinstance(start, CTime)
         assert isinstance(end, CTime)
@@ -103,42 +133,60 @@ class TimeFrame(Frame):
         # insert buffer frame at the top
         Frame(self, borderwidth=1, relief="flat", height=ROW_H // 2).pack(fill=X)
 
-        start.add_time(minute=interval)
+        label_every = max(interval, 15)
+        start = start.add_time(minute=interval)
         # add the time labels to the base frame
         while start != end:
             LabelFrame(
                 self,
-                text=start.toString(),
+                text=start.toString() if start.asMinutes() % label_every == 0 else "",
                 height=ROW_H,
                 width=TIME_W,
                 relief="flat",
                 font=T_FONT,
                 labelanchor="e",
             ).pack(padx=(0, 1))
-            start.add_time(minute=interval)
+            start = start.add_time(minute=interval)
 
         # add the buffer frame at the end
         Frame(self, borderwidth=1, relief="flat", height=ROW_H // 2).pack(fill=X)
 
 
-class SheetFrame(Frame):
-    def __init__(self, parent, rows):
+class SheetFrame(Canvas):
+    def __init__(self, parent, rows, hour_rows=4):
         """
         A class representing the grid in which we will assign customers to cells for a visual
         representation
 
+        The customer frames are gridded into it like a frame, while the grid lines are drawn as
+        line items on the canvas underneath them and redrawn in one pass whenever the sheet is
+        resized or a column is added
+
         @parameter rows: is the number of rows in the sheet
+        @parameter hour_rows: is the number of rows in an hour, every hour gets a darker line
         """
-        Frame.__init__(self, parent, relief="flat", borderwidth=1)
+        Canvas.__init__(self, parent, highlightthickness=0, borderwidth=1)
         self.grid_propagate(False)
         self.numCols = 0
         self.numRows = rows
+        self.hour_rows = hour_rows
+
+        # a list of (column, row, rowspan, served) of every customer, drawn as rectangles under
+        # the customer frames so that the customers without a frame are still shown
+        self.cards = []
+
+        # the pixel edges of the columns and rows, updated whenever the sheet is resized, used to
+        # draw the grid and to find the cell under a point without asking the grid geometry manager
+        self.col_edges = [0]
+        self.row_edges = [0]
 
         # grid Configure
         self.grid_rowconfigure(
             list(range(rows)), weight=1, uniform="rows", minsize=ROW_H
         )
 
+        self.bind("<Configure>", lambda e: [self.draw_lines(), self.draw_cards()])
+
     def add_column(self):
         """
         Adds a column to the grid by adding a column_configuration
@@ -147,95 +195,248 @@ class SheetFrame(Frame):
             self.numCols, weight=1, uniform="cols", minsize=COLUMN_W
         )
 
-        # create vertical separators
-        ttk.Separator(self, orient="vertical").grid(
-            column=self.numCols, row=0, rowspan=self.numRows, sticky="nse"
-        )
-        ttk.Separator(self, orient="vertical").grid(
-            column=self.numCols, row=0, rowspan=self.numRows, sticky="nsw"
-        )
-
-        # add hour lines if adding first column
-        if self.numCols == 0:
-            self.add_hourlines()
-
         # increment the number of columns
         self.numCols += 1
+        self.draw_lines()
 
-    def add_hourlines(self):
+    def remove_column(self):
         """
-        A helper method for adding horizontal separators for the grid representing hours
+        Removes the last column of the grid, the customers are positioned by column index so any
+        column of the sheet can be removed by removing the last one and redrawing
         """
-        for i in range(self.numRows):
-            if i != 0:
-                s1 = ttk.Separator(self, orient="horizontal")
-                s1.grid(column=0, row=i - 1, sticky="swe")
-                self.bind_all(
-                    "<<VerifyAddColumn>>",
-                    lambda e, s1=s1, i=i: s1.grid(
-                        column=0, row=i - 1, columnspan=self.numCols, sticky="swe"
-                    ),
-                    add="+",
-                )
-            s2 = ttk.Separator(self, orient="horizontal")
-            s2.grid(column=0, row=i, sticky="new")
-            self.bind_all(
-                "<<VerifyAddColumn>>",
-                lambda e, s2=s2, i=i: s2.grid(
-                    column=0, row=i, columnspan=self.numCols, sticky="new"
-                ),
-                add="+",
+        assert self.numCols > 0
+        self.numCols -= 1
+        self.grid_columnconfigure(self.numCols, weight=0, uniform="", minsize=0)
+        self.draw_lines()
+
+    def set_rows(self, rows, hour_rows):
+        """
+        Changes the number of rows of the grid, e.g. for a day saved with another interval
+        """
+        if rows < self.numRows:
+            self.grid_rowconfigure(
+                list(range(rows, self.numRows)), weight=0, uniform="", minsize=0
             )
+        self.grid_rowconfigure(list(range(rows)), weight=1, uniform="rows", minsize=ROW_H)
+        self.numRows = rows
+        self.hour_rows = hour_rows
+        self.draw_lines()
+        self.draw_cards()
 
+    def update_geometry(self):
+        """
+        Recomputes the pixel edges of the columns and rows from the size of the sheet
 
-class SheetCanvas(Canvas):
-    start = 8
-    end = 20
-    interval = 15
+        Returns False if the sheet has not been given a size yet
+        """
+        width = self.winfo_width()
+        height = self.winfo_height()
+        if width <= 1 or height <= 1:
+            self.col_edges = [0]
+            self.row_edges = [0]
+            return False
+        self.row_edges = [round(i * height / self.numRows) for i in range(self.numRows + 1)]
+        cols = max(1, self.numCols)
+        self.col_edges = [round(i * width / cols) for i in range(self.numCols + 1)]
+        return True
+
+    def cell_at(self, x, y):
+        """
+        Returns the (column, row) of the cell containing a point given in pixels from the top left
+        of the sheet, or None if the point is outside the sheet
+        """
+        col = bisect_right(self.col_edges, x) - 1
+        row = bisect_right(self.row_edges, y) - 1
+        if 0 <= col < self.numCols and 0 <= row < self.numRows:
+            return (col, row)
+        return None
 
-    def __init__(self, parent, rows):
+    def draw_lines(self, *args):
+        """
+        Redraws the row and column lines of the grid
+        """
+        self.delete("grid")
+        if not self.update_geometry():
+            return
+        width = self.col_edges[-1]
+        height = self.row_edges[-1]
+        for i in range(1, self.numRows):
+            y = self.row_edges[i]
+            color = "gray40" if i % self.hour_rows == 0 else "gray80"
+            self.create_line(0, y, width, y, fill=color, tags="grid")
+        for i in range(1, self.numCols):
+            x = self.col_edges[i]
+            self.create_line(x, 0, x, height, fill="gray40", tags="grid")
+        self.tag_lower("grid")
+
+    def set_cards(self, cards):
+        """
+        Sets the list of (column, row, rowspan, served) tuples of the customers and redraws them
+        """
+        self.cards = cards
+        self.draw_cards()
+
+    def draw_cards(self):
+        """
+        Redraws every customer as a rectangle above the grid lines
+        """
+        self.delete("card")
+        if len(self.row_edges) == 1 or self.numCols == 0:
+            return
+        for col, row, rowspan, served in self.cards:
+            # the columns of a day being switched to may not all be on screen yet
+            if col >= self.numCols:
+                continue
+            self.create_rectangle(
+                self.col_edges[col] + 1,
+                self.row_edges[row] + 1,
+                self.col_edges[col + 1] - 1,
+                self.row_edges[min(row + rowspan, self.numRows)] - 1,
+                fill="green" if served else "red",
+                outline="",
+                tags="card",
+            )
+
+    def show_drop(self, col, row, rowspan, ok):
+        """
+        Outlines the cells a customer being dragged would be dropped on, in green if the drop is
+        possible and red if not
+        """
+        self.delete("drop")
+        if len(self.row_edges) == 1 or self.numCols == 0:
+            return
+        self.create_rectangle(
+            self.col_edges[col] + 2,
+            self.row_edges[row] + 2,
+            self.col_edges[col + 1] - 2,
+            self.row_edges[min(row + rowspan, self.numRows)] - 2,
+            outline="green" if ok else "red",
+            width=3,
+            tags="drop",
+        )
+
+    def clear_drop(self):
+        """
+        Removes the outline drawn by show_drop
+        """
+        self.delete("drop")
+
+    def cell_range(self, top, bottom, left, right):
+        """
+        Returns the (first row, end row, first column, end column) of the cells that overlap an area
+        of the sheet given in pixels, the ends being exclusive
+        """
+        if len(self.row_edges) == 1 or self.numCols == 0:
+            return (0, 0, 0, 0)
+        return (
+            max(0, bisect_right(self.row_edges, top) - 1),
+            min(self.numRows, bisect_right(self.row_edges, bottom)),
+            max(0, bisect_right(self.col_edges, left) - 1),
+            min(self.numCols, bisect_right(self.col_edges, right)),
+        )
+
+
+class SheetCanvas(Canvas):
+    def __init__(self, parent, rows, start=START_TIME, end=END_TIME, interval=INTERVAL):
         """
         Class representing the canvas containing the sheet of customers and being able to add
         customers, remove them, and modify them
+
+        @parameter rows: the number of rows, (end - start) * 60 // interval
+        @parameter start: the integer starting hour
+        @parameter end: the integer ending hour
+        @parameter interval: the integer number of minutes per row
         """
         Canvas.__init__(self, parent, highlightthickness=0, background="purple")
         self.numRows = rows
+        self.start = start
+        self.end = end
+        self.interval = interval
 
         # create the scrollable frame
-        scroll_frame = Frame(self)
-        scroll_frame.grid_columnconfigure(1, weight=1)
+        self.scroll_frame = Frame(self)
+        self.scroll_frame.grid_columnconfigure(1, weight=1)
 
-        left_time = TimeFrame(
-            scroll_frame,
+        self.sheet = SheetFrame(self.scroll_frame, rows, max(1, 60 // interval))
+        self.sheet.grid(column=1, row=0, sticky="nsew")
+        self.add_times()
+
+        # create the window in the canvas
+        self.scrollframe_id = self.create_window(
+            (0, 0), window=self.scroll_frame, anchor="nw"
+        )
+
+        # binding for the mousewheel event
+        self.bind_all(
+            "<MouseWheel>",
+            lambda e: self.scroll(-1 * (e.delta), e.state != 0),
+            add="+",
+        )
+        self.bind("<Configure>", lambda e: self.event_generate("<<ViewChanged>>"))
+
+    def add_times(self):
+        """
+        Helper method that creates the time labels on both sides of the sheet
+        """
+        self.left_time = TimeFrame(
+            self.scroll_frame,
             CTime(self.start),
             CTime(self.end),
             self.interval,
         )
-        self.sheet = SheetFrame(scroll_frame, rows)
-        right_time = TimeFrame(
-            scroll_frame,
+        self.right_time = TimeFrame(
+            self.scroll_frame,
             CTime(self.start),
             CTime(self.end),
             self.interval,
         )
+        self.left_time.grid(column=0, row=0, sticky="nsw")
+        self.right_time.grid(column=2, row=0, sticky="nse")
 
-        # grid the frames to the scroll frame
-        left_time.grid(column=0, row=0, sticky="nsw")
-        self.sheet.grid(column=1, row=0, sticky="nsew")
-        right_time.grid(column=2, row=0, sticky="nse")
+    def set_times(self, rows, start, end, interval):
+        """
+        Changes the rows and time labels of the sheet for a day with other hours or another
+        interval, the columns and their widgets stay as they are
 
-        # create the window in the canvas
-        self.scrollframe_id = self.create_window(
-            (0, 0), window=scroll_frame, anchor="nw"
-        )
+        Returns False if the sheet already has these rows and times
+        """
+        if (rows, start, end, interval) == (
+            self.numRows,
+            self.start,
+            self.end,
+            self.interval,
+        ):
+            return False
+        self.numRows = rows
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.left_time.destroy()
+        self.right_time.destroy()
+        self.add_times()
+        self.sheet.set_rows(rows, max(1, 60 // interval))
+        return True
+
+    def scroll(self, units, horizontal=False):
+        """
+        Scrolls the canvas and generates the <<ViewChanged>> event so the customers in view can be
+        shown
+        """
+        if horizontal:
+            self.xview_scroll(units, "units")
+        else:
+            self.yview_scroll(units, "units")
+        self.event_generate("<<ViewChanged>>")
 
-        # binding for the mousewheel event
-        self.bind_all(
-            "<MouseWheel>",
-            lambda e: self.yview_scroll(-1 * (e.delta), "units")
-            if e.state == 0
-            else self.xview_scroll(-1 * (e.delta), "units"),
-            add="+",
+    def visible(self):
+        """
+        Returns the (first row, end row, first column, end column) of the sheet cells that are in
+        view, the ends being exclusive
+        """
+        top = self.canvasy(0) - self.sheet.winfo_y()
+        left = self.canvasx(0) - self.sheet.winfo_x()
+        return self.sheet.cell_range(
+            top, top + self.winfo_height(), left, left + self.winfo_width()
         )
 
     def resize(self, *args):
@@ -261,56 +462,265 @@ class SheetCanvas(Canvas):
         """
         self.sheet.add_column()
 
+    def remove_column(self):
+        """
+        Simple method that calls on SheetFrame.remove_column to remove a column from the sheet frame
+        in the canvas
+        """
+        self.sheet.remove_column()
+
+
+def open_day(day, catalog):
+    """
+    Helper function that loads the backend sheet of a date from the store, can be run on a worker
+    thread as no widgets are used
+
+    A day without a saved sheet starts with a column for every employee scheduled on its day of the
+    week, nothing is saved for it until it is edited, see storage.openDay
+
+    Returns a tuple of the ScheduleSheet and the list of employees scheduled for the day
+
+    @parameter day: a datetime.date
+    @parameter catalog: the ServiceCatalog shared by the customers of every day
+    """
+    if BACKEND == "json":
+        os.makedirs(DAYS_DIR, exist_ok=True)
+    store = openStore(BACKEND, STORE_PATH, DAYS_DIR, import_from=DATA_DIR)
+    try:
+        employees = store.schedule()[day.strftime("%A").lower()]
+        verify = openDay(
+            store,
+            day.isoformat(),
+            employees,
+            start_time=START_TIME,
+            end_time=END_TIME,
+            interval=INTERVAL,
+            column_type=IntervalColumn,
+            catalog=catalog,
+        )
+    finally:
+        store.close()
+    return verify, employees
+
+
+def close_day(day, loaded):
+    """
+    Helper function that folds the journal of a day loaded by open_day into its saved sheet and
+    closes it, used when the day is dropped from the cache of days
+    """
+    closeDay(loaded[0])
+
 
 class MainSheet(Frame):
-    def __init__(self, parent, employees=[], json_dict=None):
+    def __init__(self, parent, days, day):
         """
         Class for the frame that will contain two canvases, one being the canvas for employee names
         and the other canvas for the sheet containing the customers that will be served for that
         day
 
-        @parameter employees: a list of names of employees
+        The frame shows one day at a time, see MainSheet.show_day, a day that is not loaded yet is
+        loaded on a worker thread while a progress bar is shown instead of blocking the window
+
+        @parameter days: a DayCache of tuples of the backend ScheduleSheet and the list of
+                         employees scheduled for the day, e.g. loaded with open_day
+        @parameter day: the datetime.date to show first
         """
         Frame.__init__(self, parent)
-        for e in employees:
-            assert isinstance(e, str)
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(1, weight=1)
 
-        # create the backend sheet variable that will be used to track any processes needed
-        self.employees = employees
-        self.verify = ScheduleSheet()
-
-        numRows = (END_TIME - START_TIME) * 60 // 15
+        # the day asked for and the day whose sheet is on screen, which differ while the first is
+        # loading, its backend sheet, catalog and employees are set once it is loaded
+        self.days = days
+        self.day = None
+        self.on_screen = None
+        self.employees = []
+        self.verify = None
+        self.catalog = None
+        # counts the days shown so that the chunks of a day switched away from stop early
+        self.shown = 0
 
         # create a buffer frame so that I can raise the employee canvas above customer widgets
         self.bufferFrame = Frame(self)
         self.bufferFrame.grid_columnconfigure(0, weight=1)
         self.bufferFrame.grid_rowconfigure(0, weight=1)
 
-        # create the two scrollable canvases
+        # the employee canvas does not depend on the sheet, the sheet canvas needs its size
         self.emp_canvas = EmployeeCanvas(self.bufferFrame)
-        self.sheet = SheetCanvas(self, numRows)
+        self.sheet = None
+
+        # only the customers in view get a customer frame, keyed by (column id, row), the frames
+        # that scroll out of view are kept in the pool to be reused
+        self.cards = {}
+        self.pool = []
 
         # create the queue frame
         self.queue = Frame(self, borderwidth=0)
         ttk.Separator(self.queue, orient="vertical").pack(side=RIGHT, fill=Y)
+        Button(self.queue, text="Place", font=FONT, command=self.auto_place).pack(
+            side=BOTTOM, fill=X
+        )
+
+        # create the progress indicator shown over the sheet while loading
+        self.loading = Frame(self)
+        self.loadingText = Label(self.loading, text="Loading the sheet", font=FONT)
+        self.loadingText.pack(side=TOP, pady=10)
+        self.progress = ttk.Progressbar(self.loading, length=300)
+        self.progress.pack(side=TOP)
 
-        # grid the two different canvases in their appropriate location
+        # grid the employee canvas
         self.bufferFrame.grid(column=1, row=0, sticky="new")
         self.emp_canvas.grid(column=0, row=1, sticky="nsew")
-        self.sheet.grid(row=1, column=1, sticky="nsew")
 
+        # ========== Logic for loading in data ==========
+        self.show_day(day)
+
+        self.bind("<Destroy>", self.unbind_events)
+
+    def show_day(self, day):
+        """
+        Shows the sheet of some date, a cached day is shown right away and any other day is loaded
+        on a worker thread first
+
+        Only the differences with the day on screen are applied to the widgets, see day_loaded
+        """
+        if day == self.day:
+            return
+        self.day = day
+        self.shown += 1
+        # the day on screen can still be edited while the next one loads, so neither is evicted
+        self.days.keep(day, self.on_screen)
+        if day in self.days:
+            self.day_loaded(day, self.days.get(day))
+            return
+
+        self.loadingText.configure(text="Loading the sheet")
+        self.progress.configure(mode="indeterminate")
+        self.progress.start()
+        self.loading.grid(column=1, row=1)
+        self.loading.lift()
+        shown = self.shown
+        BackgroundTask(
+            self,
+            lambda: self.days.get(day),
+            lambda loaded: self.day_loaded(day, loaded) if shown == self.shown else None,
+            lambda error: self.load_failed(error) if shown == self.shown else None,
+            poll=LOAD_POLL,
+        )
+
+    def day_loaded(self, day, loaded):
+        """
+        Helper method run on the Tk thread with the loaded day, changes the rows, time labels and
+        columns on screen to match the day and adds any new columns in chunks
+
+        The employee labels already on screen are renamed rather than recreated, only the
+        difference in the number of columns is added or removed, and the customer frames are
+        reused through the pool by refresh_cards
+        """
+        verify, employees = loaded
+        for e in employees:
+            assert isinstance(e, str)
+        # the day that was on screen can be evicted now that it is swapped out
+        self.on_screen = day
+        self.days.keep(day)
+        # the customers waiting in the queue stay queued for the new day
+        if self.verify != None and self.verify is not verify:
+            verify.queue = self.verify.queue
+            self.verify.queue = 0
+        self.employees = employees
+        self.verify = verify
+        self.catalog = verify.catalog
+
+        # the customer frames of the last day go back to the pool to be reused for this one
+        for key in list(self.cards.keys()):
+            self.cards[key].grid_forget()
+            list.append(self.pool, self.cards.pop(key))
+
+        # a saved day keeps the interval it was saved with
+        if self.sheet == None:
+            self.sheet = SheetCanvas(
+                self,
+                verify.getNumRows(),
+                verify.getStart().getHour(),
+                verify.getEnd().getHour(),
+                verify.getInterval(),
+            )
+            self.sheet.grid(row=1, column=1, sticky="nsew")
+            self.bind_events()
+        else:
+            self.sheet.sheet.set_cards([])
+            self.sheet.set_times(
+                verify.getNumRows(),
+                verify.getStart().getHour(),
+                verify.getEnd().getHour(),
+                verify.getInterval(),
+            )
+
+        # rename and remove the columns on screen, then add the new ones in chunks
+        labels = list(
+            map(lambda i: verify.getColumn(i).getLabel(), range(verify.getLength()))
+        )
+        kept = min(len(labels), len(self.emp_canvas.employees))
+        while self.sheet.sheet.numCols > kept:
+            self.sheet.remove_column()
+        self.emp_canvas.set_employees(labels[:kept])
+        if len(labels) == kept:
+            self.day_shown()
+            return
+
+        self.progress.stop()
+        self.progress.configure(mode="determinate", maximum=len(labels) - kept, value=0)
+        self.loading.grid(column=1, row=1)
+        self.loading.lift()
+        shown = self.shown
+        ChunkedTask(
+            self,
+            labels[kept:],
+            lambda label: self.load_column(label) if shown == self.shown else None,
+            lambda: self.day_shown() if shown == self.shown else None,
+            chunk=LOAD_CHUNK,
+            progress=lambda count, total: self.progress.configure(value=count),
+        )
+
+    def load_column(self, label):
+        """
+        Helper method that adds the employee label and the column widgets for a column that is
+        already in the backend sheet
+        """
+        self.emp_canvas.add_employee(label)
+        self.sheet.add_column()
+
+    def day_shown(self):
+        """
+        Helper method run once the columns of a day are on screen that hides the progress
+        indicator and draws the customers
+        """
+        self.progress.stop()
+        self.loading.grid_forget()
+
+        # fix the screen, the customers are drawn by refresh_cards once the sheet has its size
+        self.event_generate("<<VerifyAddColumn>>")
+        self.update_idletasks()
+        self.refresh_cards()
+
+        # lift the employee buffer frame and the queue frame
+        self.queue.lift()
+        self.bufferFrame.lift()
+
+    def bind_events(self):
+        """
+        Helper method that sets up the bindings that need the backend sheet, once the first day
+        is loaded
+        """
         # create the bindings for checking with the backend and allowing certain processes to continue
         self.bind_all("<<VerifyAddCustomer>>", self.queue_customer)
         self.bind_all("<<VerifyMoveCustomer>>", self.move_customer)
+        self.bind_all("<<DragCustomer>>", self.drag_customer)
         # TODO, figure out why the error is raised
         self.bind_all("<<VerifyDestroyCustomer>>", self.destroy_customer)
         self.bind_all("<<VerifyServed>>", self.served_customer)
         self.bind_all("<<VerifyAddColumn>>", self.add_employee)
-
-        # set the new protocol for when the window is being closed
-        self.winfo_toplevel().protocol("WM_DELETE_WINDOW", self.save_json_sheet)
+        self.sheet.bind("<<ViewChanged>>", self.render_view)
 
         # create binding for the canvases for resizing and setting the scrollregions
         self.bind_all(
@@ -324,71 +734,97 @@ class MainSheet(Frame):
             add="+",
         )
 
-        # ========== Logic for loading in data ==========
-        if json_dict == None:
-            self.after(
-                0, lambda: threading.Thread(target=self.add_employee_list()).start()
-            )
-        else:
-            self.after(
-                0,
-                lambda: threading.Thread(
-                    target=self.load_json_sheet(json_dict)
-                ).start(),
-            )
-
-    def load_json_sheet(self, json_dict):
+    def unbind_events(self, e):
         """
-        Helper method for loading in the data from a json dictionary
+        Helper method that removes the application wide bindings made by the sheet once it is
+        destroyed, so that they do not call the handlers of a destroyed sheet
         """
-        index = 0
-        for col in json_dict["columns"]:
-            self.add_employee(name=col["label"])
-            for cust in col["items"]:
-                row_ind = cust[0]
-                rowspan = cust[2]
-                c = Customer.fromJSON(cust[1])
-                cf = CustomerFrame(self, c)
-                cf.grid(
-                    in_=self.sheet.sheet,
-                    column=index,
-                    row=row_ind,
-                    rowspan=rowspan,
-                    sticky="nsew",
-                )
-            index += 1
-
-        # set the verify variable to the json_dict
-        self.verify.fromJSON(json_dict["columns"])
-
-        # fix the screen
-        self.event_generate("<<VerifyAddColumn>>")
-        self.update_idletasks()
-
-        # lift the employee buffer frame and the queue frame
-        self.queue.lift()
-        self.bufferFrame.lift()
+        if e.widget == self:
+            for sequence in (
+                "<<VerifyAddCustomer>>",
+                "<<VerifyMoveCustomer>>",
+                "<<DragCustomer>>",
+                "<<VerifyDestroyCustomer>>",
+                "<<VerifyServed>>",
+                "<<VerifyAddColumn>>",
+                "<MouseWheel>",
+            ):
+                self.unbind_all(sequence)
 
-    def save_json_sheet(self):
+    def load_failed(self, error):
         """
-        A helper function describing the new protocol to be taken when the widow is being closed
+        Helper method run on the Tk thread when a day could not be loaded
         """
-        with open(DAY_PATH, "w") as file:
-            json.dump(self.verify.toJSON(), file)
-        self.winfo_toplevel().destroy()
+        self.progress.stop()
+        self.loadingText.configure(text="Could not load the sheet: " + str(error))
+        # the last day stays on screen and the failed day can be shown again to retry
+        self.day = None
+        self.days.keep(self.on_screen)
 
-    def add_employee_list(self):
-        # add any employees if any
-        for e in self.employees:
-            self.add_employee(name=e)
-
-        # fix the screen
-        self.event_generate("<<VerifyAddColumn>>")
-        self.update_idletasks()
-
-        # lift the employee buffer frame and the queue frame
-        self.queue.lift()
+    def refresh_cards(self):
+        """
+        Redraws the rectangles of every customer and the customer frames in view, to be called
+        after the customers on the sheet change
+        """
+        cards = []
+        for col in range(self.verify.getLength()):
+            for index, size, customer in self.verify.getColumn(col).items():
+                list.append(cards, (col, index, size, customer.getServed()))
+        self.sheet.sheet.set_cards(cards)
+        self.render_view()
+
+    def render_view(self, *args):
+        """
+        Gives a customer frame to every customer in or near the view, reusing the frames of the
+        customers that are no longer in view, so the number of frames stays around the number of
+        customers that fit on the screen
+        """
+        r0, r1, c0, c1 = self.sheet.visible()
+        r0 = max(0, r0 - OVERSCAN_ROWS)
+        r1 = r1 + OVERSCAN_ROWS
+        c0 = max(0, c0 - OVERSCAN_COLS)
+        c1 = min(self.verify.getLength(), self.sheet.sheet.numCols, c1 + OVERSCAN_COLS)
+        wanted = {}
+        for col in range(c0, c1):
+            column = self.verify.getColumn(col)
+            for index, size, customer in column.items():
+                if index < r1 and index + size > r0:
+                    wanted[(column.id, index)] = (col, index, size, customer)
+
+        # free the frames of customers that left the view or changed, including those whose column
+        # moved to another index when a column before it was added or removed
+        for key in list(self.cards.keys()):
+            card = self.cards[key]
+            if (
+                key not in wanted
+                or card.customer is not wanted[key][3]
+                or card.column != wanted[key][0]
+            ):
+                card.grid_forget()
+                list.append(self.pool, self.cards.pop(key))
+
+        for key, (col, index, size, customer) in wanted.items():
+            card = self.cards.get(key)
+            if card == None:
+                if len(self.pool) > 0:
+                    card = list.pop(self.pool)
+                    card.load(customer)
+                else:
+                    card = CustomerFrame(self, customer)
+                self.cards[key] = card
+            elif card.rowspan != size or card.grid_info() == {}:
+                card.load(customer)
+            else:
+                continue
+            card.packed = False
+            card.c_data = customer
+            card.rowspan = size
+            card.column = col
+            card.grid(
+                in_=self.sheet.sheet, column=col, row=index, rowspan=size, sticky="nsew"
+            )
         self.bufferFrame.lift()
+        self.queue.lift()
 
     def served_customer(self, e):
         """
@@ -396,11 +832,9 @@ class MainSheet(Frame):
         """
         wid = e.widget
         data = wid.grid_info()
-        state = self.verify.serve_customer(data["column"], data["row"])
-        if state:
-            wid.configure(background="green")
-        else:
-            wid.configure(background="red")
+        self.verify.serve_customer(data["column"], data["row"])
+        wid.load(wid.customer)
+        self.refresh_cards()
 
     def destroy_customer(self, e):
         """
@@ -417,60 +851,78 @@ class MainSheet(Frame):
             if self.verify.queue == 0:
                 self.queue.grid_forget()
         except:
-            # else when it is grid in the sheet
+            # else when it is grid in the sheet, the frame goes back to the pool
             if self.verify.remove_customer(g_data["column"], g_data["row"]):
-                wid.destroy()
+                self.refresh_cards()
+
+    def drop_target(self, widget):
+        """
+        Returns the (column, row) of the sheet cell under the drop point of a customer frame being
+        dragged, or None if it is outside the sheet
+        """
+        x, y = widget.drop_point()
+        sheet = self.sheet.sheet
+        return sheet.cell_at(x - sheet.winfo_rootx(), y - sheet.winfo_rooty())
+
+    def drag_customer(self, e):
+        """
+        Helper method for showing whether a customer frame being dragged can be dropped where it
+        is, checked with the backend without modifying it
+        """
+        widget = e.widget
+        target = self.drop_target(widget)
+        if target == None:
+            self.sheet.sheet.clear_drop()
+            widget.show_drop(False)
+            return
+        col, row = target
+        skip = None if widget.packed else (widget.initCol, widget.initRow)
+        ok = self.verify.can_place(col, row, widget.rowspan, skip)
+        self.sheet.sheet.show_drop(col, row, widget.rowspan, ok)
+        widget.show_drop(ok)
 
     def move_customer(self, e):
         """
         Helper method for verifying whether a customer can be moved to a specific grid in the sheet
         """
         widget = e.widget
-
-        x = (
-            widget.winfo_x()
-            - self.queue.winfo_width()
-            - TIME_W
-            + (widget.winfo_width() // 2)
-        )
-        y = widget.winfo_y() - ROW_H + C_BUFF_TOP
-        grid_data = self.sheet.sheet.grid_location(x, y)
-        finalCol = grid_data[0]
-        finalRow = grid_data[1]
+        self.sheet.sheet.clear_drop()
+        target = self.drop_target(widget)
 
         # if the widget is queued and not yet added to the sheet
         if widget.packed == True:
             # check with the backend
-            if self.verify.add_customer(finalCol, finalRow, widget.c_data):
-                # grid the customer to the sheet
-                widget.grid(
-                    in_=self.sheet.sheet,
-                    column=finalCol,
-                    row=finalRow,
-                    rowspan=widget.rowspan,
-                    sticky="nsew",
+            try:
+                added = target != None and self.verify.add_customer(
+                    target[0], target[1], widget.c_data
                 )
+            except BadArgument:
+                added = False
+            if added:
+                # the queued frame joins the pool and the sheet gives the customer a frame
+                widget.place_forget()
+                widget.packed = False
+                list.append(self.pool, widget)
                 self.verify.queue -= 1
                 if self.verify.queue == 0:
                     self.queue.grid_forget()
-                widget.packed = False
+                self.refresh_cards()
             else:
                 # pack back to queue
                 widget.pack(in_=self.queue, fill=X)
         # when the widget is already in the sheet and is being moved
         else:
-            # check with backend
-            if self.verify.move_customer(
-                widget.initCol, widget.initRow, finalCol, finalRow
-            ):
-                # grid to new location
-                widget.grid(
-                    in_=self.sheet.sheet,
-                    column=finalCol,
-                    row=finalRow,
-                    rowspan=widget.rowspan,
-                    sticky="nsew",
+            # check with backend, which leaves the customer in place if the move fails
+            try:
+                moved = target != None and self.verify.move_customer(
+                    widget.initCol, widget.initRow, target[0], target[1]
                 )
+            except (CustomerOverlap, BadArgument):
+                moved = False
+            if moved:
+                # the frame is moved or reused by refresh_cards
+                widget.place_forget()
+                self.refresh_cards()
             else:
                 # grid back in original place
                 widget.grid(
@@ -494,18 +946,61 @@ class MainSheet(Frame):
                 self.queue.configure(width=200)
                 # generate the <<VerifyAddColumn>> event to fix the scroll region for the canvas
                 self.event_generate("<<VerifyAddColumn>>")
-            cust_obj = Customer.fromJSON(customer)
+            cust_obj = Customer.fromJSON(customer, self.catalog)
             cf = CustomerFrame(self, cust_obj)
             cf.pack(in_=self.queue)
             cf.packed = True
             cf.c_data = cust_obj
-            cf.rowspan = self.verify.time_to_length(cust_obj.getTime())
+            cf.rowspan = self.verify.time_to_length(cust_obj.total_minutes)
 
             self.verify.queue += 1
             if self.verify.queue == 1:
                 # grid the queue frame
                 self.queue.grid(column=0, row=0, rowspan=2, sticky="nsw")
 
+    def auto_place(self, strategy="earliest"):
+        """
+        Helper method that places every queued customer frame at the earliest free spot of an
+        employee scheduled for the day, the customers that do not fit stay in the queue
+
+        Only the employees of the day in the schedule are placed on, a column added by hand for an
+        employee that is not scheduled is left out. The customers are added as one batch, so they
+        are undone in one step and none are added if the sheet refuses any of them
+        """
+        queued = list(
+            filter(lambda w: getattr(w, "packed", False), self.queue.pack_slaves())
+        )
+        employees = self.employees if self.employees else None
+        finder = SlotFinder(self.verify, employees)
+        placed = []
+        placements = []
+        for widget in queued:
+            spot = finder.find(widget.rowspan, strategy)
+            if spot == None:
+                continue
+            col, row = spot
+            finder.reserve(col, row, widget.rowspan)
+            list.append(placed, widget)
+            list.append(placements, (widget.c_data, col, row))
+        try:
+            finder.apply(placements)
+        except (CustomerOverlap, BadArgument):
+            messagebox.showerror(
+                parent=self,
+                message="The queued customers could not be placed, the queue is left as it was",
+            )
+            return
+        for widget in placed:
+            widget.pack_forget()
+            widget.packed = False
+            list.append(self.pool, widget)
+            self.verify.queue -= 1
+        if self.verify.queue == 0:
+            self.queue.grid_forget()
+        self.refresh_cards()
+        self.bufferFrame.lift()
+        self.queue.lift()
+
     def add_employee(self, event=None, name=None):
         """
         Helper method that adds a new employee column to the sheet by getting the label from the
@@ -520,6 +1015,7 @@ class MainSheet(Frame):
         if name != None and self.verify.add_column(name):
             self.emp_canvas.add_employee(name)
             self.sheet.add_column()
+            self.refresh_cards()
 
     def remove_employee(self, e):
         """
@@ -527,5 +1023,10 @@ class MainSheet(Frame):
         """
         wid = e.widget
         name = wid.employee
-        if self.verify.remove_column(name):
-            self.emp_canvas.remove_employee(name)
+        try:
+            if self.verify.remove_column(name):
+                self.emp_canvas.remove_employee(name)
+                self.sheet.remove_column()
+                self.refresh_cards()
+        except NonemptyColumnException:
+            pass
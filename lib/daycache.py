@@ -0,0 +1,164 @@
+"""
+Alvin Lee
+
+A module for keeping the day sheets that were opened recently in memory
+
+Every day is loaded once, kept in a least recently used cache, and handed back as is when it is
+asked for again. The days around the one being looked at can be loaded on worker threads ahead of
+time so that flipping to them does not wait on reading and replaying the files
+
+A day that is loaded on a worker thread can push another day out of the cache, so a cache created
+with defer=True only sets the evicted days aside and the thread that edits the days closes them
+with evict_pending
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class DayCache:
+    def __init__(self, load, size=7, evict=None, defer=False):
+        """
+        Creates a cache of at most [size] days
+
+        @parameter load: a function taking a key, e.g. a date, and returning the loaded day, it
+                         may be called on a worker thread
+        @parameter size: the positive integer number of days kept in memory
+        @parameter evict: an optional function taking a key and its day that is called when the
+                          day is dropped from the cache, e.g. to save and close it
+        @parameter defer: if True, the dropped days are only set aside and evict is called for them
+                          by evict_pending, otherwise it is called by whichever thread drops them
+        """
+        assert size > 0
+        self.load = load
+        self.size = size
+        self.evict = evict
+        self.defer = defer
+        self.days = OrderedDict()
+        # the days dropped from the cache that evict was not called for yet, see evict_pending
+        self.pending = OrderedDict()
+        # an event per key that is being loaded, set once the load is finished
+        self.loading = {}
+        # the keys that are never evicted, e.g. the day on screen and the day about to replace it
+        self.kept = set()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.days)
+
+    def __contains__(self, key):
+        return key in self.days or key in self.pending
+
+    def keep(self, *keys):
+        """
+        Marks the keys that must stay in the cache, replacing the previously kept keys
+        """
+        with self.lock:
+            self.kept = set(keys)
+
+    def get(self, key):
+        """
+        Returns the day for some key, loading it if it is not in the cache
+
+        If another thread is already loading the day this waits for it instead of loading it twice
+        """
+        while True:
+            with self.lock:
+                if key in self.days:
+                    self.days.move_to_end(key)
+                    return self.days[key]
+                if key in self.pending:
+                    # a dropped day that was not evicted yet is taken back rather than loaded again
+                    day = self.pending.pop(key)
+                    event = None
+                    break
+                event = self.loading.get(key)
+                if event == None:
+                    event = threading.Event()
+                    self.loading[key] = event
+                    break
+            event.wait()
+
+        if event == None:
+            self.put(key, day)
+            return day
+        try:
+            day = self.load(key)
+        except:
+            with self.lock:
+                del self.loading[key]
+            event.set()
+            raise
+        self.put(key, day)
+        with self.lock:
+            del self.loading[key]
+        event.set()
+        return day
+
+    def put(self, key, day):
+        """
+        Adds a day to the cache as the most recently used, evicting the least recently used days
+        past the size of the cache
+        """
+        evicted = []
+        with self.lock:
+            self.days[key] = day
+            self.days.move_to_end(key)
+            for old in list(self.days.keys()):
+                if len(self.days) <= self.size:
+                    break
+                if old not in self.kept and old != key:
+                    list.append(evicted, (old, self.days.pop(old)))
+            if self.defer:
+                self.pending.update(evicted)
+                evicted = []
+        if self.evict != None:
+            for old, day in evicted:
+                self.evict(old, day)
+
+    def evict_pending(self):
+        """
+        Calls evict for the days set aside by a cache created with defer=True
+
+        Returns the number of days evicted
+        """
+        with self.lock:
+            evicted = list(self.pending.items())
+            self.pending.clear()
+        if self.evict != None:
+            for key, day in evicted:
+                self.evict(key, day)
+        return len(evicted)
+
+    def prefetch(self, keys):
+        """
+        Loads the days of some keys on worker threads if they are not cached or being loaded
+
+        A day that fails to load is skipped, the error is raised again by get
+        """
+        for key in keys:
+            with self.lock:
+                if key in self.days or key in self.loading:
+                    continue
+            threading.Thread(target=self.fetch, args=(key,), daemon=True).start()
+
+    def fetch(self, key):
+        """
+        Helper method run on the prefetch threads
+        """
+        try:
+            self.get(key)
+        except Exception:
+            pass
+
+    def close(self):
+        """
+        Evicts every day in the cache and every day set aside, including the kept ones
+        """
+        with self.lock:
+            evicted = list(self.pending.items()) + list(self.days.items())
+            self.pending.clear()
+            self.days.clear()
+        if self.evict != None:
+            for key, day in evicted:
+                self.evict(key, day)
@@ -1,7 +1,10 @@
 """
 Alvin Lee
 
-A module for obtaining the gross profit from a schedule sheet json
+A module for obtaining the gross profit from schedule sheet jsons
+
+The sheets are walked once, column by column and customer by customer, adding every service to
+the totals as it is reached rather than building lists of all the customers and services first
 """
 
 import json
@@ -11,15 +14,96 @@ class BadSheetJSON(Exception):
     pass
 
 
-def getPrice(json_dict):
+def loadSheet(sheet):
     """
-    Returns the total price from all customers in a schedule sheet json
+    Returns a sheet dictionary from an already parsed dictionary, a json string, or the path to a
+    json file
+    """
+    if isinstance(sheet, dict):
+        return sheet
+    if isinstance(sheet, str) and sheet.lstrip().startswith("{"):
+        return json.loads(sheet)
+    with open(sheet, "r") as file:
+        return json.load(file)
+
+
+def newTotals():
+    """
+    Returns an empty dictionary of totals in the format used by getTotals
+    """
+    return {"total": 0, "customers": 0, "employees": {}, "sorted": {}, "hours": {}}
+
+
+def addSheet(totals, sheet):
+    """
+    Adds the prices from one sheet to a dictionary of totals
+
+    @parameter totals: a dictionary from newTotals
+    @parameter sheet: a parsed sheet dictionary
     """
-    dictionary = json.loads(json_dict)
     try:
-        items_list = list(map(lambda x: x["items"], dictionary["columns"]))
-        services_list = list(map(lambda x: x[1]["services"], sum(items_list, [])))
-        prices = list(map(lambda x: x["price"], sum(services_list, [])))
-        return sum(prices)
-    except KeyError:
+        start = sheet.get("start", 0) * 60
+        interval = sheet.get("interval", 15)
+        employees = totals["employees"]
+        categories = totals["sorted"]
+        hours = totals["hours"]
+        for column in sheet["columns"]:
+            label = column["label"]
+            column_total = 0
+            for item in column["items"]:
+                hour = (start + (item[0] * interval)) // 60
+                customer_total = 0
+                for service in item[1]["services"]:
+                    price = service["price"]
+                    customer_total += price
+                    category = service.get("sorted", "None")
+                    categories[category] = categories.get(category, 0) + price
+                hours[hour] = hours.get(hour, 0) + customer_total
+                column_total += customer_total
+                totals["customers"] += 1
+            employees[label] = employees.get(label, 0) + column_total
+            totals["total"] += column_total
+    except (KeyError, IndexError, TypeError):
         raise BadSheetJSON
+    return totals
+
+
+def getTotals(sheets):
+    """
+    Returns the total price of all the customers in one or more schedule sheets, broken down per
+    employee (column label), per service category (sorted) and per starting hour
+
+    @parameter sheets: a sheet dictionary, json string or file path, or a list of them, e.g. the
+                       day sheets of a month
+
+    e.g.
+    {"total": 384, "customers": 5, "employees": {"Gina": 226, ...},
+     "sorted": {"Nail Care": 96, ...}, "hours": {8: 68, ...}}
+    """
+    if not isinstance(sheets, (list, tuple)):
+        sheets = [sheets]
+    totals = newTotals()
+    for sheet in sheets:
+        addSheet(totals, loadSheet(sheet))
+    return totals
+
+
+def getPrice(json_dict):
+    """
+    Returns the total price from all customers in a schedule sheet json
+    """
+    return getTotals(json_dict)["total"]
+
+
+def getSheetTotal(sheet):
+    """
+    Returns the total price of all the customers in a live ScheduleSheet object, using the totals
+    each customer already keeps instead of summing their services again
+
+    e.g. for the open day sheet, where converting to json first would be wasted work
+    """
+    total = 0
+    for column in sheet.columns:
+        for index, size, customer in column.items():
+            total += customer.total_price
+    return total
@@ -8,11 +8,15 @@ to arguments for sheet.py if needed
 import sys
 
 sys.path.insert(0, "scheduler/")
+import os
 import json
 from ctime import *
 from service import *
 from customer import *
 from sheet import *
+from directory import CustomerDirectory
+from catalog import ServiceCatalog
+from storage import JSONStore
 
 
 class QueueError(Exception):
@@ -24,34 +28,29 @@ customer_path = "../data/customers.json"
 
 
 class Inter:
-    def __init__(self, json_dict=None):
+    def __init__(self, json_dict=None, store=None):
         """
         Class for more easily handling data between the front and back end, hopefully
+
+        @parameter store: an optional store from storage.py, defaults to the json files in data/
         """
-        self.sheet = ScheduleSheet(json_dict=json_dict)
         self.queue = []
-        with open(service_path) as file:
-            self.services = list(
-                map(lambda s: Service.fromJSON(s), json.load(file)))
-        with open(customer_path) as file:
-            self.customers = list(
-                map(lambda s: Customer.fromJSON(s), json.load(file)))
+        self.store = store if store != None else JSONStore(os.path.dirname(service_path))
+        self.services = ServiceCatalog(self.store.services())
+        self.sheet = ScheduleSheet(json_dict=json_dict, catalog=self.services)
+        self.customers = CustomerDirectory(self.store.customers(self.services))
 
     def update_services(self):
         """
         Updates the list of services
         """
-        s_lst = list.map(lambda s: Service.toJSON(s), self.services)
-        with open(service_path) as file:
-            json.dump(s_lst, file)
+        self.store.save_services(self.services)
 
     def update_customers(self):
         """
         Updates the list of customers
         """
-        c_lst = list.map(lambda c: Customer.toJSON(c), self.customers)
-        with open(customer_path) as file:
-            json.dump(c_lst, file)
+        self.store.save_customers(self.customers)
 
     def add_column(self, label):
         """
@@ -69,11 +68,10 @@ class Inter:
         """
         Creates a customer from string arguments and adds them to a queue
         """
-        s_set = set(filter(lambda s: s.getName() in services, self.services))
-        c = Customer(first, last, s_set, phone)
-        if phone not in list(map(lambda c: c.getPhone(), self.customers)):
-            self.customers.append(c)
-            self.update_customers()
+        s_lst = list(filter(None, map(self.services.get, services)))
+        c = Customer(first, last, phone, s_lst)
+        if self.customers.add(c):
+            self.store.put_customer(c)
         self.queue.append(c)
 
     def add_customer(self, col, row, customer):
@@ -98,7 +96,7 @@ class Inter:
         """
         for s in services:
             assert s in self.services
-        self.sheet.split_customer(col, row, set(services))
+        self.sheet.split_customer(col, row, list(dict.fromkeys(services)))
 
     def set_customer_services(self, col, row, services):
         """
@@ -106,7 +104,7 @@ class Inter:
         """
         for s in services:
             assert s in self.services
-        self.sheet.set_customer_services(col, row, set(services))
+        self.sheet.set_customer_services(col, row, list(dict.fromkeys(services)))
 
     def add_service(self, name, price, hour, minute, abb):
         """
@@ -114,5 +112,4 @@ class Inter:
         """
         t = CTime(int(hour), int(minute))
         s = Service(name, int(price), t, abb)
-        self.services.append(s)
-        self.update_services()
+        self.store.put_service(self.services.put(s))
@@ -0,0 +1,226 @@
+"""
+Alvin Lee
+
+A module for reporting revenue and utilization over many archived day sheets
+
+Day sheets are kept in a directory as one json file per day named by date, e.g. 2024-07-17.json,
+along with a journal of the edits made since, see storage.openDay. Every day is reduced to a small
+summary which is cached in a file next to the directory, so a report only parses the days that
+changed since the last one. The days that do need parsing are spread across a process pool.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from gross import addSheet, loadSheet, newTotals
+from storage import JSONStore, loadDay
+
+CACHE_SUFFIX = ".report_cache.json"
+PERIODS = ("day", "week", "month", "quarter", "year")
+
+
+def cachePath(directory):
+    """
+    Returns the path of the summary cache of a directory of day sheets, a file next to the
+    directory so that the directory only has days in it, e.g. drive/days.report_cache.json
+    """
+    return os.path.normpath(directory) + CACHE_SUFFIX
+
+
+def journalPath(path):
+    """
+    Returns the path of the journal of a day sheet file
+    """
+    return os.path.splitext(path)[0] + ".journal"
+
+
+def readDay(path):
+    """
+    Returns the sheet dictionary of a day sheet file with the edits in its journal applied the
+    same way the day is opened, see storage.loadDay, a day without journaled edits is read as is
+    """
+    journal = journalPath(path)
+    if not os.path.exists(journal) or os.path.getsize(journal) == 0:
+        return loadSheet(path)
+    directory, name = os.path.split(path)
+    return loadDay(JSONStore(None, directory), os.path.splitext(name)[0]).toJSON()
+
+
+def summarizeDay(path):
+    """
+    Returns the summary of one day sheet file, including the edits in its journal
+
+    Keeps the revenue, number of customers, total service minutes and, for every employee, the
+    revenue and how many of the rows in their column were booked
+    """
+    sheet = readDay(path)
+    totals = addSheet(newTotals(), sheet)
+    rows = (sheet["end"] - sheet["start"]) * 60 // sheet["interval"]
+    minutes = 0
+    employees = {}
+    for column in sheet["columns"]:
+        booked = 0
+        for item in column["items"]:
+            booked += item[2]
+            for service in item[1]["services"]:
+                minutes += (60 * service["time"]["hour"]) + service["time"]["minute"]
+        employees[column["label"]] = {
+            "revenue": totals["employees"].get(column["label"], 0),
+            "booked": booked,
+            "rows": rows,
+        }
+    return {
+        "revenue": totals["total"],
+        "customers": totals["customers"],
+        "minutes": minutes,
+        "employees": employees,
+    }
+
+
+def listDays(directory, start=None, end=None):
+    """
+    Returns a sorted list of (date, file name) tuples for the day sheets in a directory,
+    optionally only those between the [start] and [end] dates inclusive
+    """
+    days = []
+    for name in os.listdir(directory):
+        stem, ext = os.path.splitext(name)
+        if ext != ".json":
+            continue
+        try:
+            day = date.fromisoformat(stem)
+        except ValueError:
+            continue
+        if (start == None or day >= start) and (end == None or day <= end):
+            list.append(days, (day, name))
+    days.sort()
+    return days
+
+
+def fileKey(path):
+    """
+    Returns the [modification time, size] of a file, or [0, 0] if it does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return [0, 0]
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def loadSummaries(directory, start=None, end=None, processes=None, cache_path=None):
+    """
+    Returns a list of (date, summary) tuples for the day sheets in a directory
+
+    Summaries are read from the cache when neither the file nor its journal has changed since it
+    was cached, the rest are parsed in a process pool and written back to the cache
+
+    @parameter processes: the number of worker processes, None for the number of cpus and 0 to
+                          parse in the current process
+    @parameter cache_path: the file the summaries are cached in, see cachePath for the default
+    """
+    if cache_path == None:
+        cache_path = cachePath(directory)
+    try:
+        with open(cache_path, "r") as file:
+            cache = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+
+    days = listDays(directory, start, end)
+    stale = []
+    for day, name in days:
+        path = os.path.join(directory, name)
+        key = fileKey(path) + fileKey(journalPath(path))
+        if name not in cache or cache[name]["key"] != key:
+            list.append(stale, (name, key))
+
+    if len(stale) > 0:
+        paths = list(map(lambda s: os.path.join(directory, s[0]), stale))
+        if processes == 0 or len(stale) == 1:
+            summaries = list(map(summarizeDay, paths))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                summaries = list(pool.map(summarizeDay, paths, chunksize=8))
+        for (name, key), summary in zip(stale, summaries):
+            cache[name] = {"key": key, "summary": summary}
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w") as file:
+            json.dump(cache, file)
+        os.replace(tmp, cache_path)
+
+    return list(map(lambda d: (d[0], cache[d[1]]["summary"]), days))
+
+
+def periodKey(day, period):
+    """
+    Returns the string label of the period that a date falls in
+
+    e.g. 2024-07-17 is "2024-07-17" by day, "2024-W29" by week, "2024-07" by month,
+    "2024-Q3" by quarter and "2024" by year
+    """
+    assert period in PERIODS
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        year, week, weekday = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return f"{day.year}-{day.month:02d}"
+    if period == "quarter":
+        return f"{day.year}-Q{(day.month - 1) // 3 + 1}"
+    return str(day.year)
+
+
+def aggregate(summaries):
+    """
+    Combines a list of day summaries into one report with the revenue, number of customers,
+    average service minutes per customer and the revenue and utilization of every employee
+    """
+    report = {"days": 0, "revenue": 0, "customers": 0, "average_minutes": 0}
+    minutes = 0
+    employees = {}
+    for summary in summaries:
+        report["days"] += 1
+        report["revenue"] += summary["revenue"]
+        report["customers"] += summary["customers"]
+        minutes += summary["minutes"]
+        for label, e in summary["employees"].items():
+            total = employees.setdefault(label, {"revenue": 0, "booked": 0, "rows": 0})
+            total["revenue"] += e["revenue"]
+            total["booked"] += e["booked"]
+            total["rows"] += e["rows"]
+    if report["customers"] > 0:
+        report["average_minutes"] = minutes / report["customers"]
+    report["employees"] = {
+        label: {
+            "revenue": e["revenue"],
+            "utilization": e["booked"] / e["rows"] if e["rows"] > 0 else 0,
+        }
+        for label, e in employees.items()
+    }
+    return report
+
+
+def getReport(directory, start=None, end=None, period=None, processes=None, cache_path=None):
+    """
+    Returns a report over the archived day sheets in a directory between the [start] and [end]
+    dates inclusive, see aggregate for the format
+
+    If a [period] from PERIODS is given, returns a dictionary of period labels to reports instead
+
+    @parameter directory: string path of the directory of day sheets
+    @parameter start: optional datetime.date
+    @parameter end: optional datetime.date
+    @parameter period: optional string, one of PERIODS
+    @parameter processes: see loadSummaries
+    @parameter cache_path: see loadSummaries
+    """
+    summaries = loadSummaries(directory, start, end, processes, cache_path)
+    if period == None:
+        return aggregate(list(map(lambda s: s[1], summaries)))
+    groups = {}
+    for day, summary in summaries:
+        list.append(groups.setdefault(periodKey(day, period), []), summary)
+    return {key: aggregate(group) for key, group in groups.items()}
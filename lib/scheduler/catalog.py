@@ -0,0 +1,195 @@
+"""
+Alvin Lee
+
+This module is responsible for keeping one shared Service object per service name
+
+Customers loaded from json through a catalog reference the catalog's services instead of each
+holding their own copies, so a large sheet holds one Service and CTime per service rather than one
+per customer, and the catalog is the one place the price and duration of a service are kept
+"""
+
+from service import *
+
+
+class UnknownService(Exception):
+    pass
+
+
+class ServiceCatalog:
+    def __init__(self, services=None):
+        """
+        Creates a catalog of services indexed by name, abbreviation and sorted category
+
+        @parameter services: an optional list of Service objects, later services with the same name
+                             replace earlier ones
+        """
+        self.names = {}
+        self.abbrevs = {}
+        self.sorts = {}
+        # services interned from customers and sheets that are not in the catalog, kept apart so
+        # they are shared without being listed or saved as part of the catalog
+        self.unknown = {}
+        if services != None:
+            for s in services:
+                self.put(s)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(list(self.names.values()))
+
+    def __contains__(self, service):
+        """
+        Checks if a service or service name is in the catalog
+        """
+        if isinstance(service, Service):
+            service = service.getName()
+        return service in self.names
+
+    def index(self, service):
+        """
+        Helper method that adds a service to the abbreviation and category indexes
+        """
+        if service.getAbbrev() != "":
+            self.abbrevs[service.getAbbrev()] = service
+        self.sorts.setdefault(service.getSort(), {})[service.getName()] = service
+
+    def unindex(self, service):
+        """
+        Helper method that removes a service from the abbreviation and category indexes
+        """
+        if self.abbrevs.get(service.getAbbrev()) is service:
+            del self.abbrevs[service.getAbbrev()]
+        category = self.sorts.get(service.getSort(), {})
+        category.pop(service.getName(), None)
+        if len(category) == 0:
+            self.sorts.pop(service.getSort(), None)
+
+    def put(self, service):
+        """
+        Adds a service to the catalog and returns the catalog's copy of it
+
+        If a service with the same name is already in the catalog, that object is updated in place
+        with the new price, time, abbreviation and category so that every customer referencing it
+        sees the change, its revision is only bumped if the price or time actually changed
+
+        An unknown service that was interned with the same name is adopted the same way
+        """
+        assert isinstance(service, Service)
+        name = service.getName()
+        if name not in self.names:
+            if name not in self.unknown:
+                self.names[name] = service
+                self.index(service)
+                return service
+            self.names[name] = self.unknown.pop(name)
+        old = self.names[service.getName()]
+        self.unindex(old)
+        if old.getPrice() != service.getPrice() or old.getTime() != service.getTime():
+            old.price = service.getPrice()
+            old.time = service.getTime()
+            old.revision += 1
+        old.abbrev = service.getAbbrev()
+        old.sorted = service.getSort()
+        self.index(old)
+        return old
+
+    def remove(self, service):
+        """
+        Removes a service or the service with some name from the catalog
+
+        Returns True if a service was removed
+        """
+        name = service.getName() if isinstance(service, Service) else service
+        if name not in self.names:
+            return False
+        self.unindex(self.names.pop(name))
+        return True
+
+    def rename(self, service, name):
+        """
+        Replaces a service or the service with some name by a new service with the same price,
+        time, abbreviation and category under a new name, and returns the new service
+
+        Customers that already have the old service keep it under the old name
+
+        Raises UnknownService if the service is not in the catalog
+        """
+        old = self.get(service.getName() if isinstance(service, Service) else service)
+        if old == None:
+            raise UnknownService(service)
+        assert name not in self.names
+        self.remove(old)
+        return self.put(
+            Service(name, old.getPrice(), old.getTime(), old.getAbbrev(), old.getSort())
+        )
+
+    def intern(self, service):
+        """
+        Returns the catalog's service with the same name as a Service or service json dictionary
+
+        A service that is not in the catalog is kept as an unknown service instead, so that every
+        customer with it still shares one object but it is not added to the catalog, see put
+
+        A json dictionary with a known name is resolved without building a new Service
+        """
+        if isinstance(service, Service):
+            name = service.getName()
+        else:
+            name = service["name"]
+        if name in self.names:
+            return self.names[name]
+        if name in self.unknown:
+            return self.unknown[name]
+        if not isinstance(service, Service):
+            service = Service.fromJSON(service)
+        self.unknown[name] = service
+        return service
+
+    def get(self, name):
+        """
+        Returns the service with some name or None if there is none
+        """
+        return self.names.get(name)
+
+    def getByAbbrev(self, abbrev):
+        """
+        Returns the service with some abbreviation or None if there is none
+        """
+        return self.abbrevs.get(abbrev)
+
+    def getSorted(self, sort):
+        """
+        Returns the list of services sorted under some category
+        """
+        return list(self.sorts.get(sort, {}).values())
+
+    def getSorts(self):
+        """
+        Returns the list of categories with at least one service
+        """
+        return list(self.sorts.keys())
+
+    def resolve(self, names):
+        """
+        Returns the list of services for a list of service names
+
+        Raises UnknownService if a name is not in the catalog
+        """
+        res = []
+        for name in names:
+            if name not in self.names:
+                raise UnknownService(name)
+            list.append(res, self.names[name])
+        return res
+
+    def toJSON(self):
+        return list(map(lambda s: s.toJSON(), self.names.values()))
+
+    def fromJSON(self):
+        if isinstance(self, str):
+            import json
+
+            self = json.loads(self)
+        return ServiceCatalog(list(map(lambda s: Service.fromJSON(s), self)))
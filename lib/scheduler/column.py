@@ -7,6 +7,7 @@ size restrictions or overlaps
 """
 
 from customer import *
+from bisect import bisect_right
 
 
 class Lst:
@@ -64,30 +65,26 @@ class Column(Lst):
         super().__init__(rows, None)
         self.label = label
         self.num_items = 0
+        # a stable id given by the Grid holding the column, unchanged by renames and reorders
+        self.id = None
 
     def toJSON(self):
         """
         Returns a json file representation for a column
         """
         item_json_list = []
-        if self.num_items != 0:
-            for i in range(len(self.contents)):
-                if self.contents[i] in [None, 0]:
-                    continue
-                else:
-                    list.append(
-                        item_json_list,
-                        (i, self.contents[i].toJSON(), self.contents[i].size),
-                    )
+        for index, size, item in self.items():
+            list.append(item_json_list, (index, item.toJSON(), size))
         json = {
             "label": self.label,
             "items": item_json_list,
         }
         return json
 
-    def fromJSON(self, numRows=1):
+    def fromJSON(self, numRows=1, catalog=None):
         """
-        Returns a Column object from a json
+        Returns a Column object from a json, resolving services through an optional
+        ServiceCatalog
         """
         if isinstance(self, str):
             import json
@@ -95,9 +92,41 @@ class Column(Lst):
             self = json.loads(self)
         col = Column(self["label"], rows=numRows)
         for item in self["items"]:
-            col.add_item(item[0], Customer.fromJSON(item[1]), item[2])
+            col.add_item(item[0], Customer.fromJSON(item[1], catalog), item[2])
         return col
 
+    def items(self):
+        """
+        Returns a list of (index, size, item) tuples for every item in the column, ordered by
+        index
+        """
+        res = []
+        if self.num_items != 0:
+            start = None
+            for i in range(len(self.contents)):
+                if self.contents[i] == 0:
+                    continue
+                if start != None:
+                    list.append(res, (start, i - start, self.contents[start]))
+                    start = None
+                if self.contents[i] != None:
+                    start = i
+            if start != None:
+                list.append(res, (start, len(self.contents) - start, self.contents[start]))
+        return res
+
+    def is_free(self, index, size=1):
+        """
+        Returns True if an item of some size can be placed at index without going out of bounds
+        or overlapping an existing item
+        """
+        if index < 0 or size <= 0 or index + size > len(self.contents):
+            return False
+        for i in range(index, index + size):
+            if self.contents[i] != None:
+                return False
+        return True
+
     def get_item(self, index):
         """
         Helper method that gets the item at some index
@@ -120,9 +149,8 @@ class Column(Lst):
         assert size > 0
         assert index < len(self.contents)
         assert len(self.contents) - size >= index
-        for i in range(index, index + size):
-            if self.contents[i] != None:
-                raise BadArgument
+        if not self.is_free(index, size):
+            raise BadArgument
         self.contents[index] = item
         # this is here for testing reasons and we can't attach attributes to ints, bools, etc.
         if isinstance(item, Customer):
@@ -200,3 +228,149 @@ class Column(Lst):
         Returns the number of items in the column
         """
         return self.num_items
+
+
+class IntervalColumn(Column):
+    def __init__(self, label, rows=1):
+        """
+        Initializes a column that keeps its items in a sorted interval structure rather than one
+        list slot per row
+
+        The items are kept in three parallel lists ordered by starting index so that overlap
+        checks, point lookups and removals are binary searches instead of walks over every row
+
+        @parameter label: a string label given to the column
+        @parameter rows: is the integer number of rows that the column should contain
+        """
+        assert isinstance(label, str)
+        assert rows >= 0
+        self.length = rows
+        self.label = label
+        self.num_items = 0
+        self.id = None
+        self.starts = []
+        self.sizes = []
+        self.entries = []
+
+    @property
+    def contents(self):
+        """
+        A list of the column in the same format as Column.contents, with None for empty rows
+        and 0 for the rows covered by an item after its starting index
+        """
+        tmp = [None] * self.length
+        for index, size, item in self.items():
+            tmp[index] = item
+            for i in range(index + 1, index + size):
+                tmp[i] = 0
+        return tmp
+
+    def fromJSON(self, numRows=1, catalog=None):
+        """
+        Returns an IntervalColumn object from a json, resolving services through an optional
+        ServiceCatalog
+        """
+        if isinstance(self, str):
+            import json
+
+            self = json.loads(self)
+        col = IntervalColumn(self["label"], rows=numRows)
+        for item in self["items"]:
+            col.add_item(item[0], Customer.fromJSON(item[1], catalog), item[2])
+        return col
+
+    def find(self, index):
+        """
+        Helper method that returns the position in the sorted lists of the item covering index,
+        or None if no item covers it
+        """
+        pos = bisect_right(self.starts, index) - 1
+        if pos >= 0 and self.starts[pos] + self.sizes[pos] > index:
+            return pos
+        return None
+
+    def items(self):
+        """
+        Returns a list of (index, size, item) tuples for every item in the column, ordered by
+        index
+        """
+        return list(zip(self.starts, self.sizes, self.entries))
+
+    def is_free(self, index, size=1):
+        """
+        Returns True if an item of some size can be placed at index without going out of bounds
+        or overlapping an existing item
+        """
+        if index < 0 or size <= 0 or index + size > self.length:
+            return False
+        pos = bisect_right(self.starts, index) - 1
+        if pos >= 0 and self.starts[pos] + self.sizes[pos] > index:
+            return False
+        if pos + 1 < self.num_items and self.starts[pos + 1] < index + size:
+            return False
+        return True
+
+    def get_item(self, index):
+        """
+        Helper method that gets the item at some index
+        """
+        assert isinstance(index, int)
+        pos = self.find(index)
+        # an empty row has no item, as with Column.get_item
+        return self.entries[pos] if pos != None else None
+
+    def add_item(self, index, item, size=1):
+        """
+        Adds an item of some size to the column
+
+        Raises a BadArgument exception if there is an overlap between existing items and the
+        newly added one
+
+        @parameter index: an integer
+        @parameter item: the item to be added to the column at some index
+        @parameter size: the positive integer that is the number of rows the item covers
+        """
+        assert size > 0
+        assert index < self.length
+        assert self.length - size >= index
+        if not self.is_free(index, size):
+            raise BadArgument
+        pos = bisect_right(self.starts, index)
+        self.starts.insert(pos, index)
+        self.sizes.insert(pos, size)
+        self.entries.insert(pos, item)
+        if isinstance(item, Customer):
+            item.size = size
+        self.num_items += 1
+
+    def get_index(self, index):
+        """
+        A helper function that will obtain the position of the item at some index.
+        Assumes the item exists
+        """
+        return self.starts[self.find(index)]
+
+    def remove_item(self, index):
+        """
+        Removes an item specified at an index and raises an exception if there is no item
+        at the specified index
+
+        @parameter index: a integer
+        """
+        assert isinstance(index, int)
+        pos = self.find(index)
+        if pos == None:
+            raise BadIndex
+        del self.starts[pos]
+        del self.sizes[pos]
+        del self.entries[pos]
+        self.num_items -= 1
+
+    def getItem(self, index):
+        """
+        Gets the item located approximately at index
+        """
+        pos = self.find(index)
+        if pos != None:
+            return self.entries[pos]
+        return None
@@ -2,10 +2,18 @@
 Alvin Lee
 
 This module is responsible for keeping track of time in military format
+
+A CTime is an immutable value stored as a single number of minutes since midnight, any arithmetic
+returns a new CTime instead of modifying the existing one so that times can be safely shared
+between services, customers and the sheet
 """
 
+DAY_MINUTES = 24 * 60
+
 
 class CTime:
+    __slots__ = ("_minutes",)
+
     def __init__(self, hour=0, minute=0):
         """
         Creates a CTime class that represents military time starting at some initial time
@@ -15,11 +23,23 @@ class CTime:
         """
         assert isinstance(hour, int) and isinstance(minute, int)
         assert 0 <= hour < 24 and 0 <= minute < 60
-        self.hour = hour
-        self.minute = minute
+        object.__setattr__(self, "_minutes", hour * 60 + minute)
+
+    @classmethod
+    def fromMinutes(cls, minutes):
+        """
+        Creates a CTime from a total number of minutes, wrapping around midnight
+
+        Skips the hour and minute validation of the constructor as any integer is valid
+
+        @parameter minutes: integer
+        """
+        time = object.__new__(cls)
+        object.__setattr__(time, "_minutes", minutes % DAY_MINUTES)
+        return time
 
     def toJSON(self):
-        json = {"hour": self.hour, "minute": self.minute}
+        json = {"hour": self.getHour(), "minute": self.getMinute()}
         return json
 
     def fromJSON(self):
@@ -29,79 +49,107 @@ class CTime:
             self = json.loads(self)
         return CTime(self["hour"], self["minute"])
 
+    def __setattr__(self, name, value):
+        raise AttributeError("CTime objects are immutable")
+
+    def __reduce__(self):
+        """
+        Rebuilds the time from its minutes when pickled or copied, as __setattr__ refuses to
+        """
+        return (CTime.fromMinutes, (self._minutes,))
+
     def __eq__(self, o):
         """
         Custom equals method
         """
-        if self.minute == o.minute and self.hour == o.hour:
-            return True
-        return False
+        if not isinstance(o, CTime):
+            return NotImplemented
+        return self._minutes == o._minutes
+
+    def __lt__(self, o):
+        if not isinstance(o, CTime):
+            return NotImplemented
+        return self._minutes < o._minutes
+
+    def __le__(self, o):
+        if not isinstance(o, CTime):
+            return NotImplemented
+        return self._minutes <= o._minutes
+
+    def __gt__(self, o):
+        if not isinstance(o, CTime):
+            return NotImplemented
+        return self._minutes > o._minutes
+
+    def __ge__(self, o):
+        if not isinstance(o, CTime):
+            return NotImplemented
+        return self._minutes >= o._minutes
+
+    def __hash__(self):
+        return hash(self._minutes)
+
+    def __add__(self, o):
+        if not isinstance(o, CTime):
+            return NotImplemented
+        return CTime.fromMinutes(self._minutes + o._minutes)
+
+    def __repr__(self):
+        return f"CTime({self.getHour()}, {self.getMinute()})"
 
     def check(self):
         """
         A helper method to check whether or not the time is a valid time or not
         """
-        assert 0 <= self.hour < 24 and 0 <= self.minute < 60
+        assert 0 <= self._minutes < DAY_MINUTES
 
     def add(self, o):
         """
-        Adds two CTime objects
+        Returns the sum of two CTime objects as a new CTime
         """
         assert isinstance(o, CTime)
-        min = self.minute + o.minute
-        excess = min // 60
-        rem = min % 60
-        hour = self.hour + o.hour + excess
-        self.setTime(hour % 24, rem)
-        self.check()
+        return CTime.fromMinutes(self._minutes + o._minutes)
 
     def add_time(self, hour=0, minute=0):
         """
-        Modifies the time by some amount of hours and minutes
+        Returns a new CTime that is offset from the time by some amount of hours and minutes
 
         @parameter hour: integer
         @parameter minute: integer
         """
         assert isinstance(hour, int) and isinstance(minute, int)
-        self.minute += minute
-        exc_hr = -1 if self.minute < 0 and self.minute > -60 else self.minute // 60
-        self.minute = self.minute % 60
-        self.hour += exc_hr + hour
-        self.hour = self.hour % 24
-        self.check()
+        return CTime.fromMinutes(self._minutes + (60 * hour) + minute)
 
     def asMinutes(self):
         """
         Returns the total time in minutes
         """
-        return self.minute + (60 * self.hour)
+        return self._minutes
 
     def toString(self):
         """
         Returns a string representation of the current time
         """
-        hour = str(self.hour) if self.hour > 9 else f"0{self.hour}"
-        minute = str(self.minute) if self.minute > 9 else f"0{self.minute}"
-        return f"{hour}:{minute}"
+        hour, minute = divmod(self._minutes, 60)
+        return f"{hour:02d}:{minute:02d}"
 
-    # ========== Get and Set methods ==========
-    def setTime(self, hour, minute):
-        """
-        Sets a new hour and minute for the time
-        """
-        assert isinstance(hour, int) and isinstance(minute, int)
-        assert 0 <= hour < 24 and 0 <= minute < 60
-        self.hour = hour
-        self.minute = minute
+    # ========== Get methods ==========
+    @property
+    def hour(self):
+        return self._minutes // 60
+
+    @property
+    def minute(self):
+        return self._minutes % 60
 
     def getHour(self):
         """
         Gets the hour
         """
-        return self.hour
+        return self._minutes // 60
 
     def getMinute(self):
         """
         Gets the minute
         """
-        return self.minute
+        return self._minutes % 60
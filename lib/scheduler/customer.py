@@ -10,29 +10,48 @@ from service import *
 
 
 class Customer:
-    def __init__(self, first, last="", phone="0000000000", services=[], served=False):
+    __slots__ = (
+        "first",
+        "last",
+        "phone",
+        "services",
+        "served",
+        "size",
+        "minutes",
+        "price",
+        "time",
+        "revision",
+    )
+
+    def __init__(self, first, last="", phone="0000000000", services=None, served=False):
         """
         Creates the customer class that contains the information regarding what services a customer
         wants, their name, and phone number
 
         @parameter first: string
         @parameter last: string
-        @parameter services: a set of Service objects
+        @parameter services: an optional list of Service objects with no two sharing a name
         @parameter phone: a string of length 10
+
+        The services are kept in a dictionary keyed by name, in the order they were added, so that
+        checking for, adding and removing a service does not scan the other services
         """
         assert isinstance(first, str) and isinstance(last, str)
         assert len(phone) == 10
-        for s in services:
-            assert isinstance(s, Service)
-            assert services.count(s) == 1
+        self.services = {}
+        if services != None:
+            for s in services:
+                assert isinstance(s, Service)
+                assert s.getName() not in self.services
+                self.services[s.getName()] = s
         self.first = first.strip()
         self.last = last.strip()
-        self.services = services
         self.phone = phone.strip()
         self.served = served
+        # the number of rows the customer takes up once added to a column
+        self.size = 0
 
-        # sets time to default 0000 and then updates the time according to the services
-        self.time = CTime()
+        # the total minutes, price and time of the services are kept as running totals
         self.update_time()
 
     def __eq__(self, o):
@@ -47,6 +66,12 @@ class Customer:
             return True
         return False
 
+    def __hash__(self):
+        """
+        Customers hash by phone number so that equal customers hash the same
+        """
+        return hash(self.phone)
+
     def toString(self):
         """
         Helper method that converts a customer to a readable string
@@ -55,7 +80,7 @@ class Customer:
 
     def toJSON(self):
         services_json_list = []
-        for s in self.services:
+        for s in self.services.values():
             list.append(services_json_list, s.toJSON())
         json = {
             "first": self.first,
@@ -66,26 +91,81 @@ class Customer:
         }
         return json
 
-    def fromJSON(self):
+    def fromJSON(self, catalog=None):
+        """
+        Returns a Customer object from a json
+
+        @parameter catalog: an optional ServiceCatalog, if given the customer references the
+                            catalog's services instead of new copies
+        """
         if isinstance(self, str):
             import json
 
             self = json.loads(self)
         services = []
         for s in self["services"]:
-            services.append(Service.fromJSON(s))
+            if catalog != None:
+                services.append(catalog.intern(s))
+            else:
+                services.append(Service.fromJSON(s))
         return Customer(
             self["first"], self["last"], self["phone"], services, self["served"]
         )
 
     def update_time(self):
         """
-        Helper function that modifies the time according to the current set of services
+        Helper function that recomputes the total minutes, price and time from the current set of
+        services
         """
-        res = CTime()
-        for s in self.services:
-            res.add(s.getTime())
-        self.time = res
+        minutes = 0
+        price = 0
+        for s in self.services.values():
+            minutes += s.getTime().asMinutes()
+            price += s.getPrice()
+        self.set_totals(minutes, price)
+
+    def set_totals(self, minutes, price):
+        """
+        Helper function that sets the running totals as of the current revisions of the services
+        """
+        self.minutes = minutes
+        self.price = price
+        self.time = CTime.fromMinutes(minutes)
+        self.revision = self.services_revision()
+
+    def services_revision(self):
+        """
+        Helper function that returns the sum of the revisions of the services, which only grows
+        when one of them changes as revisions are never lowered
+        """
+        revision = 0
+        for s in self.services.values():
+            revision += s.revision
+        return revision
+
+    def check_totals(self):
+        """
+        Helper function that recomputes the totals if any of the services has changed since they
+        were set, changes to other services do not affect them
+        """
+        if self.revision != self.services_revision():
+            self.update_time()
+
+    @property
+    def total_minutes(self):
+        """
+        The total minutes of every service
+        """
+        self.check_totals()
+        return self.minutes
+
+    @property
+    def total_price(self):
+        """
+        The total price of every service
+        """
+        self.check_totals()
+        return self.price
 
     def add_service(self, service):
         """
@@ -94,20 +174,30 @@ class Customer:
         @parameter service: a Service object
         """
         assert isinstance(service, Service)
-        try:
-            assert self.services.count(service) == 0
-            list.append(self.services, service)
-            self.update_time()
-        except AssertionError:
-            pass
+        if service.getName() in self.services:
+            return
+        self.check_totals()
+        self.services[service.getName()] = service
+        self.set_totals(
+            self.minutes + service.getTime().asMinutes(),
+            self.price + service.getPrice(),
+        )
 
     def remove_service(self, service):
         """
         Removes [service] from the set of services
+
+        Raises ValueError if the customer does not have the service
         """
         assert isinstance(service, Service)
-        list.remove(self.services, service)
-        self.update_time()
+        if service.getName() not in self.services:
+            raise ValueError(service.getName())
+        self.check_totals()
+        service = self.services.pop(service.getName())
+        self.set_totals(
+            self.minutes - service.getTime().asMinutes(),
+            self.price - service.getPrice(),
+        )
 
     # ========== Get and Set methods ==========
 
@@ -129,18 +219,33 @@ class Customer:
         """
         return self.last
 
+    def hasService(self, service):
+        """
+        Checks if the customer has a service or a service with some name
+        """
+        if isinstance(service, Service):
+            service = service.getName()
+        return service in self.services
+
     def getServices(self):
         """
-        Returns a set of services
+        Returns a list of the services in the order they were added
         """
-        return self.services
+        return list(self.services.values())
 
     def getTime(self):
         """
-        Returns the time
+        Returns the total time of every service
         """
+        self.check_totals()
         return self.time
 
+    def getPrice(self):
+        """
+        Returns the total price of every service
+        """
+        return self.total_price
+
     def getPhone(self):
         """
         Returns the phone number
@@ -0,0 +1,140 @@
+"""
+Alvin Lee
+
+This module is responsible for keeping the list of known customers searchable
+
+Customers are indexed by phone number in a dictionary for duplicate checks, and every customer's
+name words, full name and phone number are kept in one sorted list so that a prefix search is a
+binary search followed by reading off the matches
+"""
+
+from bisect import bisect_left, insort
+from customer import *
+
+
+class CustomerDirectory:
+    def __init__(self, customers=None):
+        """
+        Creates a directory of customers indexed by phone number and searchable by name and phone
+        prefixes
+
+        @parameter customers: an optional list of Customer objects, customers with a phone number
+                              already in the directory are skipped
+        """
+        self.phones = {}
+        self.keys = []
+        if customers != None:
+            for c in customers:
+                if c.getPhone() not in self.phones:
+                    self.phones[c.getPhone()] = c
+            # sort once instead of inserting every key
+            self.keys = sorted(
+                (key, c.getPhone()) for c in self.phones.values() for key in self.to_keys(c)
+            )
+
+    def to_keys(self, customer):
+        """
+        Helper method that returns the search keys of a customer: the lowercase words of the name,
+        the full name and the phone number
+        """
+        name = customer.getName().lower().strip()
+        keys = set(name.split())
+        keys.add(name)
+        keys.add("#" + customer.getPhone())
+        return keys
+
+    def __len__(self):
+        return len(self.phones)
+
+    def __iter__(self):
+        return iter(list(self.phones.values()))
+
+    def __contains__(self, customer):
+        """
+        Checks if a customer or phone number is in the directory
+        """
+        if isinstance(customer, Customer):
+            customer = customer.getPhone()
+        return customer in self.phones
+
+    def get(self, phone):
+        """
+        Returns the customer with the phone number or None if there is none
+        """
+        return self.phones.get(phone)
+
+    def add(self, customer):
+        """
+        Adds a customer to the directory
+
+        Returns True if the customer was added and False if their phone number is already in the
+        directory
+        """
+        assert isinstance(customer, Customer)
+        if customer.getPhone() in self.phones:
+            return False
+        self.phones[customer.getPhone()] = customer
+        for key in self.to_keys(customer):
+            insort(self.keys, (key, customer.getPhone()))
+        return True
+
+    def update(self, customer):
+        """
+        Adds a customer to the directory, replacing any customer with the same phone number
+        """
+        self.remove(customer)
+        self.add(customer)
+
+    def remove(self, customer):
+        """
+        Removes a customer or the customer with some phone number from the directory
+
+        Returns True if a customer was removed
+        """
+        phone = customer.getPhone() if isinstance(customer, Customer) else customer
+        old = self.phones.pop(phone, None)
+        if old == None:
+            return False
+        for key in self.to_keys(old):
+            i = bisect_left(self.keys, (key, phone))
+            del self.keys[i]
+        return True
+
+    def prefix(self, key):
+        """
+        Helper method that returns the phone numbers of every key starting with [key], in key order
+        """
+        res = []
+        i = bisect_left(self.keys, (key,))
+        while i < len(self.keys) and self.keys[i][0].startswith(key):
+            list.append(res, self.keys[i][1])
+            i += 1
+        return res
+
+    def search(self, name="", phone=""):
+        """
+        Returns a list of the customers with a name word or full name starting with [name] and a
+        phone number starting with [phone], ignoring case
+
+        An empty argument matches every customer
+        """
+        name = name.lower().strip()
+        phone = phone.strip()
+        if name == "" and phone == "":
+            return list(self.phones.values())
+        if phone != "":
+            matches = self.prefix("#" + phone)
+            if name != "":
+                names = set(self.prefix(name))
+                matches = list(filter(lambda p: p in names, matches))
+        else:
+            matches = self.prefix(name)
+
+        # a customer can match more than one of their keys, keep the first
+        res = []
+        seen = set()
+        for p in matches:
+            if p not in seen:
+                seen.add(p)
+                list.append(res, self.phones[p])
+        return res
@@ -0,0 +1,128 @@
+"""
+Alvin Lee
+
+This module is responsible for saving the edits made to a schedule sheet as they happen
+
+Every edit is appended as one line to a journal file so that saving costs the same no matter how
+big the sheet is, and every so often the journal is folded into a snapshot of the whole sheet.
+Loading a sheet replays the journal on top of the snapshot.
+
+Nothing is written until the first edit.
+"""
+
+import json
+import os
+
+
+class Journal:
+    def __init__(self, path, snapshot_path, compact_every=200, sync=True):
+        """
+        Creates a journal that appends to the file at [path] and compacts into the file at
+        [snapshot_path]
+
+        @parameter path: string path of the journal file, created on the first entry
+        @parameter snapshot_path: string path of the sheet json the journal is folded into
+        @parameter compact_every: the number of entries after which the journal is compacted
+        @parameter sync: if True, every entry is flushed to disk before returning
+        """
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.compact_every = compact_every
+        self.sync = sync
+        # the file is only opened for appending once there is something to append
+        self.file = None
+        # set when the sheet was changed without journaling it, e.g. the columns a new day starts
+        # with, so that the first entry also writes the snapshot
+        self.unsaved = False
+
+        # find the last sequence number so new entries continue from it
+        self.seq = 0
+        self.count = 0
+        for entry in self.entries():
+            self.seq = max(self.seq, entry["seq"])
+            self.count += 1
+
+    def drop_partial(self):
+        """
+        Truncates the journal file back to the end of its last full line, so that a line left
+        partially written by a crash is not continued by the next entry
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as file:
+            data = file.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                file.truncate(end)
+
+    def entries(self, after=0):
+        """
+        Returns a list of the journal entries with a sequence number greater than [after]
+
+        A partially written last line, e.g. from a crash, is ignored
+        """
+        res = []
+        if not os.path.exists(self.path):
+            return res
+        with open(self.path, "r") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry["seq"] > after:
+                    list.append(res, entry)
+        return res
+
+    def append(self, op, *args):
+        """
+        Appends an entry for the operation [op] with its json compatible arguments to the journal
+        """
+        if self.file == None:
+            self.drop_partial()
+            self.file = open(self.path, "a")
+        self.seq += 1
+        self.count += 1
+        self.file.write(json.dumps({"seq": self.seq, "op": op, "args": args}) + "\n")
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def should_compact(self):
+        """
+        Returns True if enough entries have been appended that the journal should be compacted, or
+        if the snapshot is missing changes that were not journaled
+        """
+        return self.count >= self.compact_every or self.unsaved
+
+    def compact(self, sheet):
+        """
+        Writes the whole sheet to the snapshot file and empties the journal
+
+        The snapshot is written to a temporary file and renamed over the old one so that a crash
+        leaves either the old or the new snapshot. The snapshot records the last sequence number
+        it contains so that entries left over from a crash before the journal is emptied are not
+        applied twice.
+        """
+        json_dict = sheet.toJSON()
+        json_dict["seq"] = self.seq
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w") as file:
+            json.dump(json_dict, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.snapshot_path)
+        self.unsaved = False
+
+        if self.file != None:
+            self.file.close()
+        self.file = open(self.path, "w")
+        self.count = 0
+
+    def close(self):
+        """
+        Closes the journal file
+        """
+        if self.file != None:
+            self.file.close()
+            self.file = None
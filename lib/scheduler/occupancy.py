@@ -0,0 +1,135 @@
+"""
+Alvin Lee
+
+This module keeps a whole sheet view of which rows of which columns are taken so that questions
+about free time can be answered for every column at once instead of walking each column
+
+Requires numpy, which is optional for the rest of the scheduler
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class OccupancyMatrix:
+    def __init__(self, rows, cols=0):
+        """
+        Creates a rows by columns matrix of item ids where 0 marks a free cell
+
+        @parameter rows: positive integer number of rows
+        @parameter cols: non-negative integer number of columns
+        """
+        if np == None:
+            raise ImportError("numpy is required for the occupancy matrix")
+        assert rows > 0 and cols >= 0
+        self.ids = np.zeros((rows, cols), dtype=np.int32)
+        self.items = {}
+        self.next_id = 1
+
+    def add_column(self):
+        """
+        Adds an empty column to the right side of the matrix
+        """
+        self.ids = np.hstack(
+            (self.ids, np.zeros((self.ids.shape[0], 1), dtype=np.int32))
+        )
+
+    def remove_column(self, col):
+        """
+        Removes the column at index col along with the ids of any items still in it
+        """
+        for i in np.unique(self.ids[:, col]):
+            self.items.pop(int(i), None)
+        self.ids = np.delete(self.ids, col, axis=1)
+
+    def mark(self, col, row, size, item):
+        """
+        Marks size rows starting at row in column col as taken by item
+
+        Returns the id given to the item
+        """
+        item_id = self.next_id
+        self.next_id += 1
+        self.items[item_id] = item
+        self.ids[row : row + size, col] = item_id
+        return item_id
+
+    def clear(self, col, row, size):
+        """
+        Frees size rows starting at row in column col
+        """
+        self.items.pop(int(self.ids[row, col]), None)
+        self.ids[row : row + size, col] = 0
+
+    def refresh(self, col, column):
+        """
+        Rewrites column col of the matrix from the (index, size, item) tuples of a Column
+        """
+        for i in np.unique(self.ids[:, col]):
+            self.items.pop(int(i), None)
+        self.ids[:, col] = 0
+        for index, size, item in column.items():
+            self.mark(col, index, size, item)
+
+    def getItem(self, col, row):
+        """
+        Returns the item at some column and row or None if the cell is free
+        """
+        return self.items.get(int(self.ids[row, col]))
+
+    def is_free(self, col, row, size=1):
+        """
+        Returns True if size rows starting at row in column col are inside the matrix and free
+        """
+        if row < 0 or size <= 0 or row + size > self.ids.shape[0]:
+            return False
+        return not self.ids[row : row + size, col].any()
+
+    def free_runs(self, length=1):
+        """
+        Returns a list with one entry per column, each a list of (row, size) tuples for every
+        run of free rows that is at least length rows long
+        """
+        rows, cols = self.ids.shape
+        # pad each column with taken cells so every run has a start and an end
+        padded = np.ones((cols, rows + 2), dtype=np.int8)
+        padded[:, 1:-1] = self.ids.T != 0
+        edges = np.diff(padded, axis=1)
+        start_cols, starts = np.nonzero(edges == -1)
+        ends = np.nonzero(edges == 1)[1]
+        sizes = ends - starts
+        keep = sizes >= length
+        res = [[] for c in range(cols)]
+        for c, start, size in zip(
+            start_cols[keep].tolist(), starts[keep].tolist(), sizes[keep].tolist()
+        ):
+            res[c].append((start, size))
+        return res
+
+    def utilization(self):
+        """
+        Returns an array with the fraction of taken rows for every column
+        """
+        return np.count_nonzero(self.ids, axis=0) / self.ids.shape[0]
+
+    def first_free_column(self, row):
+        """
+        Returns the index of the first column that is free at row, or None if there is none
+        """
+        free = np.flatnonzero(self.ids[row] == 0)
+        if len(free) == 0:
+            return None
+        return int(free[0])
+
+    def toString(self):
+        """
+        Returns the rows of the matrix in the same format as ScheduleSheet.toString where "c"
+        marks the start of an item, "0" the rest of an item and "-" a free cell
+        """
+        taken = self.ids != 0
+        starts = taken.copy()
+        starts[1:] &= self.ids[1:] != self.ids[:-1]
+        chars = np.where(starts, "c", np.where(taken, "0", "-"))
+        return ["".join(row) for row in chars.tolist()]
@@ -0,0 +1,163 @@
+"""
+Alvin Lee
+
+This module is responsible for finding where queued customers can be placed on a schedule sheet
+without overlapping the customers already booked
+
+Every column is reduced to a sorted list of free gaps once, after which each customer only has
+to look through the gaps instead of the rows of the sheet
+"""
+
+from sheet import *
+
+STRATEGIES = ("earliest", "best", "least_loaded")
+
+
+class SlotFinder:
+    def __init__(self, sheet, employees=None, shifts=None, not_before=0):
+        """
+        Creates a SlotFinder from the current state of a ScheduleSheet
+
+        The sheet is only read, placements are reserved within the SlotFinder until they are
+        applied with SlotFinder.apply
+
+        @parameter sheet: the ScheduleSheet to place customers on
+        @parameter employees: optional list of column labels that are working, e.g. the list for
+                              the day in data/schedule.json, columns not in the list are skipped
+        @parameter shifts: optional dictionary of column labels to a (start, end) tuple of CTime
+                           objects, customers are only placed within the shift
+        @parameter not_before: the integer row before which no customer can be placed
+        """
+        assert isinstance(sheet, ScheduleSheet)
+        self.sheet = sheet
+        self.gaps = []
+        self.load = []
+        for col in range(sheet.getLength()):
+            column = sheet.getColumn(col)
+            first, last = not_before, sheet.getNumRows()
+            if employees != None and column.getLabel() not in employees:
+                first = last
+            elif shifts != None and column.getLabel() in shifts:
+                start, end = shifts[column.getLabel()]
+                first = max(first, self.to_row(start))
+                last = min(last, self.to_row(end, ceil=False))
+
+            # collect the gaps between the booked items that lie within the shift
+            gaps = []
+            load = 0
+            prev = 0
+            for index, size, item in column.items():
+                load += size
+                if min(index, last) - max(prev, first) > 0:
+                    list.append(gaps, [max(prev, first), min(index, last)])
+                prev = index + size
+            if last - max(prev, first) > 0:
+                list.append(gaps, [max(prev, first), last])
+            list.append(self.gaps, gaps)
+            list.append(self.load, load)
+
+    def to_row(self, time, ceil=True):
+        """
+        Helper method that converts a CTime into the first row that starts at or after it, or the
+        last row boundary at or before it if ceil is False
+        """
+        minutes = time.asMinutes() - self.sheet.getStart().asMinutes()
+        if ceil:
+            return max(0, -(-minutes // self.sheet.getInterval()))
+        return max(0, minutes // self.sheet.getInterval())
+
+    def find(self, size, strategy="earliest"):
+        """
+        Returns the (col, row) where an item of [size] rows would be placed, or None if it does not
+        fit anywhere
+
+        @parameter size: positive integer number of rows
+        @parameter strategy: "earliest" for the earliest row in any column, "best" for the gap
+                             that leaves the least free time behind, or "least_loaded" for the
+                             earliest row in the column with the fewest booked rows
+        """
+        assert strategy in STRATEGIES
+        best = None
+        best_key = None
+        for col in range(len(self.gaps)):
+            for start, end in self.gaps[col]:
+                if end - start < size:
+                    continue
+                if strategy == "earliest":
+                    key = (start, col)
+                elif strategy == "best":
+                    key = (end - start - size, start, col)
+                else:
+                    key = (self.load[col], start, col)
+                if best_key == None or key < best_key:
+                    best, best_key = (col, start), key
+                # the gaps are sorted, so only the first fit per column matters unless best fit
+                if strategy != "best":
+                    break
+        return best
+
+    def reserve(self, col, row, size):
+        """
+        Removes [size] rows starting at [row] in [col] from the free gaps
+
+        Raises a CustomerOverlap exception if the rows are not free
+        """
+        gaps = self.gaps[col]
+        for i in range(len(gaps)):
+            start, end = gaps[i]
+            if start <= row and row + size <= end:
+                new = []
+                if row > start:
+                    list.append(new, [start, row])
+                if end > row + size:
+                    list.append(new, [row + size, end])
+                gaps[i : i + 1] = new
+                self.load[col] += size
+                return
+        raise CustomerOverlap
+
+    def place_queue(self, queue, strategy="earliest"):
+        """
+        Finds a place for every customer in the queue, in order, reserving each placement so later
+        customers do not overlap earlier ones
+
+        Returns a tuple of a list of (customer, col, row) placements and a list of the customers
+        that could not be placed
+
+        @parameter queue: a list of Customer objects
+        @parameter strategy: one of STRATEGIES, see SlotFinder.find
+        """
+        placements = []
+        unplaced = []
+        for customer in queue:
+            size = self.sheet.time_to_length(customer.total_minutes)
+            spot = self.find(size, strategy) if size > 0 else None
+            if spot == None:
+                list.append(unplaced, customer)
+            else:
+                self.reserve(spot[0], spot[1], size)
+                list.append(placements, (customer, spot[0], spot[1]))
+        return placements, unplaced
+
+    def apply(self, placements):
+        """
+        Adds the placements returned by SlotFinder.place_queue to the sheet as one batch, so they
+        are undone in one step
+
+        Raises BadIndex if a placement is outside the sheet and BadArgument if it overlaps another
+        customer, in which case none of the placements are added
+        """
+        with self.sheet.batch():
+            for customer, col, row in placements:
+                if not self.sheet.add_customer(col, row, customer):
+                    raise BadIndex
+
+
+def place_queue(sheet, queue, strategy="earliest", employees=None, shifts=None):
+    """
+    Helper function that finds placements for a queue of customers on a sheet without modifying
+    the sheet, see SlotFinder for the arguments
+
+    Returns a tuple of a list of (customer, col, row) placements and a list of unplaced customers
+    """
+    return SlotFinder(sheet, employees, shifts).place_queue(queue, strategy)
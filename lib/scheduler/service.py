@@ -9,6 +9,8 @@ from ctime import *
 
 
 class Service:
+    __slots__ = ("name", "price", "time", "abbrev", "sorted", "revision")
+
     def __init__(self, name, price, time_span, abb="", sort="None"):
         """
         Creates a class for services containing all the necessary information for the scheduler
@@ -31,16 +33,35 @@ class Service:
         self.time = time_span
         self.abbrev = abb
         self.sorted = sort
+        # bumped whenever the price or time changes so that the customers with this service know
+        # to recompute their cached totals
+        self.revision = 0
+
+    def __setattr__(self, attr, value):
+        """
+        Services hash by name, so the name is set once and cannot be changed after, a service is
+        renamed by replacing it with a new one, see ServiceCatalog.rename
+        """
+        if attr == "name" and hasattr(self, "name"):
+            raise AttributeError("the name of a service cannot be changed")
+        object.__setattr__(self, attr, value)
 
     def __eq__(self, o):
         """
         Two services are equal if and only if they have the same name
         """
-        assert isinstance(o, Service)
+        if not isinstance(o, Service):
+            return False
         if self.name == o.name:
             return True
         return False
 
+    def __hash__(self):
+        """
+        Services hash by name so that equal services hash the same
+        """
+        return hash(self.name)
+
     def toJSON(self):
         json = {
             "name": self.name,
@@ -99,25 +120,25 @@ class Service:
         """
         return self.abbrev
 
-    def setName(self, new):
-        """
-        Sets the name as [new]
-        """
-        assert isinstance(new, str)
-        self.name = new
-
     def setPrice(self, new):
         """
         Sets the price to [new]
         """
         assert isinstance(new, int) and new >= 0
-        self.price = new
+        if new != self.price:
+            self.price = new
+            self.revision += 1
 
     def setTime(self, hour, minute):
         """
         Sets the time to a new [hour] and [minute]
+
+        The old CTime is replaced rather than modified as it may be shared with other objects
         """
-        self.time.setTime(hour, minute)
+        time = CTime(hour, minute)
+        if time != self.time:
+            self.time = time
+            self.revision += 1
 
     def setAbbrev(self, new):
         """
@@ -7,22 +7,29 @@ that keeps track of where customers are, which employees have which customer, et
 
 from column import *
 from ctime import *
+from occupancy import OccupancyMatrix
+from contextlib import contextmanager
 import json
+import logging
 from customer import *
 from ctime import *
 
 
+logger = logging.getLogger(__name__)
+
+
 class NonemptyColumnException(Exception):
     pass
 
 
 class Grid:
-    def __init__(self, cols=0, numRows=1):
+    def __init__(self, cols=0, numRows=1, column_type=Column):
         """
         Creates a Grid class with a at least one default column with some positive number of rows
 
         @parameter cols: positive integer
         @parameter numRows: positive integer
+        @parameter column_type: the class used for the columns, either Column or IntervalColumn
         """
         assert isinstance(cols, int)
         assert isinstance(numRows, int)
@@ -31,6 +38,27 @@ class Grid:
         self.columns = []
         self.length = 0
         self.numRows = numRows
+        self.column_type = column_type
+        # labels are unique, so the index of a column is kept by label along with its stable id
+        self.labels = {}
+        self.ids = {}
+        self.next_id = 0
+
+    def reindex(self, start=0):
+        """
+        Helper method that updates the label map for the columns from index start onwards, giving
+        an id to any column that does not have one yet
+        """
+        if start == 0:
+            self.labels = {}
+        for i in range(start, len(self.columns)):
+            col = self.columns[i]
+            if col.id == None:
+                col.id = self.next_id
+                self.next_id += 1
+            self.labels[col.label] = i
+            self.ids[col.id] = col
+        self.length = len(self.columns)
 
     def add_column(self, label):
         """
@@ -41,35 +69,63 @@ class Grid:
         @parameter label: a string
         """
         assert isinstance(label, str)
-        for col in self.columns:
-            if col.label == label:
-                return False
-        list.append(self.columns, Column(label, self.numRows))
-        self.length += 1
+        if label in self.labels:
+            return False
+        list.append(self.columns, self.column_type(label, self.numRows))
+        self.reindex(self.length)
         return True
 
-    def remove_column(self, label):
+    def to_index(self, key):
+        """
+        Helper method that returns the index of a column given its label or index, or None if there
+        is no such column
+        """
+        if isinstance(key, str):
+            return self.labels.get(key)
+        assert isinstance(key, int)
+        if 0 <= key < self.length:
+            return key
+        return None
+
+    def remove_column(self, key):
         """
         Modifies the list by removing a Column from the list using the list.pop method
         The column MUST be empty in order for it to be removed
 
-        Returns True if the column can and is now removed, else returns False
+        Returns True if the column is now removed, False if there is no such column and raises
+        NonemptyColumnException if the column still has items
 
-        @parameter label: the string label on the column
+        @parameter key: the string label on the column or its integer index
         """
-        assert isinstance(index, int)
-        assert index <= len(self.columns)
-        for col in self.columns:
-            if col.label == label:
-                if col.getNumItems() == 0:
-                    list.pop(self.columns, index)
-                    self.length -= 1
-                    return True
-                else:
-                    return False
-        else:
+        index = self.to_index(key)
+        if index == None:
+            return False
+        col = self.columns[index]
+        if col.getNumItems() != 0:
             raise NonemptyColumnException
+        list.pop(self.columns, index)
+        del self.labels[col.label]
+        del self.ids[col.id]
+        self.reindex(index)
+        return True
+
+    def move_column(self, key, new_index):
+        """
+        Moves a column to a new index, shifting the columns in between over by one
+
+        Returns True if the column was moved and False if there is no such column
+
+        @parameter key: the string label on the column or its integer index
+        @parameter new_index: the integer index the column will be at afterwards
+        """
+        index = self.to_index(key)
+        if index == None:
             return False
+        assert isinstance(new_index, int)
+        assert 0 <= new_index < self.length
+        list.insert(self.columns, new_index, list.pop(self.columns, index))
+        self.reindex(min(index, new_index))
+        return True
 
     # ========== Set and Get methods ==========
     def getColumn(self, index):
@@ -80,6 +136,40 @@ class Grid:
         assert index < self.length
         return self.columns[index]
 
+    def getColumnByLabel(self, label):
+        """
+        Gets the column with some label or None if there is none
+        """
+        index = self.labels.get(label)
+        return self.columns[index] if index != None else None
+
+    def getColumnById(self, id):
+        """
+        Gets the column with some stable id or None if there is none
+        """
+        return self.ids.get(id)
+
+    def getIndex(self, label):
+        """
+        Gets the index of the column with some label or None if there is none
+        """
+        return self.labels.get(label)
+
+    def setColumnName(self, ind, name):
+        """
+        Sets the column at index ind to a new name
+
+        Returns True if the column was renamed and False if another column already has the name
+        """
+        assert isinstance(name, str)
+        col = self.getColumn(ind)
+        if name in self.labels and self.labels[name] != ind:
+            return False
+        del self.labels[col.label]
+        col.setLabel(name)
+        self.labels[name] = ind
+        return True
+
     def getLength(self):
         """
         Gets the total number of columns
@@ -97,8 +187,61 @@ class CustomerOverlap(Exception):
     pass
 
 
+class LossyRegrid(Exception):
+    pass
+
+
+def regridJSON(json_dict, interval):
+    """
+    Returns a copy of a sheet json converted to a new row interval in minutes
+
+    Every customer keeps the same start time and the same number of minutes on the sheet, so the
+    conversion can always be undone. Going to a finer interval that divides the old one always
+    works, going to a coarser one raises LossyRegrid if a customer does not start and end on a row
+    of the new interval
+
+    The "seq" of a journal snapshot is dropped as the journaled row indexes are in the old interval
+
+    @parameter json_dict: a sheet json string or dictionary, e.g. a saved day
+    @parameter interval: the new integer interval, should equally divide the time between the start
+                         and end times
+    """
+    if isinstance(json_dict, str):
+        json_dict = json.loads(json_dict)
+    assert isinstance(interval, int) and interval > 0
+    assert ((json_dict["end"] - json_dict["start"]) * 60) % interval == 0
+    old = json_dict["interval"]
+    columns = []
+    for col in json_dict["columns"]:
+        items = []
+        for index, customer, size in col["items"]:
+            start = index * old
+            length = size * old
+            if start % interval != 0 or length % interval != 0:
+                raise LossyRegrid
+            list.append(items, [start // interval, customer, length // interval])
+        new_col = dict(col)
+        new_col["items"] = items
+        list.append(columns, new_col)
+    res = dict(json_dict)
+    res.pop("seq", None)
+    res["interval"] = interval
+    res["columns"] = columns
+    return res
+
+
 class ScheduleSheet(Grid):
-    def __init__(self, start_time=8, end_time=20, interval=15, json_dict=None):
+    def __init__(
+        self,
+        start_time=8,
+        end_time=20,
+        interval=15,
+        json_dict=None,
+        column_type=Column,
+        occupancy=False,
+        journal=None,
+        catalog=None,
+    ):
         """
         Creates a ScheduleSheet class that has an initial start and end time with some integer
         minute intervals between them
@@ -114,23 +257,54 @@ class ScheduleSheet(Grid):
         by 15 minutes
 
         start_time = 0, end_time = 1, interval = 13 is not allowed
-        """
+
+        The sheet has one row per interval, e.g. 48 rows from 8 to 20 at 15 minutes and 144 rows
+        at 5 minutes, see regrid for converting a sheet between intervals
+
+        @parameter column_type: the class used for the columns, IntervalColumn keeps an interval
+                                index per column instead of one slot per row
+        @parameter occupancy: if True, keeps a numpy OccupancyMatrix in sync with the sheet for
+                              whole sheet queries such as free_runs and utilization
+        @parameter json_dict: a json string or dictionary of a sheet to load
+        @parameter journal: an optional Journal, its entries are replayed on top of json_dict and
+                            every edit made afterwards is appended to it
+        @parameter catalog: an optional ServiceCatalog that loaded customers share services from
+        """
+        self.occupancy = None
+        self.journal = None
+        self.catalog = catalog
+        # each step of the undo and redo stacks is the list of inverse edits of one batch, the
+        # current batch's inverses and journal entries are kept in log and records until it ends
+        self.undo_stack = []
+        self.redo_stack = []
+        self.log = None
+        self.records = None
+        seq = 0
         if json_dict == None:
-            super().__init__(numRows=(end_time - start_time) * 60 // 15)
             assert isinstance(start_time, int)
             assert isinstance(interval, int)
             assert isinstance(end_time, int)
             assert end_time > start_time
             assert interval > 0
             assert ((end_time - start_time) * 60) % interval == 0
+            super().__init__(
+                numRows=(end_time - start_time) * 60 // interval,
+                column_type=column_type,
+            )
 
             self.start = CTime(hour=start_time)
             self.end = CTime(hour=end_time)
             self.interval = interval
         else:  # what should occur when there is a json attached
-            dictionary = json.loads(json_dict)
+            dictionary = json_dict
+            if isinstance(dictionary, str):
+                dictionary = json.loads(dictionary)
+            seq = dictionary.get("seq", 0)
             super().__init__(
-                numRows=(dictionary["end"] - dictionary["start"]) * 60 // 15
+                numRows=(dictionary["end"] - dictionary["start"])
+                * 60
+                // dictionary["interval"],
+                column_type=column_type,
             )
             self.start = CTime(hour=dictionary["start"])
             self.end = CTime(hour=dictionary["end"])
@@ -140,6 +314,15 @@ class ScheduleSheet(Grid):
         # create a variable for queueing customers although it will not be saved
         self.queue = 0
 
+        if occupancy:
+            self.track_occupancy()
+
+        # replay any edits made since the snapshot before recording new ones
+        if journal != None:
+            self.replay(journal.entries(after=seq))
+            journal.seq = max(journal.seq, seq)
+            self.journal = journal
+
     def toJSON(self):
         """
         Converts the schedule sheet to a json script
@@ -158,26 +341,360 @@ class ScheduleSheet(Grid):
     def fromJSON(self, column_lst):
         columns = []
         for col in column_lst:
-            list.append(columns, Column.fromJSON(col, self.numRows))
+            list.append(
+                columns, self.column_type.fromJSON(col, self.numRows, self.catalog)
+            )
         self.columns = columns
-        self.length = len(self.columns)
+        self.ids = {}
+        self.reindex()
+        if self.occupancy != None:
+            self.track_occupancy()
+
+    def record(self, op, *args):
+        """
+        Helper method that appends an edit to the journal if there is one, compacting the journal
+        once it has grown long enough
+
+        Inside a batch the edit is held back until the batch ends, see batch
+        """
+        if self.records != None:
+            list.append(self.records, [op, list(args)])
+        elif self.journal != None:
+            self.journal.append(op, *args)
+            if self.journal.should_compact():
+                self.journal.compact(self)
+
+    def replay(self, entries):
+        """
+        Applies a list of journal entries to the sheet in order without recording them again
+
+        An entry that cannot be applied, e.g. one that depends on an edit lost in a crash, is
+        logged and skipped so that the rest of the day still loads
+        """
+        journal, self.journal = self.journal, None
+        try:
+            for entry in entries:
+                try:
+                    self.apply_entry(entry["op"], entry["args"])
+                except Exception as error:
+                    logger.warning("Skipped journal entry %s: %r", entry.get("seq"), error)
+        finally:
+            self.journal = journal
+
+    def apply_entry(self, op, args):
+        """
+        Helper method that applies one journaled edit
+        """
+        if op == "add_column":
+            self.add_column(*args)
+        elif op == "remove_column":
+            self.remove_column(*args)
+        elif op == "move_column":
+            self.move_column(*args)
+        elif op == "rename_column":
+            self.setColumnName(self.getIndex(args[0]), args[1])
+        elif op == "add":
+            customer = Customer.fromJSON(args[2], self.catalog)
+            self.add_customer(args[0], args[1], customer)
+        elif op == "move":
+            self.move_customer(*args)
+        elif op == "remove":
+            self.remove_customer(*args)
+        elif op == "serve":
+            self.serve_customer(*args)
+        elif op == "split" or op == "services":
+            if self.catalog != None:
+                services = list(map(self.catalog.intern, args[2]))
+            else:
+                services = list(map(lambda s: Service.fromJSON(s), args[2]))
+            if op == "split":
+                self.split_customer(args[0], args[1], services)
+            else:
+                self.set_customer_services(args[0], args[1], services)
+        elif op == "batch":
+            with self.batch():
+                for entry in args[0]:
+                    self.apply_entry(entry[0], entry[1])
+        elif op == "undo" or op == "redo":
+            self.replay_step(op, args)
+
+    def replay_step(self, op, args):
+        """
+        Helper method that replays a journaled undo or redo
+
+        The step being undone or redone may be from before the last snapshot, in which case its
+        stack is empty and the edits saved with the entry are applied instead, keeping their
+        inverses on the other stack as undo and redo would
+        """
+        stack = self.undo_stack if op == "undo" else self.redo_stack
+        # entries journaled without their edits can only be replayed from the stacks
+        if len(stack) > 0 or len(args) == 0:
+            if op == "undo":
+                self.undo()
+            else:
+                self.redo()
+            return
+        edits = list(map(self.from_entry, args[0]))
+        other = self.redo_stack if op == "undo" else self.undo_stack
+        list.append(other, self.run(list(reversed(edits))))
+
+    def regrid(self, interval):
+        """
+        Returns a new sheet with the same customers at a different row interval, see regridJSON
+
+        The new sheet has the same column type, catalog and occupancy tracking but no journal, as
+        the row indexes in the journal are in the old interval
+        """
+        return ScheduleSheet(
+            json_dict=regridJSON(self.toJSON(), interval),
+            column_type=self.column_type,
+            occupancy=self.occupancy != None,
+            catalog=self.catalog,
+        )
+
+    def track_occupancy(self):
+        """
+        Creates the occupancy matrix from the current columns, replacing any existing one
+        """
+        self.occupancy = OccupancyMatrix(self.numRows, self.length)
+        for i in range(self.length):
+            self.occupancy.refresh(i, self.columns[i])
+
+    def add_column(self, label):
+        """
+        Adds a column to the sheet using the Grid.add_column method and an empty column to the
+        occupancy matrix if there is one
+        """
+        if super().add_column(label):
+            if self.occupancy != None:
+                self.occupancy.add_column()
+            self.record("add_column", label)
+            return True
+        return False
+
+    def remove_column(self, key):
+        """
+        Removes an empty column from the sheet using the Grid.remove_column method along with its
+        column in the occupancy matrix if there is one
+        """
+        index = self.to_index(key)
+        if index == None:
+            return False
+        label = self.columns[index].label
+        super().remove_column(index)
+        if self.occupancy != None:
+            self.occupancy.remove_column(index)
+        # the undo steps may refer to the removed column
+        self.undo_stack = []
+        self.redo_stack = []
+        self.record("remove_column", label)
+        return True
+
+    def move_column(self, key, new_index):
+        """
+        Moves a column to a new index using the Grid.move_column method
+        """
+        index = self.to_index(key)
+        if index == None:
+            return False
+        label = self.columns[index].label
+        super().move_column(index, new_index)
+        if self.occupancy != None:
+            self.track_occupancy()
+        self.record("move_column", label, new_index)
+        return True
+
+    def setColumnName(self, ind, name):
+        """
+        Renames a column using the Grid.setColumnName method
+        """
+        old = self.getColumn(ind).label
+        if super().setColumnName(ind, name):
+            self.record("rename_column", old, name)
+            return True
+        return False
 
     def time_to_length(self, time):
         """
-        Helper method to convert a CTime object into index length where each unit length is of
-        self.interval minutes
+        Helper method to convert a CTime object or a number of minutes into index length where each
+        unit length is of self.interval minutes
         """
-        assert isinstance(time, CTime)
-        min = time.asMinutes()
+        assert isinstance(time, (CTime, int))
+        min = time.asMinutes() if isinstance(time, CTime) else time
         len = min // self.interval
         rem = (min % self.interval) / self.interval
         return len + round(rem)
 
+    @contextmanager
+    def batch(self):
+        """
+        Groups every edit made inside a with block into one step, e.g.
+
+            with sheet.batch():
+                sheet.move_customer(0, 4, 1, 4)
+                sheet.move_customer(0, 8, 2, 0)
+
+        If anything inside the block raises, every edit made in it is undone before the exception
+        is passed on, so the sheet, occupancy matrix and journal are as they were before the block.
+        Otherwise the block becomes one step of the undo stack and one journal entry
+
+        Batches can be nested, an inner batch that raises only undoes its own edits
+        """
+        outer = self.log == None
+        if outer:
+            self.log = []
+            self.records = []
+        mark = len(self.log)
+        rmark = len(self.records)
+        try:
+            yield self
+        except BaseException:
+            undone = self.log[mark:]
+            del self.log[mark:]
+            del self.records[rmark:]
+            log = self.log
+            self.log = None
+            self.run(undone)
+            self.log = log
+            if outer:
+                self.log = None
+                self.records = None
+            raise
+        if outer:
+            log, records = self.log, self.records
+            self.log = None
+            self.records = None
+            if len(log) > 0:
+                list.append(self.undo_stack, log)
+                self.redo_stack = []
+            if len(records) == 1:
+                self.record(*([records[0][0]] + records[0][1]))
+            elif len(records) > 1:
+                self.record("batch", records)
+
+    def logged(self, inverse):
+        """
+        Helper method that adds the inverse of an edit to the current batch if there is one and
+        returns it
+        """
+        if self.log != None:
+            list.append(self.log, inverse)
+        return inverse
+
+    def place(self, col_id, row, customer, size):
+        """
+        Helper method that puts a customer of some size at a row of the column with some id
+
+        Raises BadIndex if the customer does not fit in the sheet and BadArgument if it overlaps
+        another customer
+        """
+        column = self.getColumnById(col_id)
+        if row < 0 or row + size > self.numRows:
+            raise BadIndex
+        column.add_item(row, customer, size)
+        if self.occupancy != None:
+            self.occupancy.mark(self.labels[column.label], row, size, customer)
+        return self.logged(("unplace", col_id, row))
+
+    def unplace(self, col_id, row):
+        """
+        Helper method that takes out the customer covering a row of the column with some id
+        """
+        column = self.getColumnById(col_id)
+        index = column.get_index(row)
+        customer = column.getItem(index)
+        column.remove_item(index)
+        if self.occupancy != None:
+            self.occupancy.clear(self.labels[column.label], index, customer.size)
+        return self.logged(("place", col_id, index, customer, customer.size))
+
+    def toggle(self, col_id, row):
+        """
+        Helper method that flips whether the customer covering a row has been served
+        """
+        customer = self.getColumnById(col_id).getItem(row)
+        customer.served = not customer.served
+        return self.logged(("toggle", col_id, row))
+
+    def to_entry(self, edit):
+        """
+        Helper method that turns a place, unplace or toggle edit into a json compatible list, the
+        column is given by index since the stable ids are not saved
+        """
+        col = self.labels[self.getColumnById(edit[1]).label]
+        if edit[0] == "place":
+            return ["place", col, edit[2], edit[3].toJSON(), edit[4]]
+        return [edit[0], col, edit[2]]
+
+    def from_entry(self, entry):
+        """
+        Helper method that turns a list from to_entry back into an edit
+        """
+        col_id = self.getColumn(entry[1]).id
+        if entry[0] == "place":
+            customer = Customer.fromJSON(entry[3], self.catalog)
+            return ("place", col_id, entry[2], customer, entry[4])
+        return (entry[0], col_id, entry[2])
+
+    def run(self, log, entries=None):
+        """
+        Helper method that applies a list of inverse edits from last to first
+
+        Returns the list of inverses of the edits it made, in the order they were made
+
+        @parameter entries: an optional list that every edit is appended to, see to_entry, before
+                            it is made
+        """
+        res = []
+        for op in reversed(log):
+            if entries != None:
+                list.append(entries, self.to_entry(op))
+            if op[0] == "place":
+                list.append(res, self.place(*op[1:]))
+            elif op[0] == "unplace":
+                list.append(res, self.unplace(*op[1:]))
+            else:
+                list.append(res, self.toggle(*op[1:]))
+        return res
+
+    def undo(self):
+        """
+        Undoes the last edit or batch of edits
+
+        Returns False if there is nothing to undo
+        """
+        assert self.log == None
+        if len(self.undo_stack) == 0:
+            return False
+        # the edits are journaled too, the step may be gone from the stacks by the time the
+        # journal is replayed on a snapshot
+        entries = []
+        list.append(self.redo_stack, self.run(list.pop(self.undo_stack), entries))
+        self.record("undo", entries)
+        return True
+
+    def redo(self):
+        """
+        Redoes the last undone edit or batch of edits
+
+        Returns False if there is nothing to redo
+        """
+        assert self.log == None
+        if len(self.redo_stack) == 0:
+            return False
+        entries = []
+        list.append(self.undo_stack, self.run(list.pop(self.redo_stack), entries))
+        self.record("redo", entries)
+        return True
+
     def add_customer(self, col, row, customer):
         """
         Modifies the sheet by adding [customer] to the [index] column where the customer takes up
         some [time_span] amount of time
 
+        Raises BadIndex if the customer does not fit in the sheet and BadArgument if it overlaps
+        another customer
+
         @parameter col: non-negative integer
         @parameter row: non-negative integer
         @parameter customer: the customer to be added to the schedule
@@ -186,21 +703,55 @@ class ScheduleSheet(Grid):
             assert isinstance(col, int)
             assert isinstance(row, int)
             assert col >= 0 and row >= 0
-            assert col <= self.length
+            assert col < self.length
         except:
             return False
-        column = self.getColumn(col)
-        column.add_item(row, customer, self.time_to_length(customer.getTime()))
+        size = self.time_to_length(customer.total_minutes)
+        with self.batch():
+            self.place(self.getColumn(col).id, row, customer, size)
+            self.record("add", col, row, customer.toJSON())
         return True
 
     def serve_customer(self, col, row):
         """
         Helper method for changing the state of a customer's served attribute from False to True
         """
+        with self.batch():
+            self.toggle(self.getColumn(col).id, row)
+            self.record("serve", col, row)
+        return self.getColumn(col).getItem(row).served
+
+    def can_place(self, col, row, size, skip=None):
+        """
+        Returns True if [size] rows starting at [row] in column [col] are inside the sheet and free,
+        without modifying the sheet, e.g. to show whether a customer being dragged can be dropped
+
+        Uses the occupancy matrix if there is one and the column's own check otherwise
+
+        @parameter col: integer
+        @parameter row: integer
+        @parameter size: positive integer number of rows
+        @parameter skip: an optional (col, row) of a customer whose rows count as free, i.e. the
+                         customer being moved
+        """
+        if col < 0 or col >= self.length or row < 0 or size <= 0 or row + size > self.numRows:
+            return False
         column = self.getColumn(col)
-        customer = column.get_item(row)
-        customer.served = not customer.served
-        return customer.served
+        ranges = [(row, row + size)]
+        if skip != None and skip[0] == col and column.getItem(skip[1]) != None:
+            # the rows of the skipped customer split the range in two
+            start = column.get_index(skip[1])
+            end = start + column.getItem(skip[1]).size
+            ranges = [(row, min(row + size, start)), (max(row, end), row + size)]
+        for first, last in ranges:
+            if last <= first:
+                continue
+            if self.occupancy != None:
+                if not self.occupancy.is_free(col, first, last - first):
+                    return False
+            elif not column.is_free(first, last - first):
+                return False
+        return True
 
     def move_customer(self, icol, irow, fcol, frow):
         """
@@ -208,7 +759,8 @@ class ScheduleSheet(Grid):
         to column [fcol] at time [frow].
 
         If there is no customer at the specified location then a BadIndex Exception is raised
-        If there is an overlap then a CustomerOverlap Exception is raised
+        If there is an overlap then a CustomerOverlap Exception is raised, and the customer stays
+        where it was
 
         @parameter icol: integer
         @parameter fcol: integer
@@ -226,22 +778,18 @@ class ScheduleSheet(Grid):
         i_column = self.getColumn(icol)
         f_column = self.getColumn(fcol)
         customer = i_column.getItem(irow)
-        if customer != None:
+        if customer == None:
+            raise BadIndex
+        with self.batch():
+            self.unplace(i_column.id, irow)
             try:
-                i_column.remove_item(irow)
-                f_column.add_item(
-                    frow, customer, self.time_to_length(customer.getTime())
-                )
-                return True
-            except:
-                i_column.add_item(
-                    irow, customer, self.time_to_length(customer.getTime())
-                )
+                self.place(f_column.id, frow, customer, customer.size)
+            except BadIndex:
+                raise
+            except BadArgument:
                 raise CustomerOverlap
-                return False
-        else:
-            raise BadIndex
-        return False
+            self.record("move", icol, irow, fcol, frow)
+        return True
 
     def remove_customer(self, col, row):
         """
@@ -252,18 +800,20 @@ class ScheduleSheet(Grid):
         """
         assert isinstance(col, int)
         assert isinstance(row, int)
-        assert col <= self.length
+        assert col < self.length
         column = self.getColumn(col)
-        customer = column.getItem(row)
-        if customer != None:
-            column.remove_item(row)
-            return True
-        return False
+        if column.getItem(row) == None:
+            return False
+        with self.batch():
+            self.unplace(column.id, row)
+            self.record("remove", col, row)
+        return True
 
     def split_customer(self, col, row, services):
         """
-        Modifies a customer at some col and row and creates a new customer with the same attributes
-        such that the old customer transfers one or more services to the new customer
+        Replaces a customer at some col and row with two customers with the same attributes such
+        that the old customer transfers one or more services to the new customer, who is placed
+        right after them
 
         @parameter col: int representing the column index
         @parameter row: int representing the row index
@@ -274,28 +824,49 @@ class ScheduleSheet(Grid):
         assert isinstance(col, int)
         assert isinstance(row, int)
         assert isinstance(services, list)
-        assert col <= self.length
+        assert col < self.length
 
         column = self.getColumn(col)
         customer = column.getItem(row)
         if customer != None:
-            assert 0 < len(services) < len(customer.getServices())
-            for s in services:
-                assert s in customer.getServices()
+            assert 0 < len(services) < len(customer.services)
             for s in services:
-                customer.remove_service(s)
-            ind = column.get_index(row)
-            column.remove_item(ind)
+                assert customer.hasService(s)
+            moved = set(map(lambda s: s.getName(), services))
+            kept = Customer(
+                customer.getFirst(),
+                customer.getLast(),
+                customer.getPhone(),
+                list(filter(lambda s: s.getName() not in moved, customer.getServices())),
+                customer.getServed(),
+            )
             new_customer = Customer(
-                customer.getFirst(), customer.getLast(), services, customer.getPhone()
+                customer.getFirst(),
+                customer.getLast(),
+                customer.getPhone(),
+                services,
             )
-            new_size = self.time_to_length(customer.getTime())
-            column.add_item(ind, customer, new_size)
-            self.add_customer(col, ind + new_size, new_customer)
+            ind = column.get_index(row)
+            new_size = self.time_to_length(kept.total_minutes)
+            with self.batch():
+                self.unplace(column.id, ind)
+                self.place(column.id, ind, kept, new_size)
+                self.place(
+                    column.id,
+                    ind + new_size,
+                    new_customer,
+                    self.time_to_length(new_customer.total_minutes),
+                )
+                self.record(
+                    "split", col, row, list(map(lambda s: s.toJSON(), services))
+                )
 
     def set_customer_services(self, col, row, services=None):
         """
-        Uses the Customer.setServices method to replace the set of services for a customer
+        Replaces the customer at col, row with a copy that has a new set of services
+
+        Returns True if the services were replaced and False if the customer would then overlap
+        another customer or not fit in the sheet, in which case the customer is left as it was
 
         @parameter col: int representing the column index
         @parameter row: int representing the row index
@@ -303,36 +874,49 @@ class ScheduleSheet(Grid):
                              for a customer at col, row
         """
         if services == None:
-            pass
-        else:
-            assert isinstance(col, int)
-            assert isinstance(row, int)
-            assert isinstance(services, list)
+            return False
+        assert isinstance(col, int)
+        assert isinstance(row, int)
+        assert isinstance(services, list)
 
-            for s in services:
-                assert isinstance(s, Service)
-            column = self.getColumn(col)
-            customer = column.getItem(row)
-            ind = column.get_index(row)
-            self.remove_customer(col, row)
-            try:
-                self.add_customer(
-                    col,
+        for s in services:
+            assert isinstance(s, Service)
+        column = self.getColumn(col)
+        customer = column.getItem(row)
+        if customer == None:
+            return False
+        ind = column.get_index(row)
+        new_customer = Customer(
+            customer.getFirst(),
+            customer.getLast(),
+            customer.getPhone(),
+            services,
+            customer.getServed(),
+        )
+        try:
+            with self.batch():
+                self.unplace(column.id, ind)
+                self.place(
+                    column.id,
                     ind,
-                    Customer(
-                        customer.getFirst(),
-                        customer.getLast(),
-                        services,
-                        customer.getPhone(),
-                    ),
+                    new_customer,
+                    self.time_to_length(new_customer.total_minutes),
                 )
-            except BadArgument:
-                self.add_customer(col, ind, customer)
+                self.record(
+                    "services", col, row, list(map(lambda s: s.toJSON(), services))
+                )
+        except BadArgument:
+            return False
+        return True
 
     def toString(self):
         """
         Converts the grid into a visible representation
         """
+        if self.occupancy != None:
+            for string in self.occupancy.toString():
+                print(string)
+            return
         tmp = list(map(lambda x: x.contents, self.columns))
         transposed = list(zip(*tmp))
         for row in transposed:
@@ -346,6 +930,37 @@ class ScheduleSheet(Grid):
                     string += "c"
             print(f"{string}")
 
+    def free_runs(self, length=1):
+        """
+        Returns a dictionary of column labels to a list of (row, size) tuples for every run of free
+        rows that is at least [length] rows long
+
+        Requires the sheet to be created with occupancy=True
+        """
+        assert self.occupancy != None
+        runs = self.occupancy.free_runs(length)
+        return {self.columns[i].label: runs[i] for i in range(self.length)}
+
+    def utilization(self):
+        """
+        Returns a dictionary of column labels to the fraction of rows that are booked
+
+        Requires the sheet to be created with occupancy=True
+        """
+        assert self.occupancy != None
+        used = self.occupancy.utilization().tolist()
+        return {self.columns[i].label: used[i] for i in range(self.length)}
+
+    def first_free_column(self, row):
+        """
+        Returns the index of the first column that is free at [row], or None if every column is
+        booked at that row
+
+        Requires the sheet to be created with occupancy=True
+        """
+        assert self.occupancy != None
+        return self.occupancy.first_free_column(row)
+
     # ========== Get and Set methods ==========
     def getInterval(self):
         """
@@ -365,9 +980,3 @@ class ScheduleSheet(Grid):
         """
         return self.end
 
-    def setColumnName(self, ind, name):
-        """
-        Sets the column at index ind to a new name
-        """
-        col = self.getColumn(ind)
-        col.setLabel(name)
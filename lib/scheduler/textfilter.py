@@ -0,0 +1,65 @@
+"""
+Alvin Lee
+
+This module is responsible for filtering a list of items by a search string as it is typed
+
+The lowercase search key and the display string of every item are computed once, and when a query
+contains the previous query only the previous matches are checked again, since anything that did
+not match the shorter query cannot match the longer one
+"""
+
+
+class TextFilter:
+    def __init__(self, items=None, key=str, label=str):
+        """
+        Creates a filter over a list of items
+
+        @parameter items: an optional list of items
+        @parameter key: a function returning the string an item is searched by, lowercased here
+        @parameter label: a function returning the string an item is displayed as
+        """
+        self.key = key
+        self.label = label
+        self.reset(items if items != None else [])
+
+    def reset(self, items):
+        """
+        Replaces the items of the filter, to be called whenever the list of items changes
+        """
+        self.items = list(items)
+        self.keys = list(map(lambda i: self.key(i).lower(), self.items))
+        self.labels = list(map(self.label, self.items))
+        self.last = ""
+        self.last_matches = list(range(len(self.items)))
+
+    def __len__(self):
+        return len(self.items)
+
+    def indices(self, query):
+        """
+        Returns the indexes of the items whose key contains [query], ignoring case and the
+        whitespace around the query
+        """
+        query = query.strip().lower()
+        if query == "":
+            matches = list(range(len(self.items)))
+        elif self.last in query:
+            # narrow the previous matches, which is every item when the last query was empty
+            matches = list(filter(lambda i: query in self.keys[i], self.last_matches))
+        else:
+            matches = list(filter(lambda i: query in self.keys[i], range(len(self.items))))
+        self.last = query
+        self.last_matches = matches
+        return matches
+
+    def matches(self, query):
+        """
+        Returns the list of items whose key contains [query]
+        """
+        return list(map(lambda i: self.items[i], self.indices(query)))
+
+    def search(self, query):
+        """
+        Returns the list of display strings of the items whose key contains [query]
+        """
+        return list(map(lambda i: self.labels[i], self.indices(query)))
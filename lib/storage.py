@@ -0,0 +1,532 @@
+"""
+Alvin Lee
+
+A module for saving and loading the services, customers, employees, weekly schedule and day sheets
+
+Day sheets are saved as a snapshot plus a journal of the edits made since, see openDay
+
+There are two backends with the same methods:
+JSONStore keeps the original json files in data/, every change rewrites the whole file from a copy
+kept in memory
+SQLiteStore keeps one row per service, customer, employee, scheduled employee and day in a sqlite
+database so that changing one record only writes that record
+
+Both take and return the toJSON/fromJSON shapes of the scheduler classes, so the json files stay
+the import and export format, see copyStore
+"""
+
+import sys
+
+sys.path.insert(0, "scheduler/")
+import os
+import json
+import sqlite3
+from datetime import date
+from service import *
+from customer import *
+from sheet import ScheduleSheet
+from journal import Journal
+
+DAYS = ("sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+BACKENDS = ("json", "sqlite")
+
+
+class JSONStore:
+    def __init__(self, directory, days_directory=None):
+        """
+        A store that keeps services.json, customers.json, employees.json and schedule.json in a
+        directory, and one <key>.json file per day sheet in an optional [days_directory]
+
+        The parsed files are kept in memory, so changing one record only rewrites its file from
+        memory instead of reading and parsing it again first
+        """
+        self.directory = directory
+        self.days_directory = days_directory
+        # the parsed data of every file read or written, keyed by name, along with the
+        # (modification time, size) of the file it came from
+        self.files = {}
+
+    def read(self, name, default):
+        """
+        Helper method that returns the parsed data of a json file in the directory or default
+
+        The file is only parsed again if it changed since it was last read or written, e.g. by
+        another store, the data returned must not be modified
+        """
+        path = os.path.join(self.directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return default
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if name not in self.files or self.files[name][0] != stamp:
+            try:
+                with open(path, "r") as file:
+                    data = json.load(file)
+            except (OSError, json.JSONDecodeError):
+                return default
+            self.files[name] = (stamp, data)
+        return self.files[name][1]
+
+    def write(self, name, data):
+        """
+        Helper method that writes a json file to the directory and keeps its data in memory, the
+        data must not be modified afterwards
+        """
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            json.dump(data, file)
+        stat = os.stat(path)
+        self.files[name] = ((stat.st_mtime_ns, stat.st_size), data)
+
+    def services(self):
+        """
+        Returns the list of Service objects
+        """
+        return list(map(lambda s: Service.fromJSON(s), self.read("services.json", [])))
+
+    def save_services(self, services):
+        """
+        Replaces every service with a list of Service objects
+        """
+        self.write("services.json", list(map(lambda s: s.toJSON(), services)))
+
+    def put_service(self, service):
+        """
+        Adds a Service or replaces the service with the same name
+        """
+        services = self.read("services.json", [])
+        services = list(filter(lambda s: s["name"] != service.getName(), services))
+        services.append(service.toJSON())
+        self.write("services.json", services)
+
+    def delete_service(self, name):
+        """
+        Deletes the service with some name
+        """
+        services = self.read("services.json", [])
+        self.write("services.json", list(filter(lambda s: s["name"] != name, services)))
+
+    def customers(self, catalog=None):
+        """
+        Returns the list of Customer objects, sharing services from an optional ServiceCatalog
+        """
+        customers = self.read("customers.json", [])
+        return list(map(lambda c: Customer.fromJSON(c, catalog), customers))
+
+    def save_customers(self, customers):
+        """
+        Replaces every customer with a list of Customer objects
+        """
+        self.write("customers.json", list(map(lambda c: c.toJSON(), customers)))
+
+    def put_customer(self, customer):
+        """
+        Adds a Customer or replaces the customer with the same phone number
+        """
+        customers = self.read("customers.json", [])
+        customers = list(filter(lambda c: c["phone"] != customer.getPhone(), customers))
+        customers.append(customer.toJSON())
+        self.write("customers.json", customers)
+
+    def delete_customer(self, phone):
+        """
+        Deletes the customer with some phone number
+        """
+        customers = self.read("customers.json", [])
+        self.write("customers.json", list(filter(lambda c: c["phone"] != phone, customers)))
+
+    def employees(self):
+        """
+        Returns the list of employee names
+        """
+        return list(self.read("employees.json", []))
+
+    def save_employees(self, employees):
+        """
+        Replaces the list of employee names
+        """
+        self.write("employees.json", list(employees))
+
+    def schedule(self):
+        """
+        Returns a dictionary of the days of the week to the list of employees working that day
+        """
+        schedule = self.read("schedule.json", {})
+        return {d: list(schedule.get(d, [])) for d in DAYS}
+
+    def save_schedule(self, schedule):
+        """
+        Replaces the whole weekly schedule
+        """
+        self.write("schedule.json", {d: list(e) for d, e in schedule.items()})
+
+    def put_schedule(self, day, employees):
+        """
+        Replaces the list of employees working on one day of the week
+        """
+        schedule = self.schedule()
+        schedule[day] = employees
+        self.save_schedule(schedule)
+
+    def is_empty(self):
+        """
+        Returns True if there are no services, customers, employees or schedule yet
+        """
+        for name in ("services.json", "customers.json", "employees.json"):
+            if len(self.read(name, [])) > 0:
+                return False
+        return len(self.read("schedule.json", {})) == 0
+
+    def day(self, key):
+        """
+        Returns the sheet dictionary saved under some key, e.g. a date, or None
+        """
+        if self.days_directory == None:
+            return None
+        try:
+            with open(os.path.join(self.days_directory, f"{key}.json"), "r") as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def days(self):
+        """
+        Returns the sorted list of keys of the saved day sheets, hidden files such as caches are
+        not days
+        """
+        if self.days_directory == None or not os.path.isdir(self.days_directory):
+            return []
+        names = os.listdir(self.days_directory)
+        return sorted(n[:-5] for n in names if n.endswith(".json") and not n.startswith("."))
+
+    def save_day(self, key, sheet):
+        """
+        Saves a sheet dictionary under some key, replacing the edits journaled for it
+        """
+        assert self.days_directory != None
+        with open(os.path.join(self.days_directory, f"{key}.json"), "w") as file:
+            json.dump(sheet, file)
+        try:
+            os.remove(os.path.join(self.days_directory, f"{key}.journal"))
+        except FileNotFoundError:
+            pass
+
+    def day_journal(self, key, compact_every=200):
+        """
+        Returns a Journal of the edits of the day sheet under some key, which is compacted into
+        its <key>.json file, see openDay
+        """
+        assert self.days_directory != None
+        path = os.path.join(self.days_directory, key)
+        return Journal(path + ".journal", path + ".json", compact_every)
+
+    def close(self):
+        """
+        Closes the store
+        """
+        pass
+
+
+class SQLiteStore:
+    def __init__(self, path):
+        """
+        A store that keeps everything in a sqlite database at [path], created if it does not exist
+
+        The database is put in write-ahead-log mode so that saving one record appends to the log
+        instead of rewriting pages of the database
+
+        Has the same methods as JSONStore
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS services (
+                    id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, data TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS customers (
+                    id INTEGER PRIMARY KEY, phone TEXT UNIQUE NOT NULL, data TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS employees (
+                    id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+                CREATE TABLE IF NOT EXISTS schedules (
+                    id INTEGER PRIMARY KEY, day TEXT NOT NULL, name TEXT NOT NULL,
+                    UNIQUE (day, name));
+                CREATE TABLE IF NOT EXISTS days (
+                    key TEXT PRIMARY KEY, data TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS day_edits (
+                    key TEXT NOT NULL, seq INTEGER NOT NULL, op TEXT NOT NULL,
+                    args TEXT NOT NULL, PRIMARY KEY (key, seq));
+                """
+            )
+
+    def services(self):
+        rows = self.conn.execute("SELECT data FROM services ORDER BY id")
+        return list(map(lambda r: Service.fromJSON(r[0]), rows))
+
+    def save_services(self, services):
+        with self.conn:
+            self.conn.execute("DELETE FROM services")
+            self.conn.executemany(
+                "INSERT INTO services (name, data) VALUES (?, ?)",
+                map(lambda s: (s.getName(), json.dumps(s.toJSON())), services),
+            )
+
+    def put_service(self, service):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO services (name, data) VALUES (?, ?)",
+                (service.getName(), json.dumps(service.toJSON())),
+            )
+
+    def delete_service(self, name):
+        with self.conn:
+            self.conn.execute("DELETE FROM services WHERE name = ?", (name,))
+
+    def customers(self, catalog=None):
+        rows = self.conn.execute("SELECT data FROM customers ORDER BY id")
+        return list(map(lambda r: Customer.fromJSON(r[0], catalog), rows))
+
+    def save_customers(self, customers):
+        with self.conn:
+            self.conn.execute("DELETE FROM customers")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO customers (phone, data) VALUES (?, ?)",
+                map(lambda c: (c.getPhone(), json.dumps(c.toJSON())), customers),
+            )
+
+    def put_customer(self, customer):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO customers (phone, data) VALUES (?, ?)",
+                (customer.getPhone(), json.dumps(customer.toJSON())),
+            )
+
+    def delete_customer(self, phone):
+        with self.conn:
+            self.conn.execute("DELETE FROM customers WHERE phone = ?", (phone,))
+
+    def employees(self):
+        rows = self.conn.execute("SELECT name FROM employees ORDER BY id")
+        return list(map(lambda r: r[0], rows))
+
+    def save_employees(self, employees):
+        with self.conn:
+            self.conn.execute("DELETE FROM employees")
+            self.conn.executemany(
+                "INSERT INTO employees (name) VALUES (?)", map(lambda e: (e,), employees)
+            )
+
+    def schedule(self):
+        schedule = {d: [] for d in DAYS}
+        for day, name in self.conn.execute("SELECT day, name FROM schedules ORDER BY id"):
+            schedule[day].append(name)
+        return schedule
+
+    def save_schedule(self, schedule):
+        with self.conn:
+            self.conn.execute("DELETE FROM schedules")
+            for day, employees in schedule.items():
+                self.conn.executemany(
+                    "INSERT INTO schedules (day, name) VALUES (?, ?)",
+                    map(lambda e: (day, e), employees),
+                )
+
+    def put_schedule(self, day, employees):
+        with self.conn:
+            self.conn.execute("DELETE FROM schedules WHERE day = ?", (day,))
+            self.conn.executemany(
+                "INSERT INTO schedules (day, name) VALUES (?, ?)",
+                map(lambda e: (day, e), employees),
+            )
+
+    def is_empty(self):
+        """
+        Returns True if the database has no services, customers, employees or schedule yet
+        """
+        for table in ("services", "customers", "employees", "schedules"):
+            if self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() != None:
+                return False
+        return True
+
+    def day(self, key):
+        row = self.conn.execute("SELECT data FROM days WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row != None else None
+
+    def days(self):
+        return list(map(lambda r: r[0], self.conn.execute("SELECT key FROM days ORDER BY key")))
+
+    def save_day(self, key, sheet):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO days (key, data) VALUES (?, ?)",
+                (key, json.dumps(sheet)),
+            )
+            self.conn.execute("DELETE FROM day_edits WHERE key = ?", (key,))
+
+    def day_journal(self, key, compact_every=200):
+        return SQLiteJournal(self.path, key, compact_every)
+
+    def close(self):
+        self.conn.close()
+
+
+class SQLiteJournal:
+    def __init__(self, path, key, compact_every=200):
+        """
+        A journal of the edits of the day sheet under some key in the sqlite database at [path],
+        one row per edit in the day_edits table, compacted into the days table
+
+        Has the same methods as Journal. It has its own connection, which may be used from another
+        thread than the one it was opened on as long as it is not used by two threads at once,
+        e.g. a day loaded on a worker thread and edited on the Tk thread
+        """
+        self.key = key
+        self.compact_every = compact_every
+        self.unsaved = False
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.seq, self.count = self.conn.execute(
+            "SELECT COALESCE(MAX(seq), 0), COUNT(*) FROM day_edits WHERE key = ?", (key,)
+        ).fetchone()
+
+    def entries(self, after=0):
+        rows = self.conn.execute(
+            "SELECT seq, op, args FROM day_edits WHERE key = ? AND seq > ? ORDER BY seq",
+            (self.key, after),
+        )
+        return list(map(lambda r: {"seq": r[0], "op": r[1], "args": json.loads(r[2])}, rows))
+
+    def append(self, op, *args):
+        self.seq += 1
+        self.count += 1
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO day_edits (key, seq, op, args) VALUES (?, ?, ?, ?)",
+                (self.key, self.seq, op, json.dumps(args)),
+            )
+
+    def should_compact(self):
+        return self.count >= self.compact_every or self.unsaved
+
+    def compact(self, sheet):
+        """
+        Saves the whole sheet to the days table and deletes its edits in one transaction
+        """
+        json_dict = sheet.toJSON()
+        json_dict["seq"] = self.seq
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO days (key, data) VALUES (?, ?)",
+                (self.key, json.dumps(json_dict)),
+            )
+            self.conn.execute("DELETE FROM day_edits WHERE key = ?", (self.key,))
+        self.unsaved = False
+        self.count = 0
+
+    def close(self):
+        self.conn.close()
+
+
+def openStore(backend, path, days_directory=None, import_from=None):
+    """
+    Returns a store for a backend
+
+    @parameter backend: "json" or "sqlite"
+    @parameter path: the data directory for "json" or the database file for "sqlite"
+    @parameter days_directory: the directory of day sheets for "json"
+    @parameter import_from: an optional directory of json files that an empty "sqlite" database
+                            is filled from, so switching backends keeps the existing data
+    """
+    assert backend in BACKENDS
+    if backend == "json":
+        return JSONStore(path, days_directory)
+    store = SQLiteStore(path)
+    if import_from != None and store.is_empty():
+        copyStore(JSONStore(import_from, days_directory), store)
+    return store
+
+
+def copyStore(src, dst):
+    """
+    Copies everything from one store to another, e.g. to import the json files into a new sqlite
+    database or to export a database back to json
+
+    Every day is copied with the edits journaled since its snapshot applied
+    """
+    dst.save_services(src.services())
+    dst.save_customers(src.customers())
+    dst.save_employees(src.employees())
+    dst.save_schedule(src.schedule())
+    for key in src.days():
+        dst.save_day(key, loadDay(src, key).toJSON())
+
+
+def loadDay(store, key, **sheet_args):
+    """
+    Returns the ScheduleSheet of the day under some key with the edits journaled since its
+    snapshot replayed, without a journal so nothing is written, e.g. for reports
+
+    @parameter sheet_args: keyword arguments for ScheduleSheet, e.g. catalog or column_type
+    """
+    sheet = ScheduleSheet(json_dict=store.day(key), journal=store.day_journal(key), **sheet_args)
+    sheet.journal.close()
+    sheet.journal = None
+    return sheet
+
+
+def openDay(store, key, columns=(), **sheet_args):
+    """
+    Returns the ScheduleSheet of the day under some key with the edits journaled since its
+    snapshot replayed, every edit made to it afterwards is journaled to the store
+
+    A day that was never saved starts with a column for every label in [columns], which are not
+    journaled, so nothing is written for the day until it is first edited. The store can be
+    closed afterwards as the journal keeps its own file or connection, see closeDay
+
+    @parameter store: a JSONStore with a days directory or a SQLiteStore
+    @parameter key: the key of the day, e.g. an iso date
+    @parameter columns: the column labels of a new day, e.g. the employees scheduled that day
+    @parameter sheet_args: keyword arguments for ScheduleSheet used when the day was never saved,
+                           e.g. start_time, end_time and interval, along with catalog or
+                           column_type
+    """
+    journal = store.day_journal(key)
+    sheet = ScheduleSheet(json_dict=store.day(key), journal=journal, **sheet_args)
+    if sheet.getLength() == 0 and len(columns) > 0:
+        sheet.journal = None
+        for label in columns:
+            sheet.add_column(label)
+        sheet.journal = journal
+        journal.unsaved = True
+    return sheet
+
+
+def closeDay(sheet):
+    """
+    Folds the journal of a sheet from openDay into its snapshot if it was edited, and closes it
+    """
+    if sheet.journal.count > 0:
+        sheet.journal.compact(sheet)
+    sheet.journal.close()
+
+
+def importDay(store, path):
+    """
+    Saves the sheet of a json file from older versions that kept a single day, e.g.
+    drive/day.json, as the day it was last written on, unless the store already has that day
+
+    Returns the key it was saved under or None if nothing was saved
+    """
+    try:
+        with open(path, "r") as file:
+            sheet = json.load(file)
+        key = date.fromtimestamp(os.path.getmtime(path)).isoformat()
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(sheet, dict) or "columns" not in sheet or store.day(key) != None:
+        return None
+    store.save_day(key, sheet)
+    return key
@@ -0,0 +1,253 @@
+"""
+Alvin Lee
+
+A module for generating realistic synthetic salon data for load tests, benchmarks and the
+auto-scheduler
+
+Services come from the real data/services.json. A customer picks one to four services, at most one
+per category except for the add-ons sorted under "None", and the categories are weighted by how
+many services the catalog has in them. Rosters use the schedule.json shape, one per week, and day
+sheets are booked with SlotFinder until nothing else fits, so they have the drive/day.json shape.
+
+Everything is drawn from a random.Random seeded by the caller, so the same seed and sizes always
+give the same data
+"""
+
+import sys
+
+sys.path.insert(0, "scheduler/")
+import json
+import random
+from datetime import date, timedelta
+from catalog import ServiceCatalog
+from column import Column
+from placement import SlotFinder
+from sheet import *
+from storage import DAYS
+
+SERVICES_PATH = "../data/services.json"
+# relative weights of the number of services a customer asks for
+SERVICE_COUNTS = {1: 50, 2: 30, 3: 15, 4: 5}
+FIRST_NAMES = tuple(
+    "Alvin Bryan Maria Bella Gina Gloria Elena Rosa Rachel Lupe Anna Chris Dana Emily Grace Hana "
+    "Ivy Jenny Kim Linda Mei Nora Olivia Priya Quinn Sara Tina Uma Vivian Wendy Yuki Zoe".split()
+)
+LAST_NAMES = tuple(
+    "Lee Kim Nguyen Garcia Smith Johnson Chen Park Lopez Tran Brown Davis Wong Patel Martinez "
+    "Choi Wilson Lam Anderson Ito".split()
+)
+AREA_CODES = ("206", "253", "360", "425")
+
+
+def loadCatalog(path=SERVICES_PATH):
+    """
+    Returns a ServiceCatalog of the services in a services.json file
+    """
+    with open(path, "r") as file:
+        return ServiceCatalog(list(map(lambda s: Service.fromJSON(s), json.load(file))))
+
+
+def makeCatalog(size, rng, path=SERVICES_PATH):
+    """
+    Returns a ServiceCatalog of [size] services drawn from the services in a services.json file,
+    a service drawn more than once gets a number after its name and abbreviation so catalogs
+    larger than the real one keep its mix of durations, prices and categories
+    """
+    real = list(loadCatalog(path))
+    services = rng.sample(real, min(size, len(real)))
+    for i in range(len(services), size):
+        s = rng.choice(real)
+        # abbreviations are at most 8 characters
+        name, abbrev = f"{s.getName()} {i}", s.getAbbrev()[: 8 - len(str(i))] + str(i)
+        list.append(services, Service(name, s.getPrice(), s.getTime(), abbrev, s.getSort()))
+    return ServiceCatalog(services)
+
+
+def makeRandom(seed=0):
+    """
+    Returns the seeded random number generator every other function draws from
+    """
+    return random.Random(seed)
+
+
+def makeServices(catalog, rng, count=None):
+    """
+    Returns a list of services a customer could ask for, at least one of which takes some time
+
+    @parameter catalog: the ServiceCatalog to draw from
+    @parameter rng: a random.Random
+    @parameter count: the number of services, drawn from SERVICE_COUNTS if None
+    """
+    if count == None:
+        count = rng.choices(list(SERVICE_COUNTS), list(SERVICE_COUNTS.values()))[0]
+    sorts = catalog.getSorts()
+    weights = list(map(lambda s: len(catalog.getSorted(s)), sorts))
+    services = []
+    for i in range(10 * count):
+        if len(services) == count:
+            break
+        sort = rng.choices(sorts, weights)[0]
+        service = rng.choice(catalog.getSorted(sort))
+        if service in services:
+            continue
+        if sort != "None" and any(s.getSort() == sort for s in services):
+            continue
+        # the first service takes some time so that the customer has a place on the sheet
+        if len(services) == 0 and service.getTime().asMinutes() == 0:
+            continue
+        list.append(services, service)
+    return services
+
+
+def makeCustomers(count, catalog, rng, services=None):
+    """
+    Returns a list of [count] customers with unique phone numbers, see makeServices
+
+    @parameter services: the number of services of every customer, drawn from SERVICE_COUNTS if
+                         None
+    """
+    numbers = rng.sample(range(10**7), count)
+    customers = []
+    for i in range(count):
+        list.append(
+            customers,
+            Customer(
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                rng.choice(AREA_CODES) + "%07d" % numbers[i],
+                services=makeServices(catalog, rng, services),
+            ),
+        )
+    return customers
+
+
+def makeEmployees(count, rng):
+    """
+    Returns a list of [count] unique employee names
+    """
+    names = list(FIRST_NAMES)
+    rng.shuffle(names)
+    employees = names[: min(count, len(names))]
+    for i in range(len(employees), count):
+        list.append(employees, f"Employee {i}")
+    return employees
+
+
+def makeRoster(employees, rng, staff=(3, 7)):
+    """
+    Returns a weekly schedule in the schedule.json shape, a dictionary of the days of the week to
+    the list of employees working that day
+
+    @parameter employees: the list of employee names
+    @parameter rng: a random.Random
+    @parameter staff: the (fewest, most) employees working on a day
+    """
+    low = min(staff[0], len(employees))
+    high = min(staff[1], len(employees))
+    return {d: rng.sample(employees, rng.randint(low, high)) for d in DAYS}
+
+
+def makeRosters(weeks, employees, rng, staff=(3, 7)):
+    """
+    Returns a list of [weeks] weekly schedules, see makeRoster
+    """
+    return [makeRoster(employees, rng, staff) for i in range(weeks)]
+
+
+def makeDay(employees, customers, catalog, rng, tries=20, strategy="earliest", **sheet_args):
+    """
+    Returns a ScheduleSheet with a column per employee that is booked until [tries] customers in
+    a row do not fit anywhere
+
+    @parameter employees: the list of employees working that day
+    @parameter customers: the list of customers to draw from, every booking is a copy so the same
+                          customer can come back on another day
+    @parameter catalog: the ServiceCatalog the sheet resolves services through
+    @parameter rng: a random.Random
+    @parameter tries: the number of customers in a row that must fail to fit before the sheet is
+                      considered full
+    @parameter strategy: the SlotFinder strategy used to place the customers
+    @parameter sheet_args: keyword arguments for ScheduleSheet, e.g. start_time or interval
+    """
+    sheet_args.setdefault("column_type", Column)
+    sheet = ScheduleSheet(catalog=catalog, **sheet_args)
+    for employee in employees:
+        sheet.add_column(employee)
+    finder = SlotFinder(sheet)
+    placements = []
+    misses = 0
+    while len(customers) > 0 and misses < tries:
+        customer = Customer.fromJSON(rng.choice(customers).toJSON(), catalog)
+        size = sheet.time_to_length(customer.total_minutes)
+        spot = finder.find(size, strategy) if size > 0 else None
+        if spot == None:
+            misses += 1
+            continue
+        misses = 0
+        finder.reserve(spot[0], spot[1], size)
+        list.append(placements, (customer, spot[0], spot[1]))
+    finder.apply(placements)
+    return sheet
+
+
+def makeDays(start, rosters, customers, catalog, rng, **day_args):
+    """
+    Returns a dictionary of iso dates to the booked sheet of every day of the rosters, the first
+    roster covering the week from the [start] date
+
+    @parameter start: a datetime.date
+    @parameter rosters: a list of weekly schedules, see makeRosters
+    @parameter day_args: keyword arguments for makeDay
+    """
+    days = {}
+    for i in range(7 * len(rosters)):
+        day = start + timedelta(days=i)
+        # date.weekday starts on monday while the schedule starts on sunday
+        employees = rosters[i // 7][DAYS[(day.weekday() + 1) % 7]]
+        days[day.isoformat()] = makeDay(employees, customers, catalog, rng, **day_args)
+    return days
+
+
+def makeWorkload(
+    seed=0, customers=2000, employees=11, weeks=4, start=None, path=SERVICES_PATH, **day_args
+):
+    """
+    Returns a dictionary with the catalog, customers, employees, weekly rosters and day sheets of
+    a synthetic salon, see the functions above
+
+    @parameter seed: the seed of the random number generator
+    @parameter customers: the number of customers in the directory
+    @parameter employees: the number of employees
+    @parameter weeks: the number of weeks of rosters and day sheets
+    @parameter start: the datetime.date of the first day, the sunday of 2024-07-14 by default
+    @parameter path: the services.json file to draw the services from
+    """
+    rng = makeRandom(seed)
+    catalog = loadCatalog(path)
+    people = makeCustomers(customers, catalog, rng)
+    staff = makeEmployees(employees, rng)
+    rosters = makeRosters(weeks, staff, rng)
+    if start == None:
+        start = date(2024, 7, 14)
+    return {
+        "services": catalog,
+        "customers": people,
+        "employees": staff,
+        "schedules": rosters,
+        "days": makeDays(start, rosters, people, catalog, rng, **day_args),
+    }
+
+
+def saveWorkload(store, workload):
+    """
+    Saves a workload from makeWorkload to a JSONStore or SQLiteStore, the first roster becomes the
+    weekly schedule and the day sheets are only saved if the store keeps days
+    """
+    store.save_services(list(workload["services"]))
+    store.save_customers(workload["customers"])
+    store.save_employees(workload["employees"])
+    if len(workload["schedules"]) > 0:
+        store.save_schedule(workload["schedules"][0])
+    if getattr(store, "days_directory", True) != None:
+        for key, sheet in workload["days"].items():
+            store.save_day(key, sheet.toJSON())
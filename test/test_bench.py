@@ -0,0 +1,49 @@
+import sys
+
+sys.path.insert(0, "../bench/")
+from bench import *
+import unittest
+import os
+import tempfile
+import contextlib
+import io
+
+SMALL = ["--rows", "24", "--cols", "2", "--customers", "4", "--directory", "50"]
+SMALL += ["--searches", "10", "--repeat", "1"]
+
+
+class TestBench(unittest.TestCase):
+    def test_workload(self):
+        rng = makeRandom(1)
+        sheet = makeSheet(20, 3, 12, makeCatalog(10, rng), 2, rng)
+        # the rows are rounded up to whole hours of 5 minute rows
+        self.assertEqual(sheet.getNumRows(), 24)
+        self.assertEqual(sheet.getLength(), 3)
+        customers = sum(sheet.getColumn(i).getNumItems() for i in range(3))
+        self.assertTrue(0 < customers <= 12)
+        # the same seed gives the same sheet
+        rng = makeRandom(1)
+        again = makeSheet(20, 3, 12, makeCatalog(10, rng), 2, rng)
+        self.assertEqual(again.toJSON(), sheet.toJSON())
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "bench.json")
+            self.assertEqual(main(SMALL + ["--out", out, "--quiet"]), 0)
+            with open(out) as file:
+                report = json.load(file)
+            names = list(map(lambda r: r["name"], report["results"]))
+            self.assertTrue("ScheduleSheet.move_customer" in names)
+            self.assertTrue("CustomerDirectory.search" in names)
+            # a baseline that is much faster is reported as a regression
+            for r in report["results"]:
+                r["per_op_us"] /= 1000
+            with open(out, "w") as file:
+                json.dump(report, file)
+            with contextlib.redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(main(SMALL + ["--compare", out, "--quiet"]), 1)
+            self.assertTrue("slower than the baseline" in err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+import unittest
+from catalog import *
+from sheet import *
+
+s1 = Service("Pedicure", 18, CTime(0, 30), "P", "Foot Care")
+s2 = Service("Manicure", 20, CTime(0, 30), "M", "Nail Care")
+s3 = Service("Gel", 40, CTime(0, 45), "G", "Nail Care")
+
+
+class TestCatalog(unittest.TestCase):
+    def test_lookup(self):
+        c = ServiceCatalog([s1, s2, s3])
+        self.assertEqual(len(c), 3)
+        self.assertTrue(c.get("Gel") is s3)
+        self.assertTrue(c.getByAbbrev("M") is s2)
+        self.assertEqual(c.getSorted("Nail Care"), [s2, s3])
+        self.assertEqual(c.getSorted("Hair"), [])
+        self.assertTrue("Pedicure" in c)
+        self.assertEqual(c.resolve(["Gel", "Pedicure"]), [s3, s1])
+        self.assertRaises(UnknownService, c.resolve, ["Wax"])
+
+    def test_put_remove(self):
+        c = ServiceCatalog([Service("Wax", 10, CTime(0, 15), "W", "Wax")])
+        w = c.get("Wax")
+        cust = Customer("a", services=[w])
+        self.assertTrue(c.put(Service("Wax", 12, CTime(0, 20), "WX", "Other")) is w)
+        self.assertEqual(cust.getServices()[0].getPrice(), 12)
+        self.assertEqual(c.getByAbbrev("W"), None)
+        self.assertTrue(c.getByAbbrev("WX") is w)
+        # putting the same price and time again is not a change
+        revision = w.revision
+        c.put(Service("Wax", 12, CTime(0, 20), "W", "Other"))
+        self.assertEqual(w.revision, revision)
+        self.assertEqual(c.getSorts(), ["Other"])
+        self.assertTrue(c.getByAbbrev("W") is w)
+        self.assertTrue(c.remove("Wax"))
+        self.assertFalse(c.remove(w))
+        self.assertEqual(c.getSorts(), [])
+
+    def test_rename(self):
+        w = Service("Wax", 10, CTime(0, 15), "W", "Wax")
+        c = ServiceCatalog([w])
+        cust = Customer("a", services=[w])
+        n = c.rename("Wax", "Waxing")
+        self.assertEqual((n.getName(), n.getPrice(), n.getAbbrev()), ("Waxing", 10, "W"))
+        self.assertTrue(c.get("Waxing") is n and c.getByAbbrev("W") is n)
+        self.assertEqual(c.get("Wax"), None)
+        self.assertTrue(cust.hasService("Wax"))
+        self.assertRaises(UnknownService, c.rename, w, "Other")
+
+    def test_intern(self):
+        c = ServiceCatalog([s1, s2])
+        a = Customer.fromJSON(Customer("a", services=[s1, s2]).toJSON(), c)
+        b = Customer.fromJSON(Customer("b", services=[s1]).toJSON(), c)
+        self.assertTrue(a.getServices()[0] is b.getServices()[0] is s1)
+        # an unknown service is shared but not added to the catalog until it is put
+        n = c.intern(Service("New", 5, CTime(0, 15)).toJSON())
+        self.assertTrue(c.intern(n) is n)
+        self.assertEqual((c.get("New"), len(c), len(c.toJSON())), (None, 2, 2))
+        self.assertTrue(c.put(Service("New", 6, CTime(0, 15))) is n)
+        self.assertTrue(c.get("New") is n)
+        self.assertEqual(n.getPrice(), 6)
+
+    def test_sheet(self):
+        c = ServiceCatalog([s1, s2])
+        x = ScheduleSheet(column_type=IntervalColumn)
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 0, Customer("a", services=[s1]))
+        x.add_customer(1, 0, Customer("b", services=[s1, s2]))
+        y = ScheduleSheet(json_dict=x.toJSON(), column_type=IntervalColumn, catalog=c)
+        a = y.getColumn(0).get_item(0)
+        b = y.getColumn(1).get_item(0)
+        self.assertTrue(a.getServices()[0] is b.getServices()[0] is s1)
+
+
+if __name__ == "__main__":
+    unittest.main()
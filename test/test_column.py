@@ -67,6 +67,73 @@ class TestColumn(unittest.TestCase):
         a.setLabel("test")
         self.assertEqual(a.getLabel(), "test")
 
+    def test_items(self):
+        a = Column("", rows=6)
+        a.add_item(1, "x", size=2)
+        a.add_item(4, "y")
+        self.assertEqual(a.items(), [(1, 2, "x"), (4, 1, "y")])
+        self.assertTrue(a.is_free(3))
+        self.assertFalse(a.is_free(2))
+        self.assertFalse(a.is_free(5, size=2))
+
+
+class TestIntervalColumn(unittest.TestCase):
+    def test_add(self):
+        a = IntervalColumn("", rows=5)
+        a.add_item(0, 1)
+        a.add_item(2, True)
+        a.add_item(4, 2.0)
+        self.assertEqual(a.contents, [1, None, True, None, 2.0])
+        self.assertEqual(a.getNumItems(), 3)
+
+    def test_overlap(self):
+        a = IntervalColumn("", rows=10)
+        a.add_item(2, "x", size=3)
+        a.add_item(7, "y", size=2)
+        for index, size in [(0, 3), (4, 1), (3, 5), (6, 2), (8, 1)]:
+            with self.assertRaises(BadArgument):
+                a.add_item(index, "z", size=size)
+        a.add_item(5, "z", size=2)
+        self.assertEqual(a.contents, [None, None, "x", 0, 0, "z", 0, "y", 0, None])
+
+    def test_lookup(self):
+        a = IntervalColumn("", rows=10)
+        a.add_item(2, "x", size=3)
+        a.add_item(7, "y", size=2)
+        self.assertEqual(a.getItem(1), None)
+        self.assertEqual(a.getItem(4), "x")
+        self.assertEqual(a.get_index(4), 2)
+        self.assertEqual(a.getItem(8), "y")
+        self.assertEqual(a.get_index(8), 7)
+        self.assertEqual(a.getItem(9), None)
+        self.assertEqual(a.get_item(3), "x")
+        # an empty row has no item for both column types
+        self.assertEqual(a.get_item(5), None)
+        b = Column("", rows=10)
+        self.assertEqual(b.get_item(5), None)
+
+    def test_remove(self):
+        a = IntervalColumn("", rows=5)
+        a.add_item(0, True, size=2)
+        a.add_item(4, True)
+        a.remove_item(1)
+        self.assertEqual(a.contents, [None, None, None, None, True])
+        with self.assertRaises(BadIndex):
+            a.remove_item(1)
+        a.remove_item(4)
+        self.assertEqual(a.contents, [None, None, None, None, None])
+        self.assertEqual(a.getNumItems(), 0)
+
+    def test_json(self):
+        a = Column("a", rows=8)
+        b = IntervalColumn("a", rows=8)
+        for col in [a, b]:
+            col.add_item(0, Customer("x", services=[]), size=2)
+            col.add_item(5, Customer("y", phone="0123456789", services=[]), size=3)
+        self.assertEqual(a.toJSON(), b.toJSON())
+        c = IntervalColumn.fromJSON(b.toJSON(), 8)
+        self.assertEqual(c.items(), b.items())
+
 
 if __name__ == "__main__":
     unittest.main()
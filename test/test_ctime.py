@@ -1,5 +1,7 @@
 import unittest
 import sys
+import copy
+import pickle
 
 sys.path.insert(0, "../lib/scheduler/")
 from ctime import *
@@ -27,29 +29,61 @@ class TestTime(unittest.TestCase):
 
     def test_add(self):
         x = CTime()
-        x.add(CTime(1, 1))
+        x = x.add(CTime(1, 1))
         self.assertEqual(x.toString(), "01:01")
-        x.add(CTime(22, 58))
+        x = x.add(CTime(22, 58))
         self.assertEqual(x.toString(), "23:59")
-        x.add(CTime(0, 1))
+        x = x.add(CTime(0, 1))
         self.assertEqual(x, CTime())
 
         y = CTime()
-        y.add_time(1, 1)
+        y = y.add_time(1, 1)
         self.assertEqual(y.toString(), "01:01")
-        y.add_time(22, 58)
+        y = y.add_time(22, 58)
         self.assertEqual(y.toString(), "23:59")
-        y.add_time(0, 1)
+        y = y.add_time(0, 1)
         self.assertEqual(y.toString(), "00:00")
+        y = y.add_time(minute=-1)
+        self.assertEqual(y.toString(), "23:59")
+
+        self.assertEqual(CTime(1, 30) + CTime(0, 45), CTime(2, 15))
+
+    def test_immutable(self):
+        x = CTime(1, 1)
+        x.add(CTime(1, 1))
+        x.add_time(1, 1)
+        self.assertEqual(x, CTime(1, 1))
+        with self.assertRaises(AttributeError):
+            x.hour = 2
+
+    def test_copy(self):
+        x = CTime(9, 5)
+        self.assertEqual(pickle.loads(pickle.dumps(x)), x)
+        self.assertEqual(copy.copy(x), x)
+        self.assertEqual(copy.deepcopy([x]), [x])
+
+    def test_order_hash(self):
+        self.assertTrue(CTime(1, 0) < CTime(1, 1))
+        self.assertTrue(CTime(23, 59) > CTime(0, 0))
+        self.assertTrue(CTime(2, 0) <= CTime(2, 0))
+        self.assertEqual(len({CTime(1, 0), CTime(1, 0), CTime(0, 60 - 1)}), 2)
+        self.assertEqual(CTime.fromMinutes(61), CTime(1, 1))
+        self.assertEqual(CTime.fromMinutes(1440), CTime())
+
+    def test_json(self):
+        x = CTime(9, 5)
+        self.assertEqual(x.toJSON(), {"hour": 9, "minute": 5})
+        self.assertEqual(CTime.fromJSON(x.toJSON()), x)
+        self.assertEqual(CTime.fromJSON('{"hour": 9, "minute": 5}'), x)
 
     def test_minutes(self):
         x = CTime()
         self.assertEqual(x.asMinutes(), 0)
-        x.add_time(1, 1)
+        x = x.add_time(1, 1)
         self.assertEqual(x.asMinutes(), 61)
-        x.add_time(22, 58)
+        x = x.add_time(22, 58)
         self.assertEqual(x.asMinutes(), 1439)
-        x.add_time(0, 1)
+        x = x.add_time(0, 1)
         self.assertEqual(x.asMinutes(), 0)
 
 
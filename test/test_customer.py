@@ -16,18 +16,18 @@ s5 = Service("S", 30, CTime(1, 0))
 
 class TestCustomer(unittest.TestCase):
     def test_init(self):
-        c = Customer("a", "l", [s1, s2, s3])
+        c = Customer("a", "l", services=[s1, s2, s3])
         self.assertEqual(c.getName(), "a l")
         self.assertEqual(c.getTime(), CTime(2, 0))
         self.assertEqual(c.getServices(), [s1, s2, s3])
 
-        c = Customer("bryan", "lee", [s2, s3, s5])
+        c = Customer("bryan", "lee", services=[s2, s3, s5])
         self.assertEqual(c.getName(), "bryan lee")
         self.assertEqual(c.getTime(), CTime(2, 30))
         self.assertEqual(c.getServices(), [s2, s3, s5])
 
     def test_add(self):
-        c = Customer("a", "l", [s1])
+        c = Customer("a", "l", services=[s1])
         self.assertEqual(c.getTime(), CTime(0, 30))
 
         c.add_service(s1)
@@ -40,7 +40,7 @@ class TestCustomer(unittest.TestCase):
         self.assertEqual(c.getTime(), CTime(2, 0))
 
     def test_remove(self):
-        c = Customer("a", "l", [s1, s2, s3, s4, s5])
+        c = Customer("a", "l", services=[s1, s2, s3, s4, s5])
         self.assertEqual(c.getTime(), CTime(3, 15))
 
         c.remove_service(s1)
@@ -64,7 +64,7 @@ class TestCustomer(unittest.TestCase):
         self.assertEqual(c.getTime(), CTime(0, 0))
 
     def test_name(self):
-        c = Customer("a", "l", [s1, s2, s3, s4, s5])
+        c = Customer("a", "l", services=[s1, s2, s3, s4, s5])
         self.assertEqual(c.getName(), "a l")
 
         c.setName()
@@ -76,6 +76,56 @@ class TestCustomer(unittest.TestCase):
         c.setName(first="a", last="c")
         self.assertEqual(c.getName(), "a c")
 
+    def test_totals(self):
+        p = Service("P", 10, CTime(0, 30))
+        m = Service("M", 20, CTime(0, 45))
+        c = Customer("a", "l", services=[p])
+        self.assertEqual(c.total_minutes, 30)
+        self.assertEqual(c.total_price, 10)
+        c.add_service(m)
+        self.assertEqual((c.total_minutes, c.getPrice()), (75, 30))
+        self.assertEqual(c.getTime(), CTime(1, 15))
+
+        # a changed service is picked up by every customer that has it
+        m.setPrice(25)
+        m.setTime(1, 0)
+        self.assertEqual((c.total_minutes, c.total_price), (90, 35))
+        c.remove_service(p)
+        self.assertEqual((c.total_minutes, c.total_price), (60, 25))
+        self.assertEqual(c.getTime(), CTime(1, 0))
+
+        # only a change to one of its own services invalidates the totals of a customer
+        p.setPrice(15)
+        self.assertEqual(c.revision, c.services_revision())
+        revision = m.revision
+        m.setPrice(25)
+        m.setTime(1, 0)
+        self.assertEqual(m.revision, revision)
+        self.assertEqual(c.total_price, 25)
+
+    def test_services(self):
+        a = Customer("a")
+        b = Customer("b")
+        a.add_service(s1)
+        self.assertEqual(b.getServices(), [])
+
+        c = Customer("c", services=[s3, s1, s2])
+        self.assertTrue(c.hasService(s1) and c.hasService("M"))
+        self.assertFalse(c.hasService(s4))
+        c.remove_service(s1)
+        c.add_service(s1)
+        self.assertEqual(c.getServices(), [s3, s2, s1])
+        self.assertEqual(list(map(lambda s: s["name"], c.toJSON()["services"])), ["G", "M", "P"])
+        self.assertRaises(ValueError, c.remove_service, s5)
+        self.assertRaises(AssertionError, Customer, "d", services=[s1, s1])
+
+    def test_hash(self):
+        a = Customer("a", "l", "2065550100")
+        b = Customer("b", "m", "2065550100", services=[s1])
+        self.assertEqual(len({a, b, Customer("c")}), 2)
+        self.assertEqual({a: 1}[b], 1)
+        self.assertRaises(AttributeError, setattr, a, "other", 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+import sys
+
+sys.path.insert(0, "../lib/")
+from daycache import *
+import unittest
+import threading
+
+
+class TestDayCache(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+        self.evicted = []
+
+    def load(self, key):
+        list.append(self.loads, key)
+        return key * 10
+
+    def test_lru(self):
+        c = DayCache(self.load, 2, lambda k, d: list.append(self.evicted, (k, d)))
+        self.assertEqual(c.get(1), 10)
+        self.assertEqual(c.get(2), 20)
+        self.assertEqual(c.get(1), 10)
+        self.assertEqual(self.loads, [1, 2])
+        c.get(3)
+        self.assertEqual(self.evicted, [(2, 20)])
+        self.assertTrue(1 in c and 3 in c)
+        self.assertEqual(len(c), 2)
+        c.close()
+        self.assertEqual(len(c), 0)
+        self.assertEqual(self.evicted, [(2, 20), (1, 10), (3, 30)])
+
+    def test_keep(self):
+        c = DayCache(self.load, 2, lambda k, d: list.append(self.evicted, k))
+        c.keep(1)
+        c.get(1)
+        c.get(2)
+        c.get(3)
+        c.get(4)
+        self.assertEqual(self.evicted, [2, 3])
+        self.assertTrue(1 in c)
+
+        # the day on screen stays kept while the next one loads
+        c.keep(1, 5)
+        c.get(5)
+        c.get(6)
+        self.assertTrue(1 in c and 5 in c)
+        c.keep(5)
+        c.get(7)
+        self.assertFalse(1 in c)
+
+    def test_defer(self):
+        c = DayCache(self.load, 1, lambda k, d: list.append(self.evicted, k), defer=True)
+        c.get(1)
+        c.get(2)
+        c.get(3)
+        # the dropped days are only evicted when asked to
+        self.assertEqual(self.evicted, [])
+        self.assertTrue(1 in c)
+        # a dropped day is taken back without loading it again
+        self.assertEqual(c.get(1), 10)
+        self.assertEqual(self.loads, [1, 2, 3])
+        self.assertEqual(c.evict_pending(), 2)
+        self.assertEqual(sorted(self.evicted), [2, 3])
+        self.assertEqual(c.evict_pending(), 0)
+        c.get(2)
+        c.close()
+        self.assertEqual(sorted(self.evicted), [1, 2, 2, 3])
+
+    def test_prefetch(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow(key):
+            list.append(self.loads, key)
+            started.set()
+            release.wait(5)
+            return key
+
+        c = DayCache(slow)
+        c.prefetch([1])
+        self.assertTrue(started.wait(5))
+        # asking for a day being prefetched waits for it instead of loading it again
+        c.prefetch([1])
+        release.set()
+        self.assertEqual(c.get(1), 1)
+        self.assertEqual(self.loads, [1])
+
+    def test_error(self):
+        def bad(key):
+            raise ValueError
+
+        c = DayCache(bad)
+        c.prefetch([1])
+        self.assertRaises(ValueError, c.get, 1)
+        self.assertEqual(len(c), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
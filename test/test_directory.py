@@ -0,0 +1,50 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+import unittest
+from directory import *
+
+c1 = Customer("bryan", "lee", "2065550100")
+c2 = Customer("brenda", "park", "2065550111")
+c3 = Customer("alvin", "lee", "4255550100")
+
+
+class TestDirectory(unittest.TestCase):
+    def test_add(self):
+        d = CustomerDirectory([c1, c2])
+        self.assertEqual(len(d), 2)
+        self.assertTrue(c1 in d)
+        self.assertTrue("2065550111" in d)
+        self.assertFalse(c3 in d)
+        self.assertFalse(d.add(Customer("someone", "else", "2065550100")))
+        self.assertTrue(d.add(c3))
+        self.assertEqual(d.get("4255550100").getName(), "alvin lee")
+        self.assertEqual(list(d), [c1, c2, c3])
+
+    def test_search(self):
+        d = CustomerDirectory([c1, c2, c3])
+        self.assertEqual(d.search(name="br"), [c2, c1])
+        self.assertEqual(d.search(name="LEE"), [c1, c3])
+        self.assertEqual(d.search(name="bryan l"), [c1])
+        self.assertEqual(d.search(name="x"), [])
+        self.assertEqual(d.search(phone="206"), [c1, c2])
+        self.assertEqual(d.search(phone="2065550100"), [c1])
+        self.assertEqual(d.search(name="lee", phone="425"), [c3])
+        self.assertEqual(len(d.search()), 3)
+
+    def test_remove_update(self):
+        d = CustomerDirectory([c1, c2, c3])
+        self.assertTrue(d.remove(c1))
+        self.assertFalse(d.remove(c1))
+        self.assertEqual(d.search(name="b"), [c2])
+        self.assertTrue(d.remove("2065550111"))
+        self.assertEqual(d.search(phone="206"), [])
+
+        d.update(Customer("alvin", "kim", "4255550100"))
+        self.assertEqual(len(d), 1)
+        self.assertEqual(d.search(name="lee"), [])
+        self.assertEqual(d.search(name="kim")[0].getName(), "alvin kim")
+
+
+if __name__ == "__main__":
+    unittest.main()
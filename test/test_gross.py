@@ -3,6 +3,8 @@ import sys
 sys.path.insert(0, "../lib/")
 from gross import *
 import unittest
+import os
+import tempfile
 sys.path.insert(0, "../lib/scheduler/")
 from sheet import *
 
@@ -12,11 +14,11 @@ s2 = Service("M", 20, CTime(0, 30))
 s3 = Service("W", 40, CTime(0, 15))
 s4 = Service("E", 50, CTime(1, 10))
 s5 = Service("L", 30, CTime(1, 0))
-c1 = Customer("a", "l", [s1, s2])
-c2 = Customer("b", "m", [s1, s2, s5])
-c3 = Customer("c", "n", [s5])
-c4 = Customer("d", "o", [s3, s4])
-c5 = Customer("e", "p", [s1, s2, s3, s4, s5])
+c1 = Customer("a", "l", services=[s1, s2])
+c2 = Customer("b", "m", services=[s1, s2, s5])
+c3 = Customer("c", "n", services=[s5])
+c4 = Customer("d", "o", services=[s3, s4])
+c5 = Customer("e", "p", services=[s1, s2, s3, s4, s5])
 
 
 class TestGross(unittest.TestCase):
@@ -29,11 +31,11 @@ class TestGross(unittest.TestCase):
         x.add_customer(0, 6, c2)
         x.add_customer(1, 4, c3)
         x.add_customer(1, 8, c4)
-        x.add_column("test")
-        x.add_column("test")
-        x.add_column("test")
-        x.add_column("test")
-        x.add_column("test")
+        x.add_column("test 1")
+        x.add_column("test 2")
+        x.add_column("test 3")
+        x.add_column("test 4")
+        x.add_column("test 5")
         x.add_column("column 3")
         x.add_customer(7, 0, c5)
         j = x.toJSON()
@@ -44,6 +46,46 @@ class TestGross(unittest.TestCase):
         j = x.toJSON()
         self.assertEqual(getPrice(j), 0)
 
+    def test_breakdown(self):
+        n = Service("N", 20, CTime(0, 30), sort="Nail Care")
+        f = Service("F", 30, CTime(1, 0), sort="Foot Care")
+        x = ScheduleSheet()
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 0, Customer("a", "l", "0000000001", [n, f]))
+        x.add_customer(0, 6, Customer("b", "m", "0000000002", [n]))
+        x.add_customer(1, 4, Customer("c", "n", "0000000003", [f]))
+        totals = getTotals(x.toJSON())
+        self.assertEqual(totals["total"], 100)
+        self.assertEqual(totals["customers"], 3)
+        self.assertEqual(totals["employees"], {"a": 70, "b": 30})
+        self.assertEqual(totals["sorted"], {"Nail Care": 40, "Foot Care": 60})
+        self.assertEqual(totals["hours"], {8: 50, 9: 50})
+
+        # the same sheet as a string, a file and a list of days
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "day.json")
+            with open(path, "w") as file:
+                json.dump(x.toJSON(), file)
+            self.assertEqual(getPrice(json.dumps(x.toJSON())), 100)
+            self.assertEqual(getPrice(path), 100)
+            totals = getTotals([path, x.toJSON()])
+            self.assertEqual(totals["total"], 200)
+            self.assertEqual(totals["employees"], {"a": 140, "b": 60})
+
+    def test_sheet_total(self):
+        x = ScheduleSheet(column_type=IntervalColumn)
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 0, Customer("a", services=[s1, s2]))
+        x.add_customer(1, 0, Customer("b", services=[s5]))
+        self.assertEqual(getSheetTotal(x), 68)
+        self.assertEqual(getSheetTotal(x), getPrice(x.toJSON()))
+
+    def test_bad(self):
+        with self.assertRaises(BadSheetJSON):
+            getPrice({"columns": [{"label": "a"}]})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,171 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+import unittest
+import os
+import tempfile
+from journal import *
+from sheet import *
+
+s1 = Service("P", 18, CTime(0, 30))
+s2 = Service("M", 20, CTime(0, 30))
+s5 = Service("L", 30, CTime(1, 0))
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "day.journal")
+        self.snapshot = os.path.join(self.dir.name, "day.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def make_sheet(self, journal):
+        x = ScheduleSheet(start_time=0, end_time=4, journal=journal)
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 0, Customer("a", "l", "0000000001", [s1, s2]))
+        x.add_customer(0, 4, Customer("b", "m", "0000000002", [s5]))
+        x.move_customer(0, 5, 1, 2)
+        x.serve_customer(0, 0)
+        x.split_customer(0, 0, [s2])
+        x.remove_customer(1, 2)
+        return x
+
+    def test_replay(self):
+        journal = Journal(self.path, self.snapshot)
+        x = self.make_sheet(journal)
+        journal.close()
+        self.assertEqual(len(journal.entries()), 8)
+
+        y = ScheduleSheet(start_time=0, end_time=4, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(y.toJSON(), x.toJSON())
+
+    def test_columns(self):
+        journal = Journal(self.path, self.snapshot)
+        x = self.make_sheet(journal)
+        x.add_column("c")
+        x.move_column("c", 0)
+        x.setColumnName(0, "d")
+        x.remove_column("b")
+        journal.close()
+
+        y = ScheduleSheet(start_time=0, end_time=4, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(y.toJSON(), x.toJSON())
+        self.assertEqual(y.getIndex("a"), 1)
+
+    def test_batch_undo(self):
+        journal = Journal(self.path, self.snapshot)
+        x = self.make_sheet(journal)
+        with x.batch():
+            x.move_customer(0, 0, 1, 0)
+            x.move_customer(0, 2, 1, 8)
+        x.undo()
+        x.remove_customer(0, 0)
+        x.undo()
+        x.redo()
+        journal.close()
+
+        y = ScheduleSheet(start_time=0, end_time=4, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(y.toJSON(), x.toJSON())
+        # the undo history is rebuilt by the replay too
+        self.assertTrue(y.undo())
+        x.journal = None
+        x.undo()
+        self.assertEqual(y.toJSON(), x.toJSON())
+
+    def test_compact(self):
+        journal = Journal(self.path, self.snapshot)
+        x = self.make_sheet(journal)
+        journal.compact(x)
+        self.assertEqual(journal.entries(), [])
+        x.add_customer(1, 0, Customer("c", "n", "0000000003", [s5]))
+        journal.close()
+
+        with open(self.snapshot) as file:
+            json_dict = json.load(file)
+        y = ScheduleSheet(json_dict=json_dict, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(y.toJSON(), x.toJSON())
+
+    def test_crash_after_snapshot(self):
+        journal = Journal(self.path, self.snapshot)
+        x = self.make_sheet(journal)
+        with open(self.path) as file:
+            lines = file.read()
+        journal.compact(x)
+        journal.close()
+
+        # a crash before the journal was emptied leaves the old entries behind
+        with open(self.path, "w") as file:
+            file.write(lines + '{"seq": 9, "op": "rem')
+        with open(self.snapshot) as file:
+            json_dict = json.load(file)
+        y = ScheduleSheet(json_dict=json_dict, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(y.toJSON(), x.toJSON())
+
+    def test_crash_mid_entry(self):
+        journal = Journal(self.path, self.snapshot)
+        x = self.make_sheet(journal)
+        journal.close()
+        with open(self.path, "a") as file:
+            file.write('{"seq": 9, "op": "rem')
+
+        # the next entry starts on a new line instead of continuing the partial one
+        journal = Journal(self.path, self.snapshot)
+        y = ScheduleSheet(start_time=0, end_time=4, journal=journal)
+        y.add_customer(1, 0, Customer("c", "n", "0000000003", [s5]))
+        y.move_customer(1, 0, 1, 8)
+        journal.close()
+        self.assertEqual(len(journal.entries()), 10)
+
+        z = ScheduleSheet(start_time=0, end_time=4, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(z.toJSON(), y.toJSON())
+        self.assertEqual(z.getColumn(1).getItem(8).getName(), "c n")
+
+    def test_bad_entry(self):
+        journal = Journal(self.path, self.snapshot)
+        x = self.make_sheet(journal)
+        # an edit of a customer that is not there is skipped and the rest is still replayed
+        journal.append("move", 1, 10, 0, 10)
+        x.journal = None
+        x.add_customer(1, 0, Customer("c", "n", "0000000003", [s5]))
+        journal.append("add", 1, 0, x.getColumn(1).getItem(0).toJSON())
+        journal.close()
+
+        with self.assertLogs("sheet", "WARNING"):
+            y = ScheduleSheet(start_time=0, end_time=4, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(y.toJSON(), x.toJSON())
+
+    def test_periodic_compact(self):
+        journal = Journal(self.path, self.snapshot, compact_every=3)
+        x = self.make_sheet(journal)
+        self.assertEqual(journal.count, 2)
+        self.assertTrue(os.path.exists(self.snapshot))
+        journal.close()
+
+    def test_undo_after_compact(self):
+        journal = Journal(self.path, self.snapshot, compact_every=3)
+        x = ScheduleSheet(start_time=0, end_time=4, journal=journal)
+        x.add_column("a")
+        x.add_customer(0, 0, Customer("a", "l", "0000000001", [s1, s2]))
+        # the third entry compacts the journal, the undo history is not in the snapshot
+        x.add_customer(0, 4, Customer("b", "m", "0000000002", [s5]))
+        self.assertEqual(journal.count, 0)
+        x.undo()
+        journal.close()
+
+        with open(self.snapshot) as file:
+            json_dict = json.load(file)
+        y = ScheduleSheet(json_dict=json_dict, journal=Journal(self.path, self.snapshot))
+        self.assertEqual(y.toJSON(), x.toJSON())
+        self.assertEqual(y.getColumn(0).getNumItems(), 1)
+        # the undone edit can still be redone after the replay
+        x.journal = None
+        self.assertTrue(x.redo())
+        self.assertTrue(y.redo())
+        self.assertEqual(y.toJSON(), x.toJSON())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,11 +12,11 @@ s2 = Service("M", 20, CTime(0, 30))
 s3 = Service("W", 40, CTime(0, 15))
 s4 = Service("E", 50, CTime(1, 10))
 s5 = Service("L", 30, CTime(1, 0))
-c1 = Customer("a", "l", [s1, s2])
-c2 = Customer("b", "m", [s1, s2, s5])
-c3 = Customer("c", "n", [s5])
-c4 = Customer("d", "o", [s3, s4])
-c5 = Customer("e", "p", [s1, s2, s3, s4, s5])
+c1 = Customer("a", "l", services=[s1, s2])
+c2 = Customer("b", "m", services=[s1, s2, s5])
+c3 = Customer("c", "n", services=[s5])
+c4 = Customer("d", "o", services=[s3, s4])
+c5 = Customer("e", "p", services=[s1, s2, s3, s4, s5])
 
 
 class TestJSON(unittest.TestCase):
@@ -33,11 +33,11 @@ class TestJSON(unittest.TestCase):
         x.add_customer(0, 6, c2)
         x.add_customer(1, 4, c3)
         x.add_customer(1, 8, c4)
-        x.add_column("test")
-        x.add_column("test")
-        x.add_column("test")
-        x.add_column("test")
-        x.add_column("test")
+        x.add_column("test 1")
+        x.add_column("test 2")
+        x.add_column("test 3")
+        x.add_column("test 4")
+        x.add_column("test 5")
         x.add_column("column 3")
         x.add_customer(7, 0, c5)
         j1 = x.toJSON()
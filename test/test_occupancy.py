@@ -0,0 +1,66 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+import unittest
+from occupancy import *
+from sheet import *
+
+s1 = Service("P", 18, CTime(0, 30))
+s2 = Service("M", 20, CTime(0, 30))
+s5 = Service("L", 30, CTime(1, 0))
+c1 = Customer("a", "l", "0000000001", [s1, s2])
+c2 = Customer("b", "m", "0000000002", [s5])
+
+
+@unittest.skipIf(np == None, "numpy is not installed")
+class TestOccupancy(unittest.TestCase):
+    def test_mark_clear(self):
+        x = OccupancyMatrix(8, 2)
+        x.mark(0, 2, 3, "a")
+        self.assertEqual(x.getItem(0, 4), "a")
+        self.assertEqual(x.getItem(0, 5), None)
+        self.assertFalse(x.is_free(0, 1, 2))
+        self.assertTrue(x.is_free(1, 1, 2))
+        self.assertFalse(x.is_free(1, 7, 2))
+        x.clear(0, 2, 3)
+        self.assertTrue(x.is_free(0, 0, 8))
+
+    def test_free_runs(self):
+        x = OccupancyMatrix(10, 3)
+        x.mark(0, 2, 3, "a")
+        x.mark(0, 7, 1, "b")
+        x.mark(2, 0, 10, "c")
+        self.assertEqual(
+            x.free_runs(), [[(0, 2), (5, 2), (8, 2)], [(0, 10)], []]
+        )
+        self.assertEqual(x.free_runs(3), [[], [(0, 10)], []])
+
+    def test_queries(self):
+        x = OccupancyMatrix(4, 2)
+        x.mark(0, 0, 2, "a")
+        x.mark(1, 0, 4, "b")
+        self.assertEqual(x.utilization().tolist(), [0.5, 1.0])
+        self.assertEqual(x.first_free_column(0), None)
+        self.assertEqual(x.first_free_column(3), 0)
+        self.assertEqual(x.toString(), ["cc", "00", "-0", "-0"])
+
+    def test_sheet_sync(self):
+        x = ScheduleSheet(start_time=0, end_time=4, occupancy=True)
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 0, c1)
+        x.add_customer(1, 2, c2)
+        self.assertEqual(x.free_runs(4), {"a": [(4, 12)], "b": [(6, 10)]})
+        x.move_customer(0, 3, 1, 8)
+        self.assertEqual(x.free_runs(4), {"a": [(0, 16)], "b": [(12, 4)]})
+        self.assertEqual(x.utilization(), {"a": 0.0, "b": 0.5})
+        self.assertEqual(x.first_free_column(2), 0)
+        x.remove_customer(1, 3)
+        self.assertEqual(x.utilization(), {"a": 0.0, "b": 0.25})
+
+        y = ScheduleSheet(json_dict=json.dumps(x.toJSON()), occupancy=True)
+        self.assertEqual(y.free_runs(), x.free_runs())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+import unittest
+import time
+from placement import *
+
+s1 = Service("P", 18, CTime(0, 30))
+s2 = Service("M", 20, CTime(0, 30))
+s5 = Service("L", 30, CTime(1, 0))
+
+
+def customer(n, services):
+    return Customer(str(n), phone=str(n).zfill(10), services=services)
+
+
+class TestSlotFinder(unittest.TestCase):
+    def make_sheet(self):
+        x = ScheduleSheet(start_time=8, end_time=12)
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 0, customer(1, [s5]))
+        x.add_customer(1, 2, customer(2, [s1]))
+        return x
+
+    def test_earliest(self):
+        x = self.make_sheet()
+        placements, unplaced = place_queue(
+            x, [customer(3, [s1]), customer(4, [s1]), customer(5, [s5])]
+        )
+        self.assertEqual(unplaced, [])
+        self.assertEqual(
+            list(map(lambda p: (p[1], p[2]), placements)), [(1, 0), (0, 4), (1, 4)]
+        )
+
+    def test_best(self):
+        x = self.make_sheet()
+        placements, unplaced = place_queue(x, [customer(3, [s1])], strategy="best")
+        self.assertEqual((placements[0][1], placements[0][2]), (1, 0))
+        x.add_customer(0, 8, customer(4, [s5]))
+        placements, unplaced = place_queue(x, [customer(3, [s5])], strategy="best")
+        self.assertEqual((placements[0][1], placements[0][2]), (0, 4))
+        placements, unplaced = place_queue(x, [customer(3, [s5])])
+        self.assertEqual((placements[0][1], placements[0][2]), (0, 4))
+        x.add_customer(0, 5, customer(5, [s1]))
+        placements, unplaced = place_queue(x, [customer(3, [s5])], strategy="best")
+        self.assertEqual((placements[0][1], placements[0][2]), (0, 12))
+
+    def test_least_loaded(self):
+        x = self.make_sheet()
+        placements, unplaced = place_queue(
+            x, [customer(3, [s1]), customer(4, [s1])], strategy="least_loaded"
+        )
+        self.assertEqual(
+            list(map(lambda p: (p[1], p[2]), placements)), [(1, 0), (0, 4)]
+        )
+
+    def test_schedule(self):
+        x = self.make_sheet()
+        placements, unplaced = place_queue(x, [customer(3, [s1])], employees=["a"])
+        self.assertEqual((placements[0][1], placements[0][2]), (0, 4))
+        placements, unplaced = place_queue(
+            x,
+            [customer(3, [s5]), customer(4, [s5])],
+            shifts={"a": (CTime(9, 0), CTime(10, 0)), "b": (CTime(8, 0), CTime(9, 0))},
+        )
+        self.assertEqual((placements[0][1], placements[0][2]), (0, 4))
+        self.assertEqual(len(unplaced), 1)
+
+    def test_apply(self):
+        x = self.make_sheet()
+        queue = [customer(n, [s1, s2]) for n in range(3, 10)]
+        finder = SlotFinder(x)
+        placements, unplaced = finder.place_queue(queue)
+        finder.apply(placements)
+        self.assertEqual(len(placements), 6)
+        self.assertEqual(len(unplaced), 1)
+        self.assertEqual(
+            x.getColumn(0).getNumItems() + x.getColumn(1).getNumItems(), 8
+        )
+        # the placements are one step of the undo stack
+        x.undo()
+        self.assertEqual(
+            x.getColumn(0).getNumItems() + x.getColumn(1).getNumItems(), 2
+        )
+        # a placement the sheet refuses leaves the others out too
+        x.add_customer(1, 6, customer(10, [s1]))
+        self.assertRaises(BadArgument, finder.apply, placements)
+        self.assertEqual(
+            x.getColumn(0).getNumItems() + x.getColumn(1).getNumItems(), 3
+        )
+
+    def test_scale(self):
+        x = ScheduleSheet(start_time=8, end_time=20, interval=15)
+        for i in range(30):
+            x.add_column(str(i))
+        queue = [customer(n, [s1, s5][: n % 2 + 1]) for n in range(500)]
+        start = time.perf_counter()
+        placements, unplaced = place_queue(x, queue)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(len(placements) + len(unplaced), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
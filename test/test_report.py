@@ -0,0 +1,92 @@
+import sys
+
+sys.path.insert(0, "../lib/")
+from report import *
+from storage import openDay
+import unittest
+import tempfile
+sys.path.insert(0, "../lib/scheduler/")
+from sheet import *
+
+n = Service("N", 20, CTime(0, 30), sort="Nail Care")
+f = Service("F", 30, CTime(1, 0), sort="Foot Care")
+
+
+def write_day(directory, day, customers):
+    x = ScheduleSheet(start_time=8, end_time=10)
+    x.add_column("a")
+    x.add_column("b")
+    for col, row, services in customers:
+        x.add_customer(col, row, Customer("c", services=services))
+    with open(os.path.join(directory, f"{day}.json"), "w") as file:
+        json.dump(x.toJSON(), file)
+
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        # the cache is kept next to the directory of days, so both go in the temporary directory
+        d = self.days = os.path.join(self.dir.name, "days")
+        os.mkdir(d)
+        write_day(d, "2024-07-15", [(0, 0, [n, f]), (1, 0, [n])])
+        write_day(d, "2024-07-16", [(0, 0, [f])])
+        write_day(d, "2024-07-22", [(1, 2, [n, f])])
+        with open(os.path.join(d, "notes.json"), "w") as file:
+            file.write("not a day")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_report(self):
+        report = getReport(self.days, processes=0)
+        self.assertEqual(report["days"], 3)
+        self.assertEqual(report["revenue"], 150)
+        self.assertEqual(report["customers"], 4)
+        self.assertEqual(report["average_minutes"], 270 / 4)
+        self.assertEqual(report["employees"]["a"]["revenue"], 80)
+        self.assertEqual(report["employees"]["a"]["utilization"], 10 / 24)
+        self.assertEqual(report["employees"]["b"]["utilization"], 8 / 24)
+
+    def test_range_period(self):
+        report = getReport(
+            self.days, start=date(2024, 7, 16), end=date(2024, 7, 31), processes=0
+        )
+        self.assertEqual(report["days"], 2)
+        self.assertEqual(report["revenue"], 80)
+        weeks = getReport(self.days, period="week", processes=0)
+        self.assertEqual(list(weeks.keys()), ["2024-W29", "2024-W30"])
+        self.assertEqual(weeks["2024-W29"]["revenue"], 100)
+        quarters = getReport(self.days, period="quarter", processes=0)
+        self.assertEqual(quarters["2024-Q3"]["days"], 3)
+
+    def test_pool_cache(self):
+        report = getReport(self.days, processes=2)
+        self.assertEqual(report["revenue"], 150)
+        self.assertTrue(os.path.exists(cachePath(self.days)))
+        self.assertEqual(len(os.listdir(self.days)), 4)
+
+        # a changed day is parsed again, the others come from the cache
+        write_day(self.days, "2024-07-16", [(0, 0, [f]), (1, 0, [f])])
+        with open(cachePath(self.days)) as file:
+            cache = json.load(file)
+        cache["2024-07-15.json"]["summary"]["revenue"] = 0
+        with open(cachePath(self.days), "w") as file:
+            json.dump(cache, file)
+        report = getReport(self.days, processes=0)
+        self.assertEqual(report["revenue"], 110)
+
+    def test_journal(self):
+        getReport(self.days, processes=0)
+        # the edits journaled since the day was saved are in the report
+        store = JSONStore(None, self.days)
+        x = openDay(store, "2024-07-16")
+        x.add_customer(1, 0, Customer("d", services=[n]))
+        x.journal.close()
+        report = getReport(self.days, processes=0)
+        self.assertEqual(report["revenue"], 170)
+        self.assertEqual(report["customers"], 5)
+        self.assertEqual(report["employees"]["b"]["revenue"], 90)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,14 +22,30 @@ class TestService(unittest.TestCase):
 
     def test_set(self):
         s = Service("Mani", 20, CTime(0, 30), abb="M")
-        s.setName("test")
         s.setPrice(69)
         s.setTime(23, 59)
         s.setAbbrev("Poo")
         self.assertEqual(s.getAbbrev(), "Poo")
         self.assertEqual(s.getPrice(), 69)
         self.assertEqual(s.getTime(), CTime(23, 59))
-        self.assertEqual(s.getName(), "test")
+        self.assertEqual(s.getName(), "Mani")
+        self.assertRaises(AttributeError, setattr, s, "name", "test")
+
+    def test_shared_time(self):
+        t = CTime(0, 30)
+        s1 = Service("Mani", 20, t)
+        s2 = Service("Pedi", 28, t)
+        s1.setTime(1, 0)
+        self.assertEqual(s1.getTime(), CTime(1, 0))
+        self.assertEqual(s2.getTime(), CTime(0, 30))
+
+    def test_hash(self):
+        a = Service("Mani", 20, CTime(0, 30))
+        b = Service("Mani", 25, CTime(1, 0))
+        self.assertEqual(len({a, b, Service("Pedi", 28, CTime(0, 30))}), 2)
+        self.assertEqual({a: 1}[b], 1)
+        self.assertNotEqual(a, None)
+        self.assertRaises(AttributeError, setattr, a, "other", 1)
 
 
 if __name__ == "__main__":
@@ -12,52 +12,52 @@ s2 = Service("M", 20, CTime(0, 30))
 s3 = Service("W", 40, CTime(0, 15))
 s4 = Service("E", 50, CTime(1, 10))
 s5 = Service("L", 30, CTime(1, 0))
-c1 = Customer("a", "l", [s1, s2])
-c2 = Customer("b", "m", [s1, s2, s5])
-c3 = Customer("c", "n", [s5])
-c4 = Customer("d", "o", [s3, s4])
-c5 = Customer("e", "p", [s1, s2, s3, s4, s5])
+c1 = Customer("a", "l", services=[s1, s2])
+c2 = Customer("b", "m", services=[s1, s2, s5])
+c3 = Customer("c", "n", services=[s5])
+c4 = Customer("d", "o", services=[s3, s4])
+c5 = Customer("e", "p", services=[s1, s2, s3, s4, s5])
 
 
 class TestGrid(unittest.TestCase):
     def test_add_columns(self):
         x = Grid()
         self.assertEqual(x.getLength(), 0)
-        x.add_column("")
+        x.add_column("0")
         self.assertEqual(x.getLength(), 1)
-        x.add_column("")
+        x.add_column("1")
         self.assertEqual(x.getLength(), 2)
-        x.add_column("")
+        x.add_column("2")
         self.assertEqual(x.getLength(), 3)
-        x.add_column("")
+        x.add_column("3")
         self.assertEqual(x.getLength(), 4)
-        x.add_column("")
+        x.add_column("4")
         self.assertEqual(x.getLength(), 5)
-        x.add_column("")
+        x.add_column("5")
         self.assertEqual(x.getLength(), 6)
-        x.add_column("")
+        x.add_column("6")
         self.assertEqual(x.getLength(), 7)
-        x.add_column("")
+        x.add_column("7")
         self.assertEqual(x.getLength(), 8)
-        x.add_column("")
+        x.add_column("8")
         self.assertEqual(x.getLength(), 9)
-        x.add_column("")
+        x.add_column("9")
         self.assertEqual(x.getLength(), 10)
-        x.add_column("")
+        x.add_column("10")
         self.assertEqual(x.getLength(), 11)
-        x.add_column("")
+        x.add_column("11")
         self.assertEqual(x.getLength(), 12)
-        x.add_column("")
+        x.add_column("12")
         self.assertEqual(x.getLength(), 13)
 
     def test_remove_columns(self):
         x = Grid()
         self.assertEqual(x.getLength(), 0)
-        x.add_column("")
+        x.add_column("13")
         self.assertEqual(x.getLength(), 1)
-        x.add_column("")
+        x.add_column("14")
         self.assertEqual(x.getLength(), 2)
-        x.add_column("")
+        x.add_column("15")
         self.assertEqual(x.getLength(), 3)
 
         c1 = x.getColumn(0)
@@ -72,6 +72,32 @@ class TestGrid(unittest.TestCase):
         x.remove_column(1)
         self.assertEqual(x.getLength(), 1)
 
+    def test_labels(self):
+        x = Grid()
+        for label in ["a", "b", "c", "d"]:
+            x.add_column(label)
+        self.assertFalse(x.add_column("b"))
+        ids = list(map(lambda c: c.id, x.columns))
+        self.assertEqual(len(set(ids)), 4)
+        self.assertEqual(x.getIndex("c"), 2)
+        self.assertTrue(x.getColumnByLabel("c") is x.getColumn(2))
+
+        self.assertTrue(x.remove_column("b"))
+        self.assertFalse(x.remove_column("b"))
+        self.assertEqual(x.getIndex("c"), 1)
+        self.assertEqual(x.getIndex("d"), 2)
+
+        self.assertTrue(x.move_column("d", 0))
+        self.assertEqual(list(map(lambda c: c.label, x.columns)), ["d", "a", "c"])
+        self.assertEqual(list(map(lambda c: x.getIndex(c), "dac")), [0, 1, 2])
+        self.assertTrue(x.getColumnById(ids[3]) is x.getColumn(0))
+
+        self.assertFalse(x.setColumnName(0, "a"))
+        self.assertTrue(x.setColumnName(0, "e"))
+        self.assertEqual(x.getIndex("e"), 0)
+        self.assertEqual(x.getIndex("d"), None)
+        self.assertEqual(x.getColumnById(ids[3]).label, "e")
+
 
 class TestSheet(unittest.TestCase):
     def test_init(self):
@@ -81,6 +107,34 @@ class TestSheet(unittest.TestCase):
         self.assertEqual(x.getStart(), CTime(8, 0))
         self.assertEqual(x.getEnd(), CTime(20, 0))
 
+    def test_interval(self):
+        x = ScheduleSheet(interval=5)
+        self.assertEqual(x.getNumRows(), 144)
+        x.add_column("a")
+        x.add_customer(0, 0, Customer("a", services=[s1, s3]))
+        self.assertEqual(x.getColumn(0).get_item(8), x.getColumn(0).get_item(0))
+        self.assertEqual(x.getColumn(0).getItem(9), None)
+        y = ScheduleSheet(json_dict=x.toJSON())
+        self.assertEqual(y.getNumRows(), 144)
+        self.assertEqual(ScheduleSheet(interval=30).getNumRows(), 24)
+
+    def test_regrid(self):
+        x = ScheduleSheet(start_time=8, end_time=12)
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 2, Customer("a", services=[s1, s3]))
+        x.add_customer(1, 4, Customer("b", services=[s5]))
+        y = x.regrid(5)
+        self.assertEqual(y.getNumRows(), 48)
+        self.assertEqual(y.getColumn(0).get_index(6), 6)
+        self.assertEqual(y.getColumn(0).get_index(14), 6)
+        self.assertEqual(y.getColumn(1).get_index(12), 12)
+        self.assertEqual(y.regrid(15).toJSON(), x.toJSON())
+        # a customer at 8:30 for 45 minutes does not fit on a half hour grid
+        self.assertRaises(LossyRegrid, x.regrid, 30)
+        x.remove_customer(0, 2)
+        self.assertEqual(x.regrid(60).getColumn(1).get_index(1), 1)
+
     def test_time_to_len(self):
         x = ScheduleSheet()
         x.add_column("")
@@ -123,15 +177,32 @@ class TestSheet(unittest.TestCase):
             pass
         x.move_customer(0, 3, 0, 12)
 
-        x.add_column("")
+        x.add_column("b")
         x.move_customer(0, 13, 1, 0)
 
+    def test_can_place(self):
+        for occupancy in (False, True):
+            x = ScheduleSheet(start_time=0, end_time=4, occupancy=occupancy)
+            x.add_column("a")
+            x.add_column("b")
+            x.add_customer(0, 0, Customer("a", "l", services=[s1, s2]))
+            x.add_customer(0, 8, Customer("b", "m", services=[s1, s2]))
+            self.assertTrue(x.can_place(0, 4, 4))
+            self.assertFalse(x.can_place(0, 4, 5))
+            self.assertFalse(x.can_place(1, 14, 4))
+            self.assertFalse(x.can_place(2, 0, 1))
+            # the rows of the customer being moved count as free
+            self.assertTrue(x.can_place(0, 2, 4, skip=(0, 1)))
+            self.assertTrue(x.can_place(0, 6, 4, skip=(0, 9)))
+            self.assertFalse(x.can_place(0, 6, 4, skip=(0, 1)))
+            self.assertTrue(x.can_place(1, 0, 4, skip=(0, 1)))
+
     def test_remove_customer(self):
         x = ScheduleSheet(start_time=0, end_time=4)
         x.add_column("")
         x.add_customer(0, 0, c1)
         x.add_customer(0, 4, c2)
-        x.add_column("")
+        x.add_column("b")
         x.add_customer(1, 2, c5)
         x.remove_customer(0, 3)
         x.remove_customer(0, 4)
@@ -142,7 +213,7 @@ class TestSheet(unittest.TestCase):
         x.add_column("")
         x.add_customer(0, 0, c1)
         x.add_customer(0, 4, c2)
-        x.add_column("")
+        x.add_column("b")
         x.add_customer(1, 2, c5)
         x.split_customer(0, 0, [s1])
         x.split_customer(1, 2, [s3, s5])
@@ -156,10 +227,67 @@ class TestSheet(unittest.TestCase):
         x.add_column("")
         x.add_customer(0, 0, c1)
         x.add_customer(0, 4, c2)
-        x.add_column("")
+        x.add_column("b")
         x.set_customer_services(0, 0, [s1, s2, s3])
         x.set_customer_services(0, 4, [s1])
 
+    def test_batch(self):
+        x = ScheduleSheet(start_time=0, end_time=4)
+        x.add_column("a")
+        x.add_column("b")
+        x.add_customer(0, 0, Customer("a", services=[s1, s2]))
+        x.add_customer(0, 4, Customer("b", services=[s5]))
+        before = x.toJSON()
+        try:
+            with x.batch():
+                x.move_customer(0, 0, 1, 0)
+                x.move_customer(0, 4, 1, 2)
+            raise Exception
+        except CustomerOverlap:
+            pass
+        self.assertEqual(x.toJSON(), before)
+
+        with x.batch():
+            x.move_customer(0, 0, 1, 0)
+            # an inner batch that fails only undoes itself
+            try:
+                with x.batch():
+                    x.remove_customer(0, 4)
+                    x.add_customer(1, 2, Customer("c", services=[s1]))
+            except BadArgument:
+                pass
+            x.move_customer(0, 4, 1, 4)
+        self.assertEqual(x.getColumn(0).getNumItems(), 0)
+        self.assertEqual(x.getColumn(1).getNumItems(), 2)
+
+    def test_undo(self):
+        x = ScheduleSheet(start_time=0, end_time=4, column_type=IntervalColumn)
+        x.add_column("a")
+        x.add_column("b")
+        self.assertFalse(x.undo())
+        x.add_customer(0, 0, Customer("a", services=[s1, s2]))
+        x.add_customer(0, 4, Customer("b", services=[s5]))
+        states = [x.toJSON()]
+        with x.batch():
+            x.move_customer(0, 0, 1, 0)
+            x.serve_customer(1, 0)
+        states.append(x.toJSON())
+        x.split_customer(1, 0, [s2])
+        states.append(x.toJSON())
+        x.set_customer_services(0, 4, [s1])
+        states.append(x.toJSON())
+
+        for i in range(3):
+            self.assertTrue(x.undo())
+            self.assertEqual(x.toJSON(), states[2 - i])
+        for i in range(3):
+            self.assertTrue(x.redo())
+            self.assertEqual(x.toJSON(), states[i + 1])
+        self.assertFalse(x.redo())
+        x.undo()
+        x.remove_customer(0, 4)
+        self.assertFalse(x.redo())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,190 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+sys.path.insert(0, "../lib/")
+from storage import *
+import unittest
+import tempfile
+from datetime import date
+
+s1 = Service("P", 18, CTime(0, 30))
+s2 = Service("M", 20, CTime(0, 30), sort="Nail Care")
+c1 = Customer("bryan", "lee", "2065550100", services=[s1])
+c2 = Customer("alvin", "lee", "4255550100")
+
+
+class StoreTests:
+    def store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.s = self.store()
+
+    def tearDown(self):
+        self.s.close()
+        self.dir.cleanup()
+
+    def test_services(self):
+        self.assertEqual(self.s.services(), [])
+        self.s.save_services([s1, s2])
+        self.assertEqual(self.s.services(), [s1, s2])
+        self.s.put_service(Service("P", 25, CTime(0, 45)))
+        self.assertEqual(len(self.s.services()), 2)
+        p = list(filter(lambda s: s.getName() == "P", self.s.services()))[0]
+        self.assertEqual(p.getPrice(), 25)
+        self.s.delete_service("M")
+        self.assertEqual(list(map(lambda s: s.getName(), self.s.services())), ["P"])
+
+    def test_customers(self):
+        self.s.save_customers([c1])
+        self.s.put_customer(c2)
+        self.s.put_customer(Customer("bryan", "kim", "2065550100"))
+        customers = self.s.customers()
+        self.assertEqual(len(customers), 2)
+        names = sorted(map(lambda c: c.getName(), customers))
+        self.assertEqual(names, ["alvin lee", "bryan kim"])
+        self.s.delete_customer("4255550100")
+        self.assertEqual(len(self.s.customers()), 1)
+
+    def test_employees_schedule(self):
+        self.s.save_employees(["a", "b"])
+        self.assertEqual(self.s.employees(), ["a", "b"])
+        self.assertEqual(self.s.schedule()["monday"], [])
+        self.s.put_schedule("monday", ["a"])
+        self.s.put_schedule("friday", ["a", "b"])
+        self.s.put_schedule("monday", ["b"])
+        schedule = self.s.schedule()
+        self.assertEqual(schedule["monday"], ["b"])
+        self.assertEqual(schedule["friday"], ["a", "b"])
+        self.assertEqual(len(schedule), 7)
+
+    def test_days(self):
+        self.s.save_day("2024-07-16", {"columns": []})
+        self.s.save_day("2024-07-15", {"columns": [1]})
+        self.assertEqual(self.s.days(), ["2024-07-15", "2024-07-16"])
+        self.assertEqual(self.s.day("2024-07-15"), {"columns": [1]})
+        self.assertEqual(self.s.day("2024-07-17"), None)
+
+    def test_open_day(self):
+        # a new day starts with its columns but nothing is saved until it is edited
+        x = openDay(self.s, "2024-07-15", ["a", "b"], start_time=8, end_time=10)
+        self.assertEqual(x.getLength(), 2)
+        closeDay(x)
+        self.assertEqual(self.s.days(), [])
+        x = openDay(self.s, "2024-07-15", ["a", "b"], start_time=8, end_time=10)
+        x.add_customer(1, 0, c1)
+        self.assertEqual(self.s.days(), ["2024-07-15"])
+        x.move_customer(1, 0, 0, 2)
+        x.journal.close()
+
+        # the edits since the snapshot are replayed, and the schedule is only used for new days
+        y = loadDay(self.s, "2024-07-15")
+        self.assertEqual(y.toJSON(), x.toJSON())
+        y = openDay(self.s, "2024-07-15", ["c"])
+        self.assertEqual(y.toJSON(), x.toJSON())
+        y.serve_customer(0, 2)
+        closeDay(y)
+        self.assertTrue(loadDay(self.s, "2024-07-15").getColumn(0).getItem(2).getServed())
+
+    def test_import_day(self):
+        path = os.path.join(self.dir.name, "day.json")
+        self.assertEqual(importDay(self.s, path), None)
+        x = ScheduleSheet(start_time=8, end_time=10)
+        x.add_column("a")
+        x.add_customer(0, 0, c1)
+        with open(path, "w") as file:
+            json.dump(x.toJSON(), file)
+        key = importDay(self.s, path)
+        self.assertEqual(key, date.today().isoformat())
+        self.assertEqual(loadDay(self.s, key).toJSON(), x.toJSON())
+        # the day is only imported once
+        self.assertEqual(importDay(self.s, path), None)
+
+
+class TestJSONStore(StoreTests, unittest.TestCase):
+    def store(self):
+        days = os.path.join(self.dir.name, "days")
+        os.mkdir(days)
+        return openStore("json", self.dir.name, days)
+
+    def test_memory(self):
+        self.s.save_customers([c1])
+        self.s.put_customer(c2)
+        # a change made through another store is read again instead of using the copy in memory
+        other = openStore("json", self.dir.name)
+        other.delete_customer("2065550100")
+        self.assertEqual(len(self.s.customers()), 1)
+        self.s.put_customer(c1)
+        names = sorted(map(lambda c: c.getName(), other.customers()))
+        self.assertEqual(names, ["alvin lee", "bryan lee"])
+        # the employees returned can be changed without changing the store
+        self.s.save_employees(["a"])
+        self.s.employees().append("b")
+        self.assertEqual(self.s.employees(), ["a"])
+
+    def test_hidden_days(self):
+        self.s.save_day("2024-07-15", {"columns": []})
+        with open(os.path.join(self.dir.name, "days", ".report_cache.json"), "w") as file:
+            file.write("{}")
+        self.assertEqual(self.s.days(), ["2024-07-15"])
+
+    def test_new_day_files(self):
+        x = openDay(self.s, "2024-07-15", ["a"], start_time=8, end_time=10)
+        closeDay(x)
+        self.assertEqual(os.listdir(self.s.days_directory), [])
+
+
+class TestSQLiteStore(StoreTests, unittest.TestCase):
+    def store(self):
+        return openStore("sqlite", os.path.join(self.dir.name, "s.db"))
+
+    def test_wal(self):
+        mode = self.s.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_copy(self):
+        days = os.path.join(self.dir.name, "days")
+        os.mkdir(days)
+        src = openStore("json", self.dir.name, days)
+        src.save_services([s1, s2])
+        src.save_customers([c1, c2])
+        src.save_employees(["a"])
+        src.put_schedule("sunday", ["a"])
+        x = openDay(src, "2024-07-14", ["a"], start_time=8, end_time=10)
+        x.add_customer(0, 0, c1)
+        x.move_customer(0, 0, 0, 4)
+        x.journal.close()
+        copyStore(src, self.s)
+        self.assertEqual(self.s.services(), [s1, s2])
+        self.assertEqual(self.s.customers()[0].getName(), "bryan lee")
+        self.assertEqual(self.s.employees(), ["a"])
+        self.assertEqual(self.s.schedule()["sunday"], ["a"])
+        # the journaled edits of a day are copied too
+        self.assertEqual(loadDay(self.s, "2024-07-14").toJSON(), x.toJSON())
+
+    def test_import(self):
+        src = openStore("json", self.dir.name)
+        self.assertTrue(src.is_empty() and self.s.is_empty())
+        src.save_services([s1, s2])
+        src.save_employees(["a"])
+        self.assertFalse(src.is_empty())
+        self.s.close()
+
+        # an empty database is filled from the json files when it is first opened
+        path = os.path.join(self.dir.name, "new.db")
+        self.s = openStore("sqlite", path, import_from=self.dir.name)
+        self.assertEqual(self.s.services(), [s1, s2])
+        self.assertEqual(self.s.employees(), ["a"])
+
+        # after that the database is kept as is
+        self.s.delete_service("P")
+        src.save_employees(["a", "b"])
+        self.s.close()
+        self.s = openStore("sqlite", path, import_from=self.dir.name)
+        self.assertEqual(self.s.services(), [s2])
+        self.assertEqual(self.s.employees(), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
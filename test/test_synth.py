@@ -0,0 +1,87 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+sys.path.insert(0, "../lib/")
+from synth import *
+from storage import JSONStore
+from datetime import date
+import unittest
+import os
+import tempfile
+
+catalog = loadCatalog()
+
+
+class TestSynth(unittest.TestCase):
+    def test_customers(self):
+        customers = makeCustomers(2000, catalog, makeRandom(1))
+        self.assertEqual(len(set(map(lambda c: c.getPhone(), customers))), 2000)
+        for customer in customers:
+            services = customer.getServices()
+            self.assertTrue(1 <= len(services) <= max(SERVICE_COUNTS))
+            self.assertTrue(customer.total_minutes > 0)
+            self.assertTrue(all(s in catalog for s in services))
+            sorts = [s.getSort() for s in services if s.getSort() != "None"]
+            self.assertEqual(len(sorts), len(set(sorts)))
+
+    def test_catalog(self):
+        small = makeCatalog(5, makeRandom(5))
+        self.assertEqual(len(small), 5)
+        self.assertTrue(all(s in catalog for s in small))
+        # a catalog larger than the real one repeats its services under new names
+        large = makeCatalog(3 * len(catalog), makeRandom(5))
+        self.assertEqual(len(large), 3 * len(catalog))
+        self.assertEqual(set(large.getSorts()), set(catalog.getSorts()))
+        customers = makeCustomers(50, large, makeRandom(5), services=2)
+        self.assertTrue(all(len(c.getServices()) == 2 for c in customers))
+
+    def test_rosters(self):
+        employees = makeEmployees(11, makeRandom(2))
+        self.assertEqual(len(set(employees)), 11)
+        rosters = makeRosters(3, employees, makeRandom(2), staff=(2, 4))
+        self.assertEqual(len(rosters), 3)
+        for roster in rosters:
+            self.assertEqual(list(roster), list(DAYS))
+            for working in roster.values():
+                self.assertTrue(2 <= len(working) <= 4)
+                self.assertTrue(set(working) <= set(employees))
+
+    def test_day(self):
+        customers = makeCustomers(200, catalog, makeRandom(3))
+        sheet = makeDay(["a", "b", "c"], customers, catalog, makeRandom(3), start_time=9)
+        self.assertEqual(sheet.getLength(), 3)
+        # the day is full, no customer with the shortest timed service would still fit
+        shortest = min(sheet.time_to_length(s.getTime()) for s in catalog)
+        finder = SlotFinder(sheet)
+        self.assertEqual(finder.find(max(1, shortest)), None)
+        # the sheet round trips through the drive/day.json format
+        again = ScheduleSheet(json_dict=json.loads(json.dumps(sheet.toJSON())), catalog=catalog)
+        self.assertEqual(again.toJSON(), sheet.toJSON())
+
+    def test_workload(self):
+        x = makeWorkload(seed=4, customers=300, weeks=2, start=date(2024, 7, 14))
+        y = makeWorkload(seed=4, customers=300, weeks=2, start=date(2024, 7, 14))
+        self.assertEqual(list(x["days"]), list(y["days"]))
+        self.assertEqual(len(x["days"]), 14)
+        self.assertEqual(list(x["days"])[0], "2024-07-14")
+        for key in x["days"]:
+            self.assertEqual(x["days"][key].toJSON(), y["days"][key].toJSON())
+        # monday of the second week uses the second roster
+        sheet = x["days"]["2024-07-22"]
+        labels = [sheet.getColumn(i).getLabel() for i in range(sheet.getLength())]
+        self.assertEqual(labels, x["schedules"][1]["monday"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            days = os.path.join(directory, "days")
+            os.mkdir(days)
+            store = JSONStore(directory, days)
+            saveWorkload(store, x)
+            self.assertEqual(len(store.customers(catalog)), 300)
+            self.assertEqual(store.schedule(), x["schedules"][0])
+            self.assertEqual(store.days(), list(x["days"]))
+            saved = json.loads(json.dumps(x["days"]["2024-07-14"].toJSON()))
+            self.assertEqual(store.day("2024-07-14"), saved)
+
+
+if __name__ == "__main__":
+    unittest.main()
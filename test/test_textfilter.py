@@ -0,0 +1,52 @@
+import sys
+
+sys.path.insert(0, "../lib/scheduler/")
+import unittest
+from textfilter import *
+from service import *
+
+s1 = Service("Pedicure", 18, CTime(0, 30), "P")
+s2 = Service("Manicure", 20, CTime(0, 30), "M")
+s3 = Service("Gel Manicure", 40, CTime(0, 45), "GM")
+
+
+class TestTextFilter(unittest.TestCase):
+    def test_search(self):
+        f = TextFilter(["Alvin", "bryan", "Alice"])
+        self.assertEqual(f.search(""), ["Alvin", "bryan", "Alice"])
+        self.assertEqual(f.search("al"), ["Alvin", "Alice"])
+        self.assertEqual(f.search(" ALI "), ["Alice"])
+        self.assertEqual(f.search("x"), [])
+        self.assertEqual(f.search("an"), ["bryan"])
+
+    def test_narrow(self):
+        f = TextFilter(["abc", "abd", "xbc"])
+        self.assertEqual(f.indices("c"), [0, 2])
+        # only the previous matches are checked when the query grows
+        f.keys[1] = "abcd"
+        self.assertEqual(f.indices("bc"), [0, 2])
+        # a query that does not contain the last one scans every item
+        self.assertEqual(f.indices("ab"), [0, 1])
+
+    def test_key_label(self):
+        f = TextFilter(
+            [s1, s2, s3],
+            key=lambda s: s.getName() + "\n" + s.getAbbrev(),
+            label=Service.toString,
+        )
+        self.assertEqual(f.matches("manicure"), [s2, s3])
+        self.assertEqual(f.matches("gm"), [s3])
+        self.assertEqual(f.search("p"), [s1.toString()])
+        # the key and abbreviation are not searched as one string
+        self.assertEqual(f.matches("ep"), [])
+
+    def test_reset(self):
+        f = TextFilter(["a"])
+        self.assertEqual(f.search("a"), ["a"])
+        f.reset(["a", "ab"])
+        self.assertEqual(len(f), 2)
+        self.assertEqual(f.search("ab"), ["ab"])
+
+
+if __name__ == "__main__":
+    unittest.main()